@@ -13,6 +13,9 @@ from app.models.team import Team
 from app.models.team_member import TeamMember
 from app.models.task import Task
 from app.models.task_assignment import TaskAssignment
+from app.models.task_dependency import TaskDependency
+from app.models.tag import Tag
+from app.models.saved_search import SavedSearch
 
 config = context.config
 
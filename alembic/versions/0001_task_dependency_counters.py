@@ -0,0 +1,54 @@
+"""add maintained dependency counters to tasks
+
+Revision ID: 0001_task_dependency_counters
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001_task_dependency_counters'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # app.main runs create_all on startup, which may already have created the
+    # columns on a fresh database. op.add_column has no if_not_exists before
+    # Alembic 1.16, so the guard is spelled out; the backfill below is
+    # idempotent and runs either way.
+    op.execute("ALTER TABLE tasks ADD COLUMN IF NOT EXISTS open_blocking_dependency_count INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE tasks ADD COLUMN IF NOT EXISTS dependent_count INTEGER NOT NULL DEFAULT 0")
+
+    op.execute("""
+        UPDATE tasks
+        SET dependent_count = counts.n
+        FROM (
+            SELECT depends_on_task_id AS task_id, COUNT(*) AS n
+            FROM task_dependencies
+            GROUP BY depends_on_task_id
+        ) AS counts
+        WHERE tasks.id = counts.task_id
+    """)
+
+    op.execute("""
+        UPDATE tasks
+        SET open_blocking_dependency_count = counts.n
+        FROM (
+            SELECT d.task_id, COUNT(*) AS n
+            FROM task_dependencies d
+            JOIN tasks blocker ON blocker.id = d.depends_on_task_id
+            WHERE d.dependency_type = 'BLOCKING'
+              AND blocker.status <> 'DONE'
+            GROUP BY d.task_id
+        ) AS counts
+        WHERE tasks.id = counts.task_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('tasks', 'dependent_count')
+    op.drop_column('tasks', 'open_blocking_dependency_count')
@@ -0,0 +1,48 @@
+"""add full-text search vector and trigram indexes to tasks
+
+Revision ID: 0002_task_search
+Revises: 0001_task_dependency_counters
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002_task_search'
+down_revision = '0001_task_dependency_counters'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # app.main runs create_all on startup, which may already have created the
+    # column and its indexes on a fresh database. op.add_column has no
+    # if_not_exists before Alembic 1.16, so that guard is spelled out.
+    op.execute(
+        "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+    )
+
+    op.create_index('ix_tasks_search_vector', 'tasks', ['search_vector'], postgresql_using='gin', if_not_exists=True)
+    op.create_index(
+        'ix_tasks_title_trgm', 'tasks', ['title'],
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}, if_not_exists=True
+    )
+    op.create_index(
+        'ix_tasks_description_trgm', 'tasks', ['description'],
+        postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}, if_not_exists=True
+    )
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_description_trgm', table_name='tasks')
+    op.drop_index('ix_tasks_title_trgm', table_name='tasks')
+    op.drop_index('ix_tasks_search_vector', table_name='tasks')
+    op.drop_column('tasks', 'search_vector')
@@ -0,0 +1,49 @@
+"""add composite and partial indexes for task list and access queries
+
+Revision ID: 0003_task_query_indexes
+Revises: 0002_task_search
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003_task_query_indexes'
+down_revision = '0002_task_search'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_tasks_team_created_at', 'tasks', ['team_id', 'created_at', 'id'], None),
+    ('ix_tasks_team_updated_at', 'tasks', ['team_id', 'updated_at', 'id'], None),
+    ('ix_tasks_team_status', 'tasks', ['team_id', 'status'], None),
+    ('ix_tasks_team_due_date', 'tasks', ['team_id', 'due_date'], 'due_date IS NOT NULL'),
+    ('ix_tasks_created_by', 'tasks', ['created_by'], None),
+    ('ix_tasks_parent_task_id', 'tasks', ['parent_task_id'], 'parent_task_id IS NOT NULL'),
+    ('ix_task_assignments_task_id', 'task_assignments', ['task_id'], None),
+    ('ix_task_assignments_user_task', 'task_assignments', ['user_id', 'task_id'], None),
+    ('ix_task_dependencies_depends_on', 'task_dependencies', ['depends_on_task_id', 'dependency_type'], None),
+    ('ix_team_members_user_active', 'team_members', ['user_id', 'team_id'], 'is_active = true'),
+    ('ix_team_members_team_user', 'team_members', ['team_id', 'user_id'], None),
+    ('ix_task_tags_tag_task', 'task_tags', ['tag_id', 'task_id'], None),
+    ('ix_tags_team_name', 'tags', ['team_id', 'name'], None),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps writes flowing on large tables; it cannot run in a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
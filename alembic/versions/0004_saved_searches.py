@@ -0,0 +1,64 @@
+"""add saved searches with materialized result sets
+
+Revision ID: 0004_saved_searches
+Revises: 0003_task_query_indexes
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+
+revision = '0004_saved_searches'
+down_revision = '0003_task_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+def _tables():
+    metadata = sa.MetaData()
+    # Referenced tables, declared only so the foreign keys can be rendered.
+    sa.Table('users', metadata, sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True))
+    sa.Table('tasks', metadata, sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True))
+
+    tables = [sa.Table(
+        'saved_searches', metadata,
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('owner_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('filters', sa.JSON(), nullable=False),
+        sa.Column('is_time_relative', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('needs_full_refresh', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('evaluated_on', sa.Date()),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True)),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now())
+    )]
+    for table in ('saved_search_results', 'saved_search_pending'):
+        tables.append(sa.Table(
+            table, metadata,
+            sa.Column('search_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('saved_searches.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('task_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True)
+        ))
+    return tables
+
+
+def upgrade() -> None:
+    # app.main runs create_all on startup, which may already have created these
+    # tables on a fresh database. op.create_table has no if_not_exists before
+    # Alembic 1.13.3, so the DDL is emitted directly.
+    for table in _tables():
+        op.execute(CreateTable(table, if_not_exists=True))
+    op.create_index('ix_saved_searches_owner_id', 'saved_searches', ['owner_id'], if_not_exists=True)
+    for table in ('saved_search_results', 'saved_search_pending'):
+        op.create_index(f'ix_{table}_task_id', table, ['task_id'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    for table in ('saved_search_pending', 'saved_search_results'):
+        op.drop_index(f'ix_{table}_task_id', table_name=table)
+        op.drop_table(table)
+    op.drop_index('ix_saved_searches_owner_id', table_name='saved_searches')
+    op.drop_table('saved_searches')
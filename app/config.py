@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Optional
 
 class Settings(BaseSettings):
     database_url: str
@@ -6,6 +7,38 @@ class Settings(BaseSettings):
     jwt_algorithm: str
     jwt_expire_hours: int
 
+    db_mode: str = "sync"  # "sync" or "async" (asyncpg-backed read endpoints)
+    async_database_url: Optional[str] = None
+
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800  # seconds
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 0  # 0 disables the server-side timeout
+    db_application_name: str = "taskmanager"
+    db_query_cache_size: int = 1200  # compiled statements kept per engine (SQLAlchemy default is 500)
+
+    cache_backend: str = "memory"  # "memory" (per worker) or "redis" (shared across workers)
+    cache_redis_url: Optional[str] = None
+    cache_key_prefix: str = "taskmanager:"
+    cache_invalidation_channel: str = "taskmanager:invalidate"
+    cache_max_entries: int = 10000
+    cache_max_bytes: int = 64 * 1024 * 1024  # approximate, per worker
+
+    filter_template_cache_size: int = 256  # distinct filter shapes kept compiled
+
+    # Principals are cached per worker. Deleting a user evicts it in every worker
+    # only with CACHE_BACKEND=redis; otherwise other workers keep it up to the TTL.
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_max_entries: int = 10000
+
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 32
+
+    dependency_cycle_check: str = "database"  # "database" (recursive CTE) or "index" (in-memory graph, needs CACHE_BACKEND=redis)
+
     model_config = SettingsConfigDict(env_file=".env")
 
 settings = Settings()
@@ -1,15 +1,68 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.utils.db_metrics import InstrumentedQueuePool, InstrumentedAsyncPool, instrument_pool, instrument_statement_cache
 
-engine = create_engine(settings.database_url)
+def engine_options(async_driver: bool = False) -> dict:
+    options = {
+        "poolclass": InstrumentedAsyncPool if async_driver else InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "query_cache_size": settings.db_query_cache_size
+    }
+
+    if settings.database_url.startswith(("postgresql", "postgres")):
+        if async_driver:
+            server_settings = {"application_name": settings.db_application_name}
+            if settings.db_statement_timeout_ms:
+                server_settings["statement_timeout"] = str(settings.db_statement_timeout_ms)
+            options["connect_args"] = {"server_settings": server_settings}
+        else:
+            connect_args = {"application_name": settings.db_application_name}
+            if settings.db_statement_timeout_ms:
+                connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+            options["connect_args"] = connect_args
+
+    return options
+
+engine = create_engine(settings.database_url, **engine_options())
+instrument_pool(engine)
+instrument_statement_cache(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+def get_async_database_url() -> str:
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = settings.database_url
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.db_mode == "async":
+    async_engine = create_async_engine(get_async_database_url(), **engine_options(async_driver=True))
+    instrument_pool(async_engine.sync_engine)
+    instrument_statement_cache(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database access requires DB_MODE=async")
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
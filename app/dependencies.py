@@ -1,13 +1,37 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Dict, Optional, Set
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
+from app.models.task import Task
+from app.models.team import Team
+from app.models.team_member import TeamMember
 from app.models.user import User
 from app.utils.auth import decode_access_token
+from app.utils.cache import MemoryBackend, broadcast_invalidation, on_invalidation
+from app.config import settings
 import uuid
 
 security = HTTPBearer()
 
+# Column snapshots rather than ORM instances: a cached instance would be
+# detached (and possibly expired) once its originating session closes.
+principal_cache = MemoryBackend(maxsize=settings.auth_cache_max_entries, ttl=settings.auth_cache_ttl_seconds)
+
+def cache_principal(user: User):
+    principal_cache.set(str(user.id), {column.key: getattr(user, column.key) for column in User.__table__.columns})
+
+def cached_principal(user_id: str) -> Optional[User]:
+    snapshot = principal_cache.get(user_id)
+    return User(**snapshot) if snapshot is not None else None
+
+on_invalidation("principal", principal_cache.delete)
+
+def invalidate_principal(user_id: uuid.UUID):
+    broadcast_invalidation("principal", user_id)
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> User:
     token = credentials.credentials
     user_id = decode_access_token(token)
@@ -18,6 +42,10 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             detail="Invalid token"
         )
 
+    cached_user = cached_principal(user_id)
+    if cached_user is not None:
+        return cached_user
+
     try:
         user_uuid = uuid.UUID(user_id)
         user = db.query(User).filter(User.id == user_uuid).first()
@@ -26,9 +54,129 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found"
             )
+        cache_principal(user)
         return user
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token format"
-        )
\ No newline at end of file
+        )
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    token = credentials.credentials
+    user_id = decode_access_token(token)
+
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token format"
+        )
+
+    cached_user = cached_principal(user_id)
+    if cached_user is not None:
+        return cached_user
+
+    user = (await db.execute(select(User).where(User.id == user_uuid))).scalar_one_or_none()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    cache_principal(user)
+    return user
+
+class AuthContext:
+    """What the current user may access, loaded once per request.
+
+    The accessible teams (owned or with an active membership) come from a single
+    query; after that every team or task check is answered from memory.
+    """
+
+    def __init__(self, user: User, rows):
+        self.user = user
+        self.teams: Dict[uuid.UUID, Team] = {}
+        self.member_team_ids: Set[uuid.UUID] = set()
+        for team, membership_id in rows:
+            self.teams[team.id] = team
+            if membership_id is not None:
+                self.member_team_ids.add(team.id)
+
+    def can_access_team(self, team_id: uuid.UUID) -> bool:
+        return team_id in self.teams
+
+    def can_access_task(self, task: Task) -> bool:
+        return task.team_id in self.member_team_ids or task.created_by == self.user.id
+
+def accessible_teams_select(user_id: uuid.UUID):
+    return (
+        select(Team, TeamMember.id)
+        .outerjoin(TeamMember, and_(
+            TeamMember.team_id == Team.id,
+            TeamMember.user_id == user_id,
+            TeamMember.is_active == True
+        ))
+        .where(or_(Team.created_by == user_id, TeamMember.id.is_not(None)))
+    )
+
+# Kept in session.info: sessions are per request, so the context never outlives one.
+def get_auth_context(current_user: User, db: Session) -> AuthContext:
+    context = db.info.get("auth_context")
+    if context is None or context.user.id != current_user.id:
+        context = AuthContext(current_user, db.execute(accessible_teams_select(current_user.id)).all())
+        db.info["auth_context"] = context
+    return context
+
+async def get_auth_context_async(current_user: User, db: AsyncSession) -> AuthContext:
+    context = db.info.get("auth_context")
+    if context is None or context.user.id != current_user.id:
+        context = AuthContext(current_user, (await db.execute(accessible_teams_select(current_user.id))).all())
+        db.info["auth_context"] = context
+    return context
+
+def _denied_team(team_id: uuid.UUID, exists: bool):
+    if not exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+def check_team_access(team_id: uuid.UUID, current_user: User, db: Session) -> Team:
+    context = get_auth_context(current_user, db)
+    if context.can_access_team(team_id):
+        return context.teams[team_id]
+    _denied_team(team_id, db.get(Team, team_id) is not None)
+
+def check_task_access(task_id: uuid.UUID, current_user: User, db: Session) -> Task:
+    task = db.get(Task, task_id)
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+    if not get_auth_context(current_user, db).can_access_task(task):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+    return task
+
+async def check_team_access_async(team_id: uuid.UUID, current_user: User, db: AsyncSession) -> Team:
+    context = await get_auth_context_async(current_user, db)
+    if context.can_access_team(team_id):
+        return context.teams[team_id]
+    _denied_team(team_id, await db.get(Team, team_id) is not None)
+
+async def check_task_access_async(task_id: uuid.UUID, current_user: User, db: AsyncSession) -> Task:
+    task = await db.get(Task, task_id)
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+    if not (await get_auth_context_async(current_user, db)).can_access_task(task):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+    return task
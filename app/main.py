@@ -1,13 +1,25 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
-from app.routers import auth, teams, tasks, users, tags, dependencies
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import text
+from app.config import settings
+from app.database import engine, async_engine, Base
+from app.routers import auth, teams, tasks, users, tags, dependencies, async_tasks, saved_searches
 from app.middleware import error_handler, performance_middleware
+from app.utils.db_metrics import pool_status, statement_cache_status
+from app.utils.auth import verified_token_cache, shutdown_hash_executor
+from app.dependencies import principal_cache
+from app.utils.cache import default_cache, start_invalidation_listener, stop_invalidation_listener
+from app.utils.query_builder import filter_template_stats
+from app.utils.async_bridge import async_router
+import time
 
 app = FastAPI(
     title="Task Manager API",
     version="1.0.0",
-    description="A comprehensive task management system with team collaboration features"
+    description="A comprehensive task management system with team collaboration features",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -23,12 +35,34 @@ app.middleware("http")(performance_middleware)
 
 Base.metadata.create_all(bind=engine)
 
-app.include_router(auth.router)
-app.include_router(teams.router)
-app.include_router(tasks.router)
-app.include_router(users.router)
-app.include_router(tags.router)
-app.include_router(dependencies.router)
+@app.on_event("startup")
+def start_cache_invalidation():
+    start_invalidation_listener()
+
+@app.on_event("shutdown")
+def stop_password_hashing():
+    shutdown_hash_executor()
+
+@app.on_event("shutdown")
+def stop_cache_invalidation():
+    stop_invalidation_listener()
+
+# export_router goes ahead of every task router so /tasks/export is not read as a task id.
+routers = [
+    tasks.export_router, auth.router, teams.router, tasks.router, users.router,
+    tags.router, dependencies.router, saved_searches.router
+]
+
+if settings.db_mode == "async":
+    # Native async handlers for the hot reads; every other route is served
+    # through its sync handler on the AsyncSession (app.utils.async_bridge).
+    app.include_router(async_router(tasks.export_router))
+    app.include_router(async_tasks.router)
+    for router in routers[1:]:
+        app.include_router(async_router(router, exclude=[async_tasks.router]))
+else:
+    for router in routers:
+        app.include_router(router)
 
 @app.get("/")
 def read_root():
@@ -36,4 +70,48 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+def _probe_engine():
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+async def _probe_async_engine():
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+async def _engine_health(probe, pool_engine) -> dict:
+    start_time = time.perf_counter()
+    try:
+        await probe()
+    except Exception as e:
+        return {"status": "unhealthy", "error": str(e), "pool": pool_status(pool_engine)}
+    return {
+        "status": "healthy",
+        "latency_ms": round((time.perf_counter() - start_time) * 1000, 3),
+        "pool": pool_status(pool_engine)
+    }
+
+@app.get("/health/db")
+async def database_health_check():
+    # The sync probe runs in the threadpool so a stalled pool cannot block the event loop.
+    report = await _engine_health(lambda: run_in_threadpool(_probe_engine), engine)
+    report["statement_cache"] = statement_cache_status(engine)
+    healthy = report["status"] == "healthy"
+    if async_engine is not None:
+        report["async"] = await _engine_health(_probe_async_engine, async_engine.sync_engine)
+        healthy = healthy and report["async"]["status"] == "healthy"
+
+    if not healthy:
+        report["status"] = "unhealthy"
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=report)
+    return report
+
+@app.get("/health/cache")
+def cache_health_check():
+    return {
+        "default": default_cache.stats(),
+        "principals": principal_cache.stats(),
+        "verified_tokens": verified_token_cache.stats(),
+        "filter_templates": filter_template_stats()
+    }
\ No newline at end of file
@@ -1,5 +1,6 @@
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
+from app.utils.db_metrics import start_request_pool_timing, finish_request_pool_timing
 import time
 import logging
 
@@ -23,7 +24,12 @@ async def error_handler(request: Request, call_next):
 
 async def performance_middleware(request: Request, call_next):
     start_time = time.time()
-    response = await call_next(request)
+    pool_timing = start_request_pool_timing()
+    try:
+        response = await call_next(request)
+    finally:
+        pool_wait = finish_request_pool_timing(pool_timing)
     process_time = time.time() - start_time
     response.headers["X-Process-Time"] = str(process_time)
+    response.headers["X-DB-Pool-Wait"] = str(pool_wait)
     return response
\ No newline at end of file
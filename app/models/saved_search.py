@@ -0,0 +1,44 @@
+import uuid
+from sqlalchemy import Column, String, DateTime, Date, Boolean, ForeignKey, Table, Index, JSON
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+# Materialized matches of each saved search, maintained by app.utils.saved_searches.
+saved_search_results = Table(
+    'saved_search_results',
+    Base.metadata,
+    Column('search_id', UUID(as_uuid=True), ForeignKey('saved_searches.id', ondelete='CASCADE'), primary_key=True),
+    Column('task_id', UUID(as_uuid=True), ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_saved_search_results_task_id', 'task_id')
+)
+
+# Tasks changed since a search was last refreshed; consumed on the next read.
+saved_search_pending = Table(
+    'saved_search_pending',
+    Base.metadata,
+    Column('search_id', UUID(as_uuid=True), ForeignKey('saved_searches.id', ondelete='CASCADE'), primary_key=True),
+    Column('task_id', UUID(as_uuid=True), ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_saved_search_pending_task_id', 'task_id')
+)
+
+class SavedSearch(Base):
+    __tablename__ = "saved_searches"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(100), nullable=False)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    filters = Column(JSON, nullable=False)  # AdvancedTaskFilters, JSON mode
+    is_time_relative = Column(Boolean, nullable=False, default=False)
+    needs_full_refresh = Column(Boolean, nullable=False, default=True)
+    evaluated_on = Column(Date)  # day relative date bounds were last resolved for
+    refreshed_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    owner = relationship("User", back_populates="saved_searches")
+
+from app.models.user import User
+
+User.saved_searches = relationship("SavedSearch", back_populates="owner", passive_deletes=True)
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Table
+from sqlalchemy import Column, String, DateTime, ForeignKey, Table, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -9,7 +9,8 @@ task_tags = Table(
     'task_tags',
     Base.metadata,
     Column('task_id', UUID(as_uuid=True), ForeignKey('tasks.id'), primary_key=True),
-    Column('tag_id', UUID(as_uuid=True), ForeignKey('tags.id'), primary_key=True)
+    Column('tag_id', UUID(as_uuid=True), ForeignKey('tags.id'), primary_key=True),
+    Index('ix_task_tags_tag_task', 'tag_id', 'task_id')
 )
 
 class Tag(Base):
@@ -22,6 +23,10 @@ class Tag(Base):
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_tags_team_name", "team_id", "name"),
+    )
+
     team = relationship("Team", back_populates="tags")
     creator = relationship("User", back_populates="created_tags")
     tasks = relationship("Task", secondary=task_tags, back_populates="tags")
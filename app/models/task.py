@@ -1,6 +1,6 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Date, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Date, Enum, Integer, Computed, Index, DDL, event
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
@@ -19,6 +19,13 @@ class TaskPriority(PyEnum):
     HIGH = "high"
     CRITICAL = "critical"
 
+SEARCH_CONFIG = "english"
+
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(description, '')), 'B')"
+)
+
 class Task(Base):
     __tablename__ = "tasks"
 
@@ -33,6 +40,26 @@ class Task(Base):
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    open_blocking_dependency_count = Column(Integer, nullable=False, default=0, server_default="0")
+    dependent_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Maintained by Postgres and only ever read in SQL. Left unmapped (see
+    # __mapper_args__) so the ORM does not fetch it back on INSERT/UPDATE;
+    # queries use Task.__table__.c.search_vector.
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True))
+
+    __table_args__ = (
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_tasks_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_tasks_description_trgm", "description", postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+        # List/search pages filter by team and order by (sort column, id).
+        Index("ix_tasks_team_created_at", "team_id", "created_at", "id"),
+        Index("ix_tasks_team_updated_at", "team_id", "updated_at", "id"),
+        Index("ix_tasks_team_status", "team_id", "status"),
+        Index("ix_tasks_team_due_date", "team_id", "due_date", postgresql_where=due_date.isnot(None)),
+        Index("ix_tasks_created_by", "created_by"),
+        Index("ix_tasks_parent_task_id", "parent_task_id", postgresql_where=parent_task_id.isnot(None)),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
     creator = relationship("User", back_populates="created_tasks")
     team = relationship("Team", back_populates="tasks")
@@ -41,6 +68,12 @@ class Task(Base):
     assignments = relationship("TaskAssignment", back_populates="task")
     tags = relationship("Tag", secondary="task_tags", back_populates="tasks")
 
+event.listen(
+    Task.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
 from app.models.user import User
 from app.models.team import Team
 
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, ForeignKey, String, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -14,6 +14,11 @@ class TaskAssignment(Base):
     assigned_at = Column(DateTime(timezone=True), server_default=func.now())
     role = Column(String, default="assignee")
 
+    __table_args__ = (
+        Index("ix_task_assignments_task_id", "task_id"),
+        Index("ix_task_assignments_user_task", "user_id", "task_id"),
+    )
+
     task = relationship("Task", back_populates="assignments")
     user = relationship("User", back_populates="task_assignments")
 
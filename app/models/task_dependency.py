@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, DateTime, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy import Column, DateTime, ForeignKey, Enum, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -21,6 +21,7 @@ class TaskDependency(Base):
 
     __table_args__ = (
         UniqueConstraint('task_id', 'depends_on_task_id', name='unique_task_dependency'),
+        Index('ix_task_dependencies_depends_on', 'depends_on_task_id', 'dependency_type'),
     )
 
     task = relationship("Task", foreign_keys=[task_id], back_populates="dependencies")
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Enum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -21,6 +21,12 @@ class TeamMember(Base):
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
     is_active = Column(Boolean, default=True)
 
+    __table_args__ = (
+        # Every visibility check looks up the caller's active memberships.
+        Index("ix_team_members_user_active", "user_id", "team_id", postgresql_where=is_active == True),
+        Index("ix_team_members_team_user", "team_id", "user_id"),
+    )
+
     team = relationship("Team", back_populates="members")
     user = relationship("User", back_populates="team_memberships")
 
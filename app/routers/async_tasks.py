@@ -0,0 +1,171 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import date
+import uuid
+from app.database import get_async_db
+from app.models.task import Task
+from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.models.user import User
+from app.schemas.dependency import TaskBlockingInfo
+from app.schemas.filters import AdvancedTaskFilters, FilterOperator, TaskSortField, SearchMode, TagMatch
+from app.schemas.task import TaskDetailResponse, PaginatedTasksResponse
+from app.dependencies import get_current_user_async, check_team_access_async, check_task_access_async
+from app.routers.tasks import enrich_tasks_with_dependency_info, paginated_tasks_mapper
+from app.utils.dependency_logic import get_blocking_dependencies_async, is_task_blocked_async
+from app.utils.pagination import paginate_select_async, PaginationMode, SortOrder, TotalMode
+from app.utils.search import SearchTerm, primary_search, task_sort_column, attach_search_highlights_async, highlights_search
+from app.utils.query_builder import (
+    build_task_query_filters, parse_query_params_to_filters, build_advanced_task_query, task_list_options, task_detail_options
+)
+from app.utils.serialization import mapped_response
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+def visible_tasks_select(current_user: User):
+    return (
+        select(Task)
+        .join(Team)
+        .join(TeamMember)
+        .where(
+            TeamMember.user_id == current_user.id,
+            TeamMember.is_active == True
+        )
+        .options(*task_list_options())
+    )
+
+async def paginate_searched_tasks(
+    stmt,
+    db: AsyncSession,
+    search_term: Optional[SearchTerm],
+    page: int,
+    size: int,
+    mode: PaginationMode,
+    cursor: Optional[str],
+    sort_by: TaskSortField,
+    sort_order: SortOrder,
+    total_mode: Optional[TotalMode]
+):
+    result = await paginate_select_async(
+        stmt, db, page, size, enrich_tasks_with_dependency_info,
+        mode=mode, cursor=cursor, sort_column=task_sort_column(sort_by, mode, search_term), sort_order=sort_order,
+        total_mode=total_mode
+    )
+    if highlights_search(search_term):
+        await attach_search_highlights_async(result["items"], db, *search_term)
+    return mapped_response(paginated_tasks_mapper, result)
+
+@router.get("/", response_model=PaginatedTasksResponse)
+async def list_tasks(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(20, ge=1, le=100, description="Page size"),
+    mode: PaginationMode = Query(PaginationMode.PAGE, description="Paginate by page number or by opaque cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous next_cursor or prev_cursor"),
+    sort_by: TaskSortField = Query(TaskSortField.CREATED_AT, description="Field to sort by (relevance needs a search term and page mode)"),
+    sort_order: SortOrder = Query(SortOrder.DESC, description="Sort direction"),
+    total_mode: Optional[TotalMode] = Query(None, description="exact, estimate or none (defaults to exact in page mode, none in cursor mode)"),
+    team_id: Optional[str] = Query(None, description="Team ID or comma-separated IDs"),
+    status: Optional[str] = Query(None, description="Status or comma-separated statuses (todo,in_progress,review,done,blocked)"),
+    priority: Optional[str] = Query(None, description="Priority or comma-separated priorities (low,medium,high,critical)"),
+    assigned_to_me: Optional[bool] = Query(False, description="Show only tasks assigned to current user"),
+    assignee_ids: Optional[str] = Query(None, description="Comma-separated assignee user IDs"),
+    created_by: Optional[str] = Query(None, description="Task creator user ID"),
+    due_date_before: Optional[date] = Query(None, description="Tasks due before this date"),
+    due_date_after: Optional[date] = Query(None, description="Tasks due after this date"),
+    due_date_on: Optional[date] = Query(None, description="Tasks due on this date"),
+    created_before: Optional[date] = Query(None, description="Tasks created before this date"),
+    created_after: Optional[date] = Query(None, description="Tasks created after this date"),
+    updated_before: Optional[date] = Query(None, description="Tasks updated before this date"),
+    updated_after: Optional[date] = Query(None, description="Tasks updated after this date"),
+    search: Optional[str] = Query(None, description="Search in title and description"),
+    search_mode: SearchMode = Query(SearchMode.CONTAINS, description="contains (substring), fulltext (ranked word match) or fuzzy (typo-tolerant)"),
+    tag_ids: Optional[str] = Query(None, description="Comma-separated tag IDs"),
+    tag_names: Optional[str] = Query(None, description="Comma-separated tag names"),
+    tag_match: TagMatch = Query(TagMatch.ANY, description="any: task has at least one of the tags, all: task has every tag"),
+    operator: FilterOperator = Query(FilterOperator.AND, description="Combine filters with AND or OR logic")
+):
+    filters = parse_query_params_to_filters(
+        team_id=team_id,
+        status=status,
+        priority=priority,
+        assignee_ids=assignee_ids,
+        created_by=created_by,
+        assigned_to_me=assigned_to_me,
+        due_date_before=due_date_before,
+        due_date_after=due_date_after,
+        due_date_on=due_date_on,
+        created_before=created_before,
+        created_after=created_after,
+        updated_before=updated_before,
+        updated_after=updated_after,
+        search=search,
+        search_mode=search_mode,
+        tag_ids=tag_ids,
+        tag_names=tag_names,
+        tag_match=tag_match,
+        operator=operator
+    )
+
+    filtered = build_task_query_filters(visible_tasks_select(current_user), filters, current_user.id)
+
+    return await paginate_searched_tasks(
+        filtered, db, primary_search([filters]), page, size, mode, cursor, sort_by, sort_order, total_mode
+    )
+
+@router.post("/search", response_model=PaginatedTasksResponse)
+async def advanced_search_tasks(
+    advanced_filters: AdvancedTaskFilters,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(20, ge=1, le=100, description="Page size"),
+    mode: PaginationMode = Query(PaginationMode.PAGE, description="Paginate by page number or by opaque cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous next_cursor or prev_cursor"),
+    sort_by: TaskSortField = Query(TaskSortField.CREATED_AT, description="Field to sort by (relevance needs a search term and page mode)"),
+    sort_order: SortOrder = Query(SortOrder.DESC, description="Sort direction"),
+    total_mode: Optional[TotalMode] = Query(None, description="exact, estimate or none (defaults to exact in page mode, none in cursor mode)")
+):
+    filtered = build_advanced_task_query(visible_tasks_select(current_user), advanced_filters, current_user.id)
+
+    return await paginate_searched_tasks(
+        filtered, db, primary_search(advanced_filters.filters), page, size, mode, cursor, sort_by, sort_order, total_mode
+    )
+
+@router.get("/{task_id}", response_model=TaskDetailResponse)
+async def get_task(
+    task_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    task = (await db.execute(
+        select(Task).where(Task.id == task_id).options(*task_detail_options())
+    )).unique().scalar_one_or_none()
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+    await check_team_access_async(task.team_id, current_user, db)
+
+    enrich_tasks_with_dependency_info([task] + list(task.subtasks), db)
+    return task
+
+@router.get("/{task_id}/status", response_model=TaskBlockingInfo)
+async def get_task_blocking_status(
+    task_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    await check_task_access_async(task_id, current_user, db)
+
+    blocking_deps = await get_blocking_dependencies_async(task_id, db)
+    is_blocked = await is_task_blocked_async(task_id, db)
+
+    return TaskBlockingInfo(
+        task_id=task_id,
+        is_blocked=is_blocked,
+        blocking_dependencies=blocking_deps,
+        can_start=not is_blocked
+    )
@@ -4,21 +4,13 @@ from sqlalchemy.exc import IntegrityError
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
-from app.utils.auth import hash_password, verify_password, create_access_token
+from app.utils.auth import hash_password_async, verify_password_async, create_access_token
 from app.dependencies import get_current_user
+from app.utils.async_bridge import run_db
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
-    hashed_password = hash_password(user_data.password)
-
-    db_user = User(
-        email=user_data.email,
-        username=user_data.username,
-        password_hash=hashed_password
-    )
-
+def save_new_user(db_user: User, db: Session) -> User:
     try:
         db.add(db_user)
         db.commit()
@@ -31,17 +23,51 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
             detail="Email or username already registered"
         )
 
+def find_login_candidate(email: str, db: Session):
+    db_user = db.query(User).filter(User.email == email).first()
+    if not db_user:
+        return None
+
+    candidate = (db_user.id, db_user.password_hash)
+    # End the read transaction so the pooled connection is not held while hashing.
+    db.rollback()
+    return candidate
+
+def store_rehashed_password(user_id, password_hash: str, db: Session):
+    db.query(User).filter(User.id == user_id).update({User.password_hash: password_hash})
+    db.commit()
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+    hashed_password = await hash_password_async(user_data.password)
+
+    db_user = User(
+        email=user_data.email,
+        username=user_data.username,
+        password_hash=hashed_password
+    )
+
+    return await run_db(save_new_user, db_user, db)
+
 @router.post("/login", response_model=Token)
-def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user_credentials.email).first()
+async def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
+    candidate = await run_db(find_login_candidate, user_credentials.email, db)
 
-    if not db_user or not verify_password(user_credentials.password, db_user.password_hash):
+    is_valid, new_hash = False, None
+    if candidate:
+        user_id, password_hash = candidate
+        is_valid, new_hash = await verify_password_async(user_credentials.password, password_hash)
+
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
-    access_token = create_access_token(data={"sub": str(db_user.id)})
+    if new_hash:
+        await run_db(store_rehashed_password, user_id, new_hash, db)
+
+    access_token = create_access_token(data={"sub": str(user_id)})
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
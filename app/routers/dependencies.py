@@ -1,39 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 import uuid
 from app.database import get_db
 from app.models.task import Task
 from app.models.task_dependency import TaskDependency
-from app.models.team_member import TeamMember
 from app.models.user import User
 from app.schemas.dependency import (
     DependencyCreate, DependencyResponse, DependencyWithTask, TaskBlockingInfo
 )
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, check_task_access
+from app.utils.query_builder import task_list_options
 from app.utils.dependency_logic import (
     validate_dependency_creation, update_task_blocked_status,
     get_blocking_dependencies, can_task_start, is_task_blocked
 )
+from app.utils.dependency_counters import apply_dependency_added, apply_dependency_removed
+from app.utils.dependency_graph import record_dependency_added, record_dependency_removed
 
 router = APIRouter(prefix="/tasks", tags=["dependencies"])
 
-def check_task_access(task_id: uuid.UUID, current_user: User, db: Session):
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-
-    is_team_member = db.query(TeamMember).filter(
-        TeamMember.team_id == task.team_id,
-        TeamMember.user_id == current_user.id,
-        TeamMember.is_active == True
-    ).first()
-
-    if not is_team_member and task.created_by != current_user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-
-    return task
-
 @router.post("/{task_id}/dependencies", response_model=DependencyResponse, status_code=status.HTTP_201_CREATED)
 def add_task_dependency(
     task_id: uuid.UUID,
@@ -41,7 +27,7 @@ def add_task_dependency(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    check_task_access(task_id, current_user, db)
+    task = check_task_access(task_id, current_user, db)
     check_task_access(dependency_data.depends_on_task_id, current_user, db)
 
     validation = validate_dependency_creation(task_id, dependency_data.depends_on_task_id, db)
@@ -58,9 +44,12 @@ def add_task_dependency(
     )
 
     db.add(dependency)
+    db.flush()
+    apply_dependency_added(dependency, db)
     db.commit()
     db.refresh(dependency)
 
+    record_dependency_added(task.team_id, task_id, dependency.depends_on_task_id)
     update_task_blocked_status(task_id, db)
 
     return dependency
@@ -76,6 +65,7 @@ def get_task_dependencies(
     dependencies = (
         db.query(TaskDependency)
         .filter(TaskDependency.task_id == task_id)
+        .options(selectinload(TaskDependency.depends_on_task).options(*task_list_options()))
         .all()
     )
 
@@ -123,7 +113,7 @@ def remove_task_dependency(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    check_task_access(task_id, current_user, db)
+    task = check_task_access(task_id, current_user, db)
 
     dependency = db.query(TaskDependency).filter(
         TaskDependency.id == dependency_id,
@@ -133,7 +123,10 @@ def remove_task_dependency(
     if not dependency:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dependency not found")
 
+    depends_on_task_id = dependency.depends_on_task_id
+    apply_dependency_removed(dependency, db)
     db.delete(dependency)
     db.commit()
 
+    record_dependency_removed(task.team_id, task_id, depends_on_task_id)
     update_task_blocked_status(task_id, db)
\ No newline at end of file
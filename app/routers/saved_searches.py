@@ -0,0 +1,116 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import uuid
+from app.database import get_db
+from app.models.saved_search import SavedSearch, saved_search_results
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.filters import TaskSortField
+from app.schemas.saved_search import SavedSearchCreate, SavedSearchUpdate, SavedSearchResponse
+from app.schemas.task import PaginatedTasksResponse
+from app.dependencies import get_current_user
+from app.routers.tasks import enrich_tasks_with_dependency_info, paginated_tasks_mapper
+from app.utils.pagination import paginate_query, PaginationMode, SortOrder, TotalMode
+from app.utils.saved_searches import is_time_relative, refresh_saved_search
+from app.utils.query_builder import task_list_options
+from app.utils.search import task_sort_column
+from app.utils.serialization import mapped_response
+
+router = APIRouter(prefix="/searches", tags=["searches"])
+
+def get_owned_search(search_id: uuid.UUID, current_user: User, db: Session) -> SavedSearch:
+    search = db.query(SavedSearch).filter(
+        SavedSearch.id == search_id,
+        SavedSearch.owner_id == current_user.id
+    ).first()
+    if not search:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Saved search not found")
+    return search
+
+@router.post("/", response_model=SavedSearchResponse, status_code=status.HTTP_201_CREATED)
+def create_saved_search(
+    search_data: SavedSearchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    search = SavedSearch(
+        name=search_data.name,
+        owner_id=current_user.id,
+        filters=search_data.filters.model_dump(mode="json"),
+        is_time_relative=is_time_relative(search_data.filters),
+        needs_full_refresh=True
+    )
+
+    db.add(search)
+    db.commit()
+    db.refresh(search)
+    return search
+
+@router.get("/", response_model=List[SavedSearchResponse])
+def list_saved_searches(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return db.query(SavedSearch).filter(SavedSearch.owner_id == current_user.id).order_by(SavedSearch.created_at).all()
+
+@router.get("/{search_id}", response_model=SavedSearchResponse)
+def get_saved_search(
+    search_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return get_owned_search(search_id, current_user, db)
+
+@router.put("/{search_id}", response_model=SavedSearchResponse)
+def update_saved_search(
+    search_id: uuid.UUID,
+    search_update: SavedSearchUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    search = get_owned_search(search_id, current_user, db)
+
+    if search_update.name is not None:
+        search.name = search_update.name
+    if search_update.filters is not None:
+        search.filters = search_update.filters.model_dump(mode="json")
+        search.is_time_relative = is_time_relative(search_update.filters)
+        search.needs_full_refresh = True
+
+    db.commit()
+    db.refresh(search)
+    return search
+
+@router.delete("/{search_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_saved_search(
+    search_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    search = get_owned_search(search_id, current_user, db)
+    db.delete(search)
+    db.commit()
+
+@router.get("/{search_id}/results", response_model=PaginatedTasksResponse)
+def get_saved_search_results(
+    search_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(20, ge=1, le=100, description="Page size"),
+    mode: PaginationMode = Query(PaginationMode.PAGE, description="Paginate by page number or by opaque cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous next_cursor or prev_cursor"),
+    sort_by: TaskSortField = Query(TaskSortField.CREATED_AT, description="Field to sort by"),
+    sort_order: SortOrder = Query(SortOrder.DESC, description="Sort direction"),
+    total_mode: Optional[TotalMode] = Query(None, description="exact, estimate or none (defaults to exact in page mode, none in cursor mode)")
+):
+    search = get_owned_search(search_id, current_user, db)
+    refresh_saved_search(search.id, db)
+
+    results = db.query(Task).join(
+        saved_search_results, saved_search_results.c.task_id == Task.id
+    ).filter(saved_search_results.c.search_id == search.id).options(*task_list_options())
+
+    return mapped_response(paginated_tasks_mapper, paginate_query(
+        results, page, size, enrich_tasks_with_dependency_info, db,
+        mode=mode, cursor=cursor, sort_column=task_sort_column(sort_by, mode, None), sort_order=sort_order,
+        total_mode=total_mode
+    ))
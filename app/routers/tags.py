@@ -3,31 +3,15 @@ from sqlalchemy.orm import Session
 from typing import List
 import uuid
 from app.database import get_db
-from app.models.tag import Tag
-from app.models.team import Team
-from app.models.team_member import TeamMember
+from sqlalchemy import select
+from app.models.tag import Tag, task_tags
 from app.models.user import User
 from app.schemas.tag import TagCreate, TagResponse, TagUpdate
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, check_team_access
+from app.utils.saved_searches import record_task_changes
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
-def check_team_access(team_id: uuid.UUID, current_user: User, db: Session):
-    is_team_member = db.query(TeamMember).filter(
-        TeamMember.team_id == team_id,
-        TeamMember.user_id == current_user.id,
-        TeamMember.is_active == True
-    ).first()
-
-    team = db.query(Team).filter(Team.id == team_id).first()
-    if not team:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
-
-    if team.created_by != current_user.id and not is_team_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-
-    return team
-
 @router.post("/", response_model=TagResponse, status_code=status.HTTP_201_CREATED)
 def create_tag(
     tag_data: TagCreate,
@@ -107,6 +91,9 @@ def update_tag(
                 detail="Tag with this name already exists in team"
             )
 
+    if tag_update.name and tag_update.name != tag.name:
+        record_task_changes(select(task_tags.c.task_id).where(task_tags.c.tag_id == tag_id), db)
+
     for field, value in tag_update.dict(exclude_unset=True).items():
         setattr(tag, field, value)
 
@@ -126,5 +113,6 @@ def delete_tag(
 
     check_team_access(tag.team_id, current_user, db)
 
+    record_task_changes(select(task_tags.c.task_id).where(task_tags.c.tag_id == tag_id), db)
     db.delete(tag)
     db.commit()
\ No newline at end of file
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy import or_
 from typing import List, Optional
 from datetime import date
-from app.utils.pagination import paginate_query
-from app.utils.query_builder import build_task_query_filters, parse_query_params_to_filters, build_advanced_task_query
-from app.schemas.filters import TaskFilters, AdvancedTaskFilters, FilterOperator
+from app.utils.pagination import paginate_query, PaginationMode, SortOrder, TotalMode
+from app.utils.query_builder import (
+    build_task_query_filters, parse_query_params_to_filters, build_advanced_task_query, task_list_options, task_detail_options
+)
+from app.schemas.filters import TaskFilters, AdvancedTaskFilters, FilterOperator, TaskSortField, SearchMode, TagMatch
+import json
+import tempfile
 import uuid
 from app.database import get_db
 from app.models.task import Task, TaskStatus, TaskPriority
@@ -14,41 +20,45 @@ from app.models.team import Team
 from app.models.team_member import TeamMember
 from app.models.user import User
 from app.models.tag import Tag
-from app.utils.dependency_logic import update_dependent_tasks_status, is_task_blocked, get_blocking_dependencies
+from app.utils.dependency_logic import update_dependent_tasks_status
+from app.utils.dependency_counters import apply_status_transition, apply_task_removed
+from app.utils.dependency_graph import record_task_removed
+from app.utils.saved_searches import record_task_changes
+from app.utils.search import SearchTerm, primary_search, task_sort_column, attach_search_highlights, highlights_search
+from app.utils.task_export import EXPORT_COLUMNS, iter_export_batches, ndjson_export, csv_export
+from app.utils.serialization import model_mapper, mapped_response, MappedJSONResponse
+from app.utils.async_bridge import stream_with_session
+from app.utils.task_tree import load_task_subtree, nest_task_subtree, flatten_task_subtree
+from app.utils.bulk_operations import (
+    bulk_update_tasks as bulk_update_tasks_in_batch, TaskImporter, iter_import_rows, IMPORT_SPOOL_MAX_MEMORY
+)
 from app.schemas.task import (
     TaskCreate, TaskUpdate, TaskResponse, TaskDetailResponse,
     TaskAssignmentCreate, TaskAssignmentResponse, BulkTaskUpdate,
-    PaginatedTasksResponse
+    BulkTaskCreate, BulkMode, ImportFormat, PaginatedTasksResponse, TaskTreeResponse
 )
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, check_team_access
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
+# Separate so main can register it ahead of any router with a GET /tasks/{task_id}.
+export_router = APIRouter(prefix="/tasks", tags=["tasks"])
 
-def check_team_access(team_id: uuid.UUID, current_user: User, db: Session):
-    is_team_member = db.query(TeamMember).filter(
-        TeamMember.team_id == team_id,
-        TeamMember.user_id == current_user.id,
-        TeamMember.is_active == True
-    ).first()
-
-    team = db.query(Team).filter(Team.id == team_id).first()
-    if not team:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
-
-    if team.created_by != current_user.id and not is_team_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
-
-    return team
+paginated_tasks_mapper = model_mapper(PaginatedTasksResponse)
 
 def enrich_tasks_with_dependency_info(tasks: List[Task], db: Session) -> List[Task]:
     for task in tasks:
-        task.is_blocked = is_task_blocked(task.id, db)
-        blocking_count = db.query(TaskDependency).filter(
-            TaskDependency.depends_on_task_id == task.id
-        ).count()
-        task.blocking_task_count = blocking_count
+        task.is_blocked = task.open_blocking_dependency_count > 0
+        task.blocking_task_count = task.dependent_count
     return tasks
 
+def search_enricher(search_term: Optional[SearchTerm]):
+    if not highlights_search(search_term):
+        return enrich_tasks_with_dependency_info
+
+    def enrich(tasks: List[Task], db: Session) -> List[Task]:
+        return attach_search_highlights(enrich_tasks_with_dependency_info(tasks, db), db, *search_term)
+    return enrich
+
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 def create_task(task_data: TaskCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     check_team_access(task_data.team_id, current_user, db)
@@ -78,13 +88,12 @@ def create_task(task_data: TaskCreate, db: Session = Depends(get_db), current_us
         task.tags = tags
 
     db.add(task)
+    db.flush()
+    record_task_changes([task.id], db)
     db.commit()
     db.refresh(task)
 
-    task.is_blocked = is_task_blocked(task.id, db)
-    task.blocking_task_count = db.query(TaskDependency).filter(
-        TaskDependency.depends_on_task_id == task.id
-    ).count()
+    enrich_tasks_with_dependency_info([task], db)
 
     return task
 
@@ -94,6 +103,11 @@ def list_tasks(
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    mode: PaginationMode = Query(PaginationMode.PAGE, description="Paginate by page number or by opaque cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous next_cursor or prev_cursor"),
+    sort_by: TaskSortField = Query(TaskSortField.CREATED_AT, description="Field to sort by (relevance needs a search term and page mode)"),
+    sort_order: SortOrder = Query(SortOrder.DESC, description="Sort direction"),
+    total_mode: Optional[TotalMode] = Query(None, description="exact, estimate or none (defaults to exact in page mode, none in cursor mode)"),
     team_id: Optional[str] = Query(None, description="Team ID or comma-separated IDs"),
     status: Optional[str] = Query(None, description="Status or comma-separated statuses (todo,in_progress,review,done,blocked)"),
     priority: Optional[str] = Query(None, description="Priority or comma-separated priorities (low,medium,high,critical)"),
@@ -108,14 +122,16 @@ def list_tasks(
     updated_before: Optional[date] = Query(None, description="Tasks updated before this date"),
     updated_after: Optional[date] = Query(None, description="Tasks updated after this date"),
     search: Optional[str] = Query(None, description="Search in title and description"),
+    search_mode: SearchMode = Query(SearchMode.CONTAINS, description="contains (substring), fulltext (ranked word match) or fuzzy (typo-tolerant)"),
     tag_ids: Optional[str] = Query(None, description="Comma-separated tag IDs"),
     tag_names: Optional[str] = Query(None, description="Comma-separated tag names"),
+    tag_match: TagMatch = Query(TagMatch.ANY, description="any: task has at least one of the tags, all: task has every tag"),
     operator: FilterOperator = Query(FilterOperator.AND, description="Combine filters with AND or OR logic")
 ):
     base_query = db.query(Task).join(Team).join(TeamMember).filter(
         TeamMember.user_id == current_user.id,
         TeamMember.is_active == True
-    )
+    ).options(*task_list_options())
 
     filters = parse_query_params_to_filters(
         team_id=team_id,
@@ -132,14 +148,85 @@ def list_tasks(
         updated_before=updated_before,
         updated_after=updated_after,
         search=search,
+        search_mode=search_mode,
         tag_ids=tag_ids,
         tag_names=tag_names,
+        tag_match=tag_match,
         operator=operator
     )
 
     filtered_query = build_task_query_filters(base_query, filters, current_user.id)
+    search_term = primary_search([filters])
 
-    return paginate_query(filtered_query, page, size, enrich_tasks_with_dependency_info, db)
+    return mapped_response(paginated_tasks_mapper, paginate_query(
+        filtered_query, page, size, search_enricher(search_term), db,
+        mode=mode, cursor=cursor, sort_column=task_sort_column(sort_by, mode, search_term), sort_order=sort_order,
+        total_mode=total_mode
+    ))
+
+@export_router.get("/export")
+def export_tasks(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    export_format: ImportFormat = Query(ImportFormat.NDJSON, alias="format", description="ndjson or csv (csv joins list fields with commas, as the importer expects)"),
+    team_id: Optional[str] = Query(None, description="Team ID or comma-separated IDs"),
+    status: Optional[str] = Query(None, description="Status or comma-separated statuses (todo,in_progress,review,done,blocked)"),
+    priority: Optional[str] = Query(None, description="Priority or comma-separated priorities (low,medium,high,critical)"),
+    assigned_to_me: Optional[bool] = Query(False, description="Show only tasks assigned to current user"),
+    assignee_ids: Optional[str] = Query(None, description="Comma-separated assignee user IDs"),
+    created_by: Optional[str] = Query(None, description="Task creator user ID"),
+    due_date_before: Optional[date] = Query(None, description="Tasks due before this date"),
+    due_date_after: Optional[date] = Query(None, description="Tasks due after this date"),
+    due_date_on: Optional[date] = Query(None, description="Tasks due on this date"),
+    created_before: Optional[date] = Query(None, description="Tasks created before this date"),
+    created_after: Optional[date] = Query(None, description="Tasks created after this date"),
+    updated_before: Optional[date] = Query(None, description="Tasks updated before this date"),
+    updated_after: Optional[date] = Query(None, description="Tasks updated after this date"),
+    search: Optional[str] = Query(None, description="Search in title and description"),
+    search_mode: SearchMode = Query(SearchMode.CONTAINS, description="contains (substring), fulltext (ranked word match) or fuzzy (typo-tolerant)"),
+    tag_ids: Optional[str] = Query(None, description="Comma-separated tag IDs"),
+    tag_names: Optional[str] = Query(None, description="Comma-separated tag names"),
+    tag_match: TagMatch = Query(TagMatch.ANY, description="any: task has at least one of the tags, all: task has every tag"),
+    operator: FilterOperator = Query(FilterOperator.AND, description="Combine filters with AND or OR logic")
+):
+    base_query = db.query(*EXPORT_COLUMNS).select_from(Task).join(Team).join(TeamMember).filter(
+        TeamMember.user_id == current_user.id,
+        TeamMember.is_active == True
+    )
+
+    filters = parse_query_params_to_filters(
+        team_id=team_id,
+        status=status,
+        priority=priority,
+        assignee_ids=assignee_ids,
+        created_by=created_by,
+        assigned_to_me=assigned_to_me,
+        due_date_before=due_date_before,
+        due_date_after=due_date_after,
+        due_date_on=due_date_on,
+        created_before=created_before,
+        created_after=created_after,
+        updated_before=updated_before,
+        updated_after=updated_after,
+        search=search,
+        search_mode=search_mode,
+        tag_ids=tag_ids,
+        tag_names=tag_names,
+        tag_match=tag_match,
+        operator=operator
+    )
+
+    export_query = build_task_query_filters(base_query, filters, current_user.id).order_by(Task.created_at, Task.id)
+    batches = iter_export_batches(export_query, db)
+
+    if export_format == ImportFormat.CSV:
+        body, media_type = csv_export(batches), "text/csv"
+    else:
+        body, media_type = ndjson_export(batches), "application/x-ndjson"
+
+    return StreamingResponse(stream_with_session(body, db), media_type=media_type, headers={
+        "Content-Disposition": f'attachment; filename="tasks.{export_format.value}"'
+    })
 
 @router.post("/search", response_model=PaginatedTasksResponse)
 def advanced_search_tasks(
@@ -147,51 +234,63 @@ def advanced_search_tasks(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Page number"),
-    size: int = Query(20, ge=1, le=100, description="Page size")
+    size: int = Query(20, ge=1, le=100, description="Page size"),
+    mode: PaginationMode = Query(PaginationMode.PAGE, description="Paginate by page number or by opaque cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous next_cursor or prev_cursor"),
+    sort_by: TaskSortField = Query(TaskSortField.CREATED_AT, description="Field to sort by (relevance needs a search term and page mode)"),
+    sort_order: SortOrder = Query(SortOrder.DESC, description="Sort direction"),
+    total_mode: Optional[TotalMode] = Query(None, description="exact, estimate or none (defaults to exact in page mode, none in cursor mode)")
 ):
     base_query = db.query(Task).join(Team).join(TeamMember).filter(
         TeamMember.user_id == current_user.id,
         TeamMember.is_active == True
-    )
+    ).options(*task_list_options())
 
     filtered_query = build_advanced_task_query(base_query, advanced_filters, current_user.id)
+    search_term = primary_search(advanced_filters.filters)
 
-    return paginate_query(filtered_query, page, size, enrich_tasks_with_dependency_info, db)
+    return mapped_response(paginated_tasks_mapper, paginate_query(
+        filtered_query, page, size, search_enricher(search_term), db,
+        mode=mode, cursor=cursor, sort_column=task_sort_column(sort_by, mode, search_term), sort_order=sort_order,
+        total_mode=total_mode
+    ))
 
 @router.get("/{task_id}", response_model=TaskDetailResponse)
 def get_task(task_id: uuid.UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = db.query(Task).filter(Task.id == task_id).options(*task_detail_options()).first()
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
 
     check_team_access(task.team_id, current_user, db)
 
-    assignments = db.query(TaskAssignment).filter(TaskAssignment.task_id == task_id).all()
-    subtasks = db.query(Task).filter(Task.parent_task_id == task_id).all()
+    enrich_tasks_with_dependency_info([task] + task.subtasks, db)
+    return task
 
-    task.is_blocked = is_task_blocked(task.id, db)
-    task.blocking_task_count = db.query(TaskDependency).filter(
-        TaskDependency.depends_on_task_id == task.id
-    ).count()
-
-    task_dict = {
-        "id": task.id,
-        "title": task.title,
-        "description": task.description,
-        "status": task.status,
-        "priority": task.priority,
-        "due_date": task.due_date,
-        "parent_task_id": task.parent_task_id,
-        "team_id": task.team_id,
-        "created_by": task.created_by,
-        "created_at": task.created_at,
-        "updated_at": task.updated_at,
-        "is_blocked": task.is_blocked,
-        "blocking_task_count": task.blocking_task_count,
-        "assignments": assignments,
-        "subtasks": subtasks
-    }
-    return task_dict
+@router.get("/{task_id}/tree", response_model=TaskTreeResponse)
+def get_task_tree(
+    task_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    max_depth: int = Query(10, ge=0, le=50, description="Deepest level to include (the task itself is level 0)"),
+    max_nodes: int = Query(500, ge=1, le=5000, description="Most nodes to return; nodes nearest the root are kept first"),
+    flat: bool = Query(False, description="Return a depth-first list of nodes with depth instead of a nested tree")
+):
+    root = db.query(Task).filter(Task.id == task_id).first()
+    if not root:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+    # Team access, not check_task_access: being the root's creator must not expose other people's subtasks.
+    check_team_access(root.team_id, current_user, db)
+
+    rows, truncated = load_task_subtree(root, db, max_depth, max_nodes)
+    enrich_tasks_with_dependency_info([task for task, _, _ in rows], db)
+
+    return MappedJSONResponse({
+        "root": None if flat else nest_task_subtree(rows),
+        "nodes": flatten_task_subtree(rows) if flat else None,
+        "node_count": len(rows),
+        "truncated": truncated
+    })
 
 @router.put("/{task_id}", response_model=TaskResponse)
 def update_task(
@@ -200,7 +299,8 @@ def update_task(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    # Locked so the old status the counter changes are based on stays current.
+    task = db.query(Task).filter(Task.id == task_id).with_for_update().first()
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
 
@@ -230,16 +330,17 @@ def update_task(
     for field, value in update_data.items():
         setattr(task, field, value)
 
+    db.flush()
+    apply_status_transition(task.id, old_status, task.status, db)
+    record_task_changes([task.id], db)
+
     db.commit()
     db.refresh(task)
 
     if old_status != TaskStatus.DONE and task.status == TaskStatus.DONE:
         update_dependent_tasks_status(task.id, db)
 
-    task.is_blocked = is_task_blocked(task.id, db)
-    task.blocking_task_count = db.query(TaskDependency).filter(
-        TaskDependency.depends_on_task_id == task.id
-    ).count()
+    enrich_tasks_with_dependency_info([task], db)
 
     return task
 
@@ -282,6 +383,7 @@ def assign_task(
     )
 
     db.add(assignment)
+    record_task_changes([task_id], db)
     db.commit()
     db.refresh(assignment)
     return assignment
@@ -311,13 +413,12 @@ def create_subtask(
     )
 
     db.add(subtask)
+    db.flush()
+    record_task_changes([subtask.id], db)
     db.commit()
     db.refresh(subtask)
 
-    subtask.is_blocked = is_task_blocked(subtask.id, db)
-    subtask.blocking_task_count = db.query(TaskDependency).filter(
-        TaskDependency.depends_on_task_id == subtask.id
-    ).count()
+    enrich_tasks_with_dependency_info([subtask], db)
 
     return subtask
 
@@ -327,36 +428,49 @@ def bulk_update_tasks(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    results = []
+    results = bulk_update_tasks_in_batch(bulk_data.task_updates, bulk_data.mode, current_user, db)
 
-    for update_item in bulk_data.task_updates:
-        try:
-            task_id = uuid.UUID(update_item.get("task_id"))
-            task = db.query(Task).filter(Task.id == task_id).first()
-
-            if not task:
-                results.append({"task_id": str(task_id), "success": False, "error": "Task not found"})
-                continue
-
-            try:
-                check_team_access(task.team_id, current_user, db)
-            except HTTPException as e:
-                results.append({"task_id": str(task_id), "success": False, "error": e.detail})
-                continue
-
-            update_fields = {k: v for k, v in update_item.items() if k != "task_id" and v is not None}
+    return {"results": results}
 
-            for field, value in update_fields.items():
-                if hasattr(task, field):
-                    setattr(task, field, value)
+@router.post("/bulk")
+def bulk_create_tasks(
+    bulk_data: BulkTaskCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    importer = TaskImporter(current_user, db, bulk_data.mode)
+    rows = ((row_number, row, None) for row_number, row in enumerate(bulk_data.tasks, start=1))
 
-            db.commit()
-            results.append({"task_id": str(task_id), "success": True})
+    return {"results": list(importer.run(rows))}
 
-        except Exception as e:
-            results.append({"task_id": update_item.get("task_id", "unknown"), "success": False, "error": str(e)})
+@router.post("/import")
+async def import_tasks(
+    request: Request,
+    import_format: Optional[ImportFormat] = Query(None, alias="format", description="ndjson or csv (defaults from Content-Type)"),
+    mode: BulkMode = Query(BulkMode.BEST_EFFORT, description="best_effort commits valid rows per batch; all_or_nothing imports every row or none"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if import_format is None:
+        content_type = request.headers.get("content-type", "")
+        import_format = ImportFormat.CSV if "csv" in content_type else ImportFormat.NDJSON
+
+    # Spool the whole body first: reading the request while the response streams
+    # would compete with Starlette's disconnect listener for receive().
+    upload = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_MEMORY)
+    async for chunk in request.stream():
+        upload.write(chunk)
+    upload.seek(0)
+
+    def results():
+        try:
+            importer = TaskImporter(current_user, db, mode)
+            for result in importer.run(iter_import_rows(upload, import_format)):
+                yield json.dumps(result) + "\n"
+        finally:
+            upload.close()
 
-    return {"results": results}
+    return StreamingResponse(stream_with_session(results(), db), media_type="application/x-ndjson")
 
 @router.get("/{task_id}/assignments", response_model=List[TaskAssignmentResponse])
 def list_task_assignments(
@@ -395,6 +509,7 @@ def remove_task_assignment(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
 
     db.delete(assignment)
+    record_task_changes([task_id], db)
     db.commit()
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -403,7 +518,8 @@ def delete_task(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    # Locked so apply_task_removed sees the status a concurrent update would change.
+    task = db.query(Task).filter(Task.id == task_id).with_for_update().first()
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
 
@@ -417,5 +533,12 @@ def delete_task(
         subtask.parent_task_id = None
 
     db.query(TaskAssignment).filter(TaskAssignment.task_id == task_id).delete()
+    apply_task_removed(task, db)
+    db.query(TaskDependency).filter(
+        or_(TaskDependency.task_id == task_id, TaskDependency.depends_on_task_id == task_id)
+    ).delete(synchronize_session=False)
+    team_id = task.team_id
     db.delete(task)
-    db.commit()
\ No newline at end of file
+    db.commit()
+
+    record_task_removed(team_id, task_id)
\ No newline at end of file
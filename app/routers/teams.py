@@ -5,9 +5,14 @@ import uuid
 from app.database import get_db
 from app.models.team import Team
 from app.models.team_member import TeamMember
+from app.models.task import Task
+from app.models.task_assignment import TaskAssignment
+from app.models.task_dependency import TaskDependency
 from app.models.user import User
 from app.schemas.team import TeamCreate, TeamResponse, TeamMemberAdd, TeamMemberResponse, TeamDetailResponse
 from app.dependencies import get_current_user
+from app.utils.dependency_graph import invalidate_team_dependency_graph
+from app.utils.saved_searches import mark_saved_searches_stale
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 
@@ -62,6 +67,7 @@ def add_team_member(
     )
 
     db.add(team_member)
+    mark_saved_searches_stale([user.id], db)
     db.commit()
     db.refresh(team_member)
     return team_member
@@ -124,6 +130,7 @@ def remove_team_member(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team member not found")
 
     member.is_active = False
+    mark_saved_searches_stale([user_id], db)
     db.commit()
 
 @router.put("/{team_id}", response_model=TeamResponse)
@@ -166,6 +173,11 @@ def delete_team(
     for task in team_tasks:
         db.query(TaskAssignment).filter(TaskAssignment.task_id == task.id).delete()
 
+    team_task_ids = db.query(Task.id).filter(Task.team_id == team_id)
+    db.query(TaskDependency).filter(TaskDependency.task_id.in_(team_task_ids)).delete(synchronize_session=False)
+
     db.query(Task).filter(Task.team_id == team_id).delete()
     db.delete(team)
-    db.commit()
\ No newline at end of file
+    db.commit()
+
+    invalidate_team_dependency_graph(team_id)
\ No newline at end of file
@@ -1,21 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.utils.pagination import paginate_query
+from app.utils.pagination import paginate_query, PaginationMode, SortOrder, TotalMode
 import uuid
 from app.database import get_db
 from app.models.user import User, UserRole
-from app.schemas.user import UserResponse, PaginatedUsersResponse
-from app.dependencies import get_current_user
+from app.schemas.user import UserResponse, PaginatedUsersResponse, UserSortField
+from app.dependencies import get_current_user, invalidate_principal
+from app.utils.serialization import model_mapper, mapped_response
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+paginated_users_mapper = model_mapper(PaginatedUsersResponse)
+
 @router.get("/", response_model=PaginatedUsersResponse)
 def list_users(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    mode: PaginationMode = Query(PaginationMode.PAGE, description="Paginate by page number or by opaque cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous next_cursor or prev_cursor"),
+    sort_by: UserSortField = Query(UserSortField.CREATED_AT, description="Field to sort by"),
+    sort_order: SortOrder = Query(SortOrder.DESC, description="Sort direction"),
+    total_mode: Optional[TotalMode] = Query(None, description="exact, estimate or none (defaults to exact in page mode, none in cursor mode)"),
     role: Optional[UserRole] = Query(None),
     search: Optional[str] = Query(None)
 ):
@@ -31,7 +39,11 @@ def list_users(
             User.username.contains(search) | User.email.contains(search)
         )
 
-    return paginate_query(query, page, size)
+    return mapped_response(paginated_users_mapper, paginate_query(
+        query, page, size, db=db,
+        mode=mode, cursor=cursor, sort_column=getattr(User, sort_by.value), sort_order=sort_order,
+        total_mode=total_mode
+    ))
 
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
@@ -65,4 +77,5 @@ def delete_user(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
     db.delete(user)
-    db.commit()
\ No newline at end of file
+    db.commit()
+    invalidate_principal(user_id)
\ No newline at end of file
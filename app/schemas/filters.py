@@ -9,10 +9,32 @@ class FilterOperator(str, Enum):
     AND = "and"
     OR = "or"
 
+class TaskSortField(str, Enum):
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    TITLE = "title"
+    RELEVANCE = "relevance"  # page mode only, requires a search term
+
+class SearchMode(str, Enum):
+    CONTAINS = "contains"  # substring match (ILIKE), served by the trigram indexes
+    FULLTEXT = "fulltext"  # stemmed word match against the tsvector, websearch syntax
+    FUZZY = "fuzzy"  # typo-tolerant trigram word similarity
+
+class TagMatch(str, Enum):
+    ANY = "any"  # task carries at least one of the requested tags
+    ALL = "all"  # task carries every requested tag
+
 class DateFilter(BaseModel):
     before: Optional[date] = None
     after: Optional[date] = None
     on: Optional[date] = None
+    # Relative to the day the filter is evaluated, both ends inclusive.
+    last_days: Optional[int] = Field(None, ge=0)
+    next_days: Optional[int] = Field(None, ge=0)
+
+    @property
+    def is_relative(self) -> bool:
+        return self.last_days is not None or self.next_days is not None
 
 class TaskFilters(BaseModel):
     team_id: Optional[uuid.UUID] = None
@@ -28,9 +50,11 @@ class TaskFilters(BaseModel):
     updated_at: Optional[DateFilter] = None
 
     search: Optional[str] = None
+    search_mode: SearchMode = SearchMode.CONTAINS
 
     tag_ids: Optional[List[uuid.UUID]] = None
     tag_names: Optional[List[str]] = None
+    tag_match: TagMatch = TagMatch.ANY
 
     operator: FilterOperator = FilterOperator.AND
 
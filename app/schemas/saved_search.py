@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import Optional
+from app.schemas.filters import AdvancedTaskFilters
+import uuid
+
+class SavedSearchBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    filters: AdvancedTaskFilters
+
+class SavedSearchCreate(SavedSearchBase):
+    pass
+
+class SavedSearchUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    filters: Optional[AdvancedTaskFilters] = None
+
+class SavedSearchResponse(SavedSearchBase):
+    id: uuid.UUID
+    owner_id: uuid.UUID
+    is_time_relative: bool
+    evaluated_on: Optional[date] = None
+    refreshed_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime, date
+from enum import Enum
 from typing import List, Optional
 from app.models.task import TaskStatus, TaskPriority
 from app.utils.pagination import PaginatedResponse
@@ -48,6 +49,8 @@ class TaskResponse(TaskBase):
     tags: List[TagResponse] = []
     is_blocked: Optional[bool] = None
     blocking_task_count: Optional[int] = None
+    search_rank: Optional[float] = None
+    search_snippet: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -59,8 +62,41 @@ class TaskDetailResponse(TaskResponse):
     class Config:
         from_attributes = True
 
+class TaskTreeNode(TaskResponse):
+    depth: int
+    has_children: bool
+    children: List["TaskTreeNode"] = []
+
+class TaskTreeResponse(BaseModel):
+    root: Optional[TaskTreeNode] = None  # nested form
+    nodes: Optional[List[TaskTreeNode]] = None  # flat form: depth-first order, children left empty
+    node_count: int
+    truncated: bool  # max_depth or max_nodes cut the subtree short
+
+class BulkMode(str, Enum):
+    ALL_OR_NOTHING = "all_or_nothing"
+    BEST_EFFORT = "best_effort"
+
 class BulkTaskUpdate(BaseModel):
     task_updates: List[dict] = Field(..., min_items=1)
+    mode: BulkMode = BulkMode.BEST_EFFORT
+
+class ImportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class TaskImportRow(TaskBase):
+    team_id: uuid.UUID
+    client_id: Optional[str] = Field(None, min_length=1, max_length=100)
+    parent_task_id: Optional[uuid.UUID] = None
+    parent_client_id: Optional[str] = None
+    tag_ids: Optional[List[uuid.UUID]] = None
+    tag_names: Optional[List[str]] = None
+    depends_on: Optional[List[str]] = None  # client_ids of earlier rows or existing task ids
+
+class BulkTaskCreate(BaseModel):
+    tasks: List[dict] = Field(..., min_items=1)
+    mode: BulkMode = BulkMode.BEST_EFFORT
 
 class PaginatedTasksResponse(PaginatedResponse[TaskResponse]):
     pass
\ No newline at end of file
@@ -1,9 +1,15 @@
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
+from enum import Enum
 from app.models.user import UserRole
 from app.utils.pagination import PaginatedResponse
 import uuid
 
+class UserSortField(str, Enum):
+    CREATED_AT = "created_at"
+    USERNAME = "username"
+    EMAIL = "email"
+
 class UserBase(BaseModel):
     email: EmailStr
     username: str
@@ -0,0 +1,139 @@
+"""Serve the sync routers from async endpoints when DB_MODE=async.
+
+The hot read endpoints have native async handlers (app/routers/async_tasks.py).
+Every other route keeps its one implementation: async_router gives it an
+async def twin that takes the request's AsyncSession and runs the sync handler
+inside AsyncSession.run_sync. The handler then runs on the event loop against
+the async driver, each statement awaited through SQLAlchemy's greenlet bridge,
+so no threadpool slot is held while it waits on the database.
+"""
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession, async_session
+from sqlalchemy.orm import Session
+from starlette.responses import Response
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, TypeVar, Union
+import inspect
+from app.database import get_async_db, get_db
+from app.dependencies import get_current_user, get_current_user_async
+
+T = TypeVar("T")
+
+_END = object()
+
+async def run_db(fn: Callable[..., T], *args) -> T:
+    """Call fn(*args) from an async endpoint; its last argument is the Session.
+
+    On the sync stack fn runs in the threadpool. On a Session proxied by an
+    AsyncSession (DB_MODE=async) it runs in run_sync on the event loop.
+    """
+    proxy = async_session(args[-1])
+    if proxy is None:
+        return await run_in_threadpool(fn, *args)
+    return await proxy.run_sync(lambda session: fn(*args[:-1], session))
+
+def stream_with_session(chunks: Iterator[T], db: Session) -> Union[Iterator[T], AsyncIterator[T]]:
+    """StreamingResponse content for chunks that keep reading db while the response streams.
+
+    Starlette iterates a sync iterator in the threadpool, which suits a plain
+    Session. Under an AsyncSession each chunk is produced inside run_sync.
+    """
+    proxy = async_session(db)
+    if proxy is None:
+        return chunks
+
+    async def chunks_on_event_loop():
+        try:
+            while True:
+                chunk = await proxy.run_sync(lambda session: next(chunks, _END))
+                if chunk is _END:
+                    return
+                yield chunk
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                # Closing may release a server-side cursor.
+                await proxy.run_sync(lambda session: close())
+
+    return chunks_on_event_loop()
+
+def _async_endpoint(route: APIRoute) -> Callable:
+    endpoint = route.endpoint
+    signature = inspect.signature(endpoint)
+    session_params, parameters = [], []
+    for parameter in signature.parameters.values():
+        dependency = getattr(parameter.default, "dependency", None)
+        if dependency is get_db:
+            session_params.append(parameter.name)
+            parameter = parameter.replace(annotation=AsyncSession, default=Depends(get_async_db))
+        elif dependency is get_current_user:
+            parameter = parameter.replace(default=Depends(get_current_user_async))
+        parameters.append(parameter)
+
+    response_type = TypeAdapter(route.response_model) if route.response_model is not None else None
+
+    def with_sync_sessions(values: Dict[str, Any]) -> Dict[str, Any]:
+        return {**values, **{name: values[name].sync_session for name in session_params}}
+
+    def run(session: Session, values: Dict[str, Any]):
+        # The handlers were written for SessionLocal, which expires on commit.
+        session.expire_on_commit = True
+        result = endpoint(**with_sync_sessions(values))
+        if response_type is not None and not isinstance(result, Response):
+            # Validated here, while lazy loads can still reach the database.
+            result = response_type.validate_python(result, from_attributes=True)
+        return result
+
+    if inspect.iscoroutinefunction(endpoint):
+        # Already async: it reaches the database through run_db and
+        # stream_with_session, which detect the AsyncSession behind the Session.
+        async def call(**values):
+            return await endpoint(**with_sync_sessions(values))
+    elif session_params:
+        async def call(**values):
+            return await values[session_params[0]].run_sync(run, values)
+    else:
+        async def call(**values):
+            return endpoint(**values)
+
+    call.__name__ = endpoint.__name__
+    call.__qualname__ = endpoint.__qualname__
+    call.__doc__ = endpoint.__doc__
+    call.__signature__ = signature.replace(parameters=parameters)
+    return call
+
+def async_router(router: APIRouter, exclude: Iterable[APIRouter] = ()) -> APIRouter:
+    """A router serving router's routes through async endpoints, minus the routes exclude serves natively."""
+    served = {
+        (route.path, method)
+        for native in exclude for route in native.routes if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    bridged = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute) or any((route.path, method) in served for method in route.methods):
+            continue
+        bridged.add_api_route(
+            route.path,
+            _async_endpoint(route),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            deprecated=route.deprecated,
+            methods=route.methods,
+            operation_id=route.operation_id,
+            include_in_schema=route.include_in_schema,
+            response_class=route.response_class,
+            name=route.name,
+            callbacks=route.callbacks,
+            openapi_extra=route.openapi_extra,
+            generate_unique_id_function=route.generate_unique_id_function
+        )
+    return bridged
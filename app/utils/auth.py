@@ -1,9 +1,31 @@
 from passlib.context import CryptContext
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from fastapi import HTTPException, status
+from typing import Optional, Tuple
 from jose import jwt
 from app.config import settings
+from app.utils.cache import MemoryBackend
+import asyncio
+import hashlib
+import threading
+import time
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max to the configured cost makes verify_and_update flag any
+# hash made with a different cost, so changing BCRYPT_ROUNDS rehashes on login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+    bcrypt__max_rounds=settings.bcrypt_rounds
+)
+
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_pending = 0
+_hash_lock = threading.Lock()
+
+verified_token_cache = MemoryBackend(maxsize=settings.auth_cache_max_entries, ttl=settings.auth_cache_ttl_seconds)
 
 def hash_password(password: str) -> str:
     if len(password) > 72:
@@ -15,6 +37,49 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         plain_password = plain_password[:72]
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    if len(plain_password) > 72:
+        plain_password = plain_password[:72]
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    with _hash_lock:
+        if _hash_executor is None:
+            _hash_executor = ProcessPoolExecutor(max_workers=settings.password_hash_workers)
+        return _hash_executor
+
+def shutdown_hash_executor():
+    global _hash_executor
+    with _hash_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(wait=False, cancel_futures=True)
+            _hash_executor = None
+
+async def _run_hashing(func, *args):
+    global _hash_pending
+    with _hash_lock:
+        if _hash_pending >= settings.password_hash_max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent authentication requests, retry shortly",
+                headers={"Retry-After": "1"}
+            )
+        _hash_pending += 1
+
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_hash_executor(), func, *args)
+    finally:
+        with _hash_lock:
+            _hash_pending -= 1
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run_hashing(verify_and_update_password, plain_password, hashed_password)
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(hours=settings.jwt_expire_hours)
@@ -22,8 +87,19 @@ def create_access_token(data: dict):
     return jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
 def decode_access_token(token: str):
+    token_key = hashlib.sha256(token.encode()).digest()
+    subject = verified_token_cache.get(token_key)
+    if subject is not None:
+        return subject
+
     try:
         payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        return payload.get("sub")
     except jwt.JWTError:
-        return None
\ No newline at end of file
+        return None
+
+    subject = payload.get("sub")
+    if subject is not None and payload.get("exp"):
+        remaining = payload["exp"] - time.time()
+        if remaining > 0:
+            verified_token_cache.set(token_key, subject, min(remaining, verified_token_cache.ttl))
+    return subject
\ No newline at end of file
@@ -0,0 +1,522 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import delete, insert, update
+from pydantic import ValidationError
+from collections import Counter
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from app.models.task import Task, TaskStatus
+from app.models.tag import Tag, task_tags
+from app.models.task_dependency import TaskDependency, DependencyType
+from app.models.user import User
+from app.schemas.task import TaskUpdate, TaskImportRow, BulkMode, ImportFormat
+from app.dependencies import get_auth_context
+from app.utils.dependency_counters import apply_blocker_status_changes
+from app.utils.dependency_logic import unblock_dependent_tasks
+from app.utils.dependency_graph import invalidate_team_dependency_graph
+from app.utils.saved_searches import record_task_changes
+import csv
+import io
+import json
+import uuid
+
+BULK_CHUNK_SIZE = 5000
+IMPORT_BATCH_SIZE = 1000
+IMPORT_SPOOL_MAX_MEMORY = 8 * 1024 * 1024  # larger uploads spill to a temp file
+IMPORT_LIST_FIELDS = ("tag_ids", "tag_names", "depends_on")
+
+class _PlannedUpdate:
+    __slots__ = ("index", "task_id", "fields", "tag_ids", "team_id", "old_status")
+
+    def __init__(self, index: int, task_id: uuid.UUID, fields: Dict[str, Any], tag_ids: Optional[List[uuid.UUID]]):
+        self.index = index
+        self.task_id = task_id
+        self.fields = fields
+        self.tag_ids = tag_ids
+        self.team_id = None
+        self.old_status = None
+
+def _chunks(values: Sequence, size: int = BULK_CHUNK_SIZE) -> Iterator[Sequence]:
+    for offset in range(0, len(values), size):
+        yield values[offset:offset + size]
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+def _parse_items(items: List[dict], results: List[Optional[dict]]) -> List[_PlannedUpdate]:
+    planned = []
+    seen = set()
+
+    for index, item in enumerate(items):
+        raw_id = item.get("task_id") if isinstance(item, dict) else None
+        try:
+            task_id = uuid.UUID(str(raw_id))
+        except (ValueError, TypeError):
+            results[index] = {"task_id": str(raw_id) if raw_id is not None else "unknown", "success": False, "error": "Invalid task_id"}
+            continue
+
+        if task_id in seen:
+            results[index] = {"task_id": str(task_id), "success": False, "error": "Duplicate task_id in request"}
+            continue
+        seen.add(task_id)
+
+        try:
+            task_update = TaskUpdate(**{key: value for key, value in item.items() if key != "task_id"})
+        except ValidationError as e:
+            results[index] = {"task_id": str(task_id), "success": False, "error": _validation_message(e)}
+            continue
+
+        # exclude_unset, as in update_task: an explicit null clears the field.
+        fields = task_update.model_dump(exclude_unset=True)
+        tag_ids = (fields.pop("tag_ids") or []) if "tag_ids" in fields else None
+        planned.append(_PlannedUpdate(index, task_id, fields, tag_ids))
+
+    return planned
+
+def _load_targets(planned: List[_PlannedUpdate], current_user: User, db: Session, results: List[Optional[dict]]) -> List[_PlannedUpdate]:
+    rows = {}
+    task_ids = [plan.task_id for plan in planned]
+    for chunk in _chunks(task_ids):
+        # Locked so the old statuses we base counter changes on stay current.
+        for task_id, team_id, old_status in (
+            db.query(Task.id, Task.team_id, Task.status).filter(Task.id.in_(chunk)).with_for_update()
+        ):
+            rows[task_id] = (team_id, old_status)
+
+    context = get_auth_context(current_user, db)
+    team_access = {team_id: context.can_access_team(team_id) for team_id, _ in rows.values()}
+
+    requested_tags = list({tag_id for plan in planned if plan.tag_ids for tag_id in plan.tag_ids})
+    tag_teams = {}
+    for chunk in _chunks(requested_tags):
+        tag_teams.update(db.query(Tag.id, Tag.team_id).filter(Tag.id.in_(chunk)).all())
+
+    targets = []
+    for plan in planned:
+        row = rows.get(plan.task_id)
+        if row is None:
+            results[plan.index] = {"task_id": str(plan.task_id), "success": False, "error": "Task not found"}
+            continue
+
+        plan.team_id, plan.old_status = row
+        if not team_access[plan.team_id]:
+            results[plan.index] = {"task_id": str(plan.task_id), "success": False, "error": "Access denied"}
+            continue
+
+        if plan.tag_ids and any(tag_teams.get(tag_id) != plan.team_id for tag_id in plan.tag_ids):
+            results[plan.index] = {
+                "task_id": str(plan.task_id),
+                "success": False,
+                "error": "Some tag IDs are invalid or not from the same team"
+            }
+            continue
+
+        targets.append(plan)
+
+    return targets
+
+def _group_key(fields: Dict[str, Any]) -> Tuple:
+    return tuple(sorted(fields.items(), key=lambda item: item[0]))
+
+def _apply_group(fields: Dict[str, Any], plans: List[_PlannedUpdate], db: Session):
+    task_ids = [plan.task_id for plan in plans]
+
+    if fields:
+        for chunk in _chunks(task_ids):
+            db.execute(
+                update(Task).where(Task.id.in_(chunk)).values(**fields),
+                execution_options={"synchronize_session": False}
+            )
+
+    tagged = [plan for plan in plans if plan.tag_ids is not None]
+    if tagged:
+        for chunk in _chunks([plan.task_id for plan in tagged]):
+            db.execute(delete(task_tags).where(task_tags.c.task_id.in_(chunk)))
+        links = [{"task_id": plan.task_id, "tag_id": tag_id} for plan in tagged for tag_id in plan.tag_ids]
+        if links:
+            db.execute(insert(task_tags), links)
+
+def _apply_status_changes(applied: List[_PlannedUpdate], db: Session):
+    completed_ids = []
+    reopened_ids = []
+    for plan in applied:
+        new_status = plan.fields.get("status")
+        if new_status is None:
+            continue
+        if plan.old_status != TaskStatus.DONE and new_status == TaskStatus.DONE:
+            completed_ids.append(plan.task_id)
+        elif plan.old_status == TaskStatus.DONE and new_status != TaskStatus.DONE:
+            reopened_ids.append(plan.task_id)
+
+    apply_blocker_status_changes(completed_ids, reopened_ids, db)
+    if completed_ids:
+        unblock_dependent_tasks(completed_ids, db)
+
+def bulk_update_tasks(items: List[dict], mode: BulkMode, current_user: User, db: Session) -> List[dict]:
+    """Apply many task updates in one transaction.
+
+    Items are validated against TaskUpdate and their targets loaded with one IN
+    query per chunk; access is decided per team. Items carrying identical field
+    changes share a single UPDATE ... WHERE id IN (...). Counters and dependent
+    unblocking for tasks moving to or from DONE run once for the whole batch.
+
+    In all-or-nothing mode any failing item rejects the batch; in best-effort
+    mode failing items are reported and the rest are applied, each group of
+    identical updates in its own savepoint.
+    """
+    results: List[Optional[dict]] = [None] * len(items)
+
+    planned = _parse_items(items, results)
+    targets = _load_targets(planned, current_user, db, results) if planned else []
+
+    if mode == BulkMode.ALL_OR_NOTHING and len(targets) != len(items):
+        db.rollback()
+        for plan in targets:
+            results[plan.index] = {"task_id": str(plan.task_id), "success": False, "error": "Not applied: another item in the batch failed"}
+        return results
+
+    groups: Dict[Tuple, List[_PlannedUpdate]] = {}
+    for plan in targets:
+        groups.setdefault(_group_key(plan.fields), []).append(plan)
+
+    applied: List[_PlannedUpdate] = []
+    try:
+        for plans in groups.values():
+            if mode == BulkMode.ALL_OR_NOTHING:
+                _apply_group(plans[0].fields, plans, db)
+                applied.extend(plans)
+                continue
+
+            try:
+                with db.begin_nested():
+                    _apply_group(plans[0].fields, plans, db)
+                applied.extend(plans)
+            except SQLAlchemyError as e:
+                for plan in plans:
+                    results[plan.index] = {"task_id": str(plan.task_id), "success": False, "error": str(getattr(e, "orig", None) or e)}
+
+        _apply_status_changes(applied, db)
+        for chunk in _chunks([plan.task_id for plan in applied]):
+            record_task_changes(chunk, db)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        for plan in targets:
+            results[plan.index] = {"task_id": str(plan.task_id), "success": False, "error": str(getattr(e, "orig", None) or e)}
+        return results
+
+    for plan in applied:
+        results[plan.index] = {"task_id": str(plan.task_id), "success": True}
+    return results
+
+def iter_ndjson_rows(stream: IO[bytes]) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    for row_number, line in enumerate(io.TextIOWrapper(stream, encoding="utf-8"), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield row_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, "Each line must be a JSON object"
+            continue
+        yield row_number, row, None
+
+def iter_csv_rows(stream: IO[bytes]) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8", newline=""))
+    for row_number, record in enumerate(reader, start=1):
+        row = {}
+        for key, value in record.items():
+            if key is None or value is None or value.strip() == "":
+                continue
+            value = value.strip()
+            if key in IMPORT_LIST_FIELDS:
+                row[key] = [part.strip() for part in value.split(",") if part.strip()]
+            else:
+                row[key] = value
+        yield row_number, row, None
+
+def iter_import_rows(stream: IO[bytes], import_format: ImportFormat) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    if import_format == ImportFormat.CSV:
+        return iter_csv_rows(stream)
+    return iter_ndjson_rows(stream)
+
+class _PlannedTask:
+    __slots__ = ("row_number", "client_id", "values", "tag_ids", "blocker_ids")
+
+    def __init__(self, row_number: int, client_id: Optional[str], values: Dict[str, Any], tag_ids: List[uuid.UUID], blocker_ids: List[uuid.UUID]):
+        self.row_number = row_number
+        self.client_id = client_id
+        self.values = values
+        self.tag_ids = tag_ids
+        self.blocker_ids = blocker_ids
+
+class TaskImporter:
+    """Create tasks from a stream of rows, IMPORT_BATCH_SIZE rows at a time.
+
+    Rows may name themselves with a client_id and refer to earlier rows (or to
+    existing tasks by id) as their parent or as blocking dependencies. Since a
+    row can only point backwards, an import can never introduce a cycle.
+
+    Each batch is validated in memory against tags loaded once per team and the
+    referenced existing tasks loaded in one query, then written with multi-row
+    INSERTs. Best-effort imports commit per batch; all-or-nothing imports run in
+    a single transaction and report nothing as created unless every row is.
+    """
+
+    def __init__(self, current_user: User, db: Session, mode: BulkMode = BulkMode.BEST_EFFORT):
+        self.current_user = current_user
+        self.db = db
+        self.mode = mode
+        self.context = get_auth_context(current_user, db)
+        self._client_ids: Dict[str, uuid.UUID] = {}
+        # (team_id, status) of tasks this import created, and of the existing
+        # tasks the current batch refers to (reloaded and locked per batch).
+        self._created: Dict[uuid.UUID, Tuple[uuid.UUID, TaskStatus]] = {}
+        self._existing: Dict[uuid.UUID, Tuple[uuid.UUID, TaskStatus]] = {}
+        self._team_tags: Dict[uuid.UUID, Tuple[Dict[uuid.UUID, str], Dict[str, uuid.UUID]]] = {}
+        self._dependency_teams = set()
+        self.failed = 0
+
+    def run(self, rows: Iterable[Tuple[int, Optional[dict], Optional[str]]]) -> Iterator[dict]:
+        if self.mode == BulkMode.ALL_OR_NOTHING:
+            yield from self._run_all_or_nothing(rows)
+            return
+
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                yield from self._process_batch(batch)
+                batch = []
+        if batch:
+            yield from self._process_batch(batch)
+
+    def _run_all_or_nothing(self, rows) -> Iterator[dict]:
+        results = []
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                results.extend(self._process_batch(batch, commit=False))
+                batch = []
+        if batch:
+            results.extend(self._process_batch(batch, commit=False))
+
+        if self.failed:
+            self.db.rollback()
+            for result in results:
+                if result["success"]:
+                    result.pop("task_id")
+                    result.update(success=False, error="Not applied: another row in the import failed")
+        else:
+            self.db.commit()
+            self._after_commit()
+        yield from results
+
+    def _team_tag_index(self, team_id: uuid.UUID) -> Tuple[Dict[uuid.UUID, str], Dict[str, uuid.UUID]]:
+        if team_id not in self._team_tags:
+            tags = self.db.query(Tag.id, Tag.name).filter(Tag.team_id == team_id).all()
+            self._team_tags[team_id] = ({tag_id: name for tag_id, name in tags}, {name: tag_id for tag_id, name in tags})
+        return self._team_tags[team_id]
+
+    def _load_existing(self, batch_rows: List[TaskImportRow]):
+        refs = set()
+        for row in batch_rows:
+            if row.parent_task_id:
+                refs.add(row.parent_task_id)
+            for reference in row.depends_on or ():
+                if reference not in self._client_ids:
+                    try:
+                        refs.add(uuid.UUID(reference))
+                    except ValueError:
+                        pass
+        refs = [ref for ref in refs if ref not in self._created]
+
+        self._existing = {}
+        for chunk in _chunks(refs):
+            # Locked like apply_dependency_added: blocker status decides the new counters.
+            for task_id, team_id, task_status in (
+                self.db.query(Task.id, Task.team_id, Task.status).filter(Task.id.in_(chunk)).with_for_update()
+            ):
+                self._existing[task_id] = (team_id, task_status)
+
+    def _resolve(self, reference: str, pending: Dict[str, uuid.UUID]) -> Optional[uuid.UUID]:
+        if reference in pending:
+            return pending[reference]
+        if reference in self._client_ids:
+            return self._client_ids[reference]
+        try:
+            task_id = uuid.UUID(reference)
+        except ValueError:
+            return None
+        return task_id if task_id in self._created or task_id in self._existing else None
+
+    def _task_info(self, task_id: Optional[uuid.UUID], pending_tasks: Dict) -> Optional[Tuple[uuid.UUID, TaskStatus]]:
+        return pending_tasks.get(task_id) or self._created.get(task_id) or self._existing.get(task_id)
+
+    def _plan_row(
+        self,
+        row: TaskImportRow,
+        row_number: int,
+        pending: Dict[str, uuid.UUID],
+        pending_tasks: Dict[uuid.UUID, Tuple[uuid.UUID, TaskStatus]]
+    ) -> _PlannedTask:
+        if not self.context.can_access_team(row.team_id):
+            raise ValueError("Access denied")
+
+        if row.client_id and (row.client_id in pending or row.client_id in self._client_ids):
+            raise ValueError(f"Duplicate client_id {row.client_id!r}")
+
+        tags_by_id, tags_by_name = self._team_tag_index(row.team_id)
+        tag_ids = list(dict.fromkeys(row.tag_ids or ()))
+        if any(tag_id not in tags_by_id for tag_id in tag_ids):
+            raise ValueError("Some tag IDs are invalid or not from the same team")
+        for name in row.tag_names or ():
+            if name not in tags_by_name:
+                raise ValueError(f"Unknown tag {name!r} for this team")
+            if tags_by_name[name] not in tag_ids:
+                tag_ids.append(tags_by_name[name])
+
+        def same_team_task(task_id: Optional[uuid.UUID], label: str) -> uuid.UUID:
+            known = self._task_info(task_id, pending_tasks)
+            if known is None:
+                raise ValueError(f"{label} not found; references must point to existing tasks or earlier rows")
+            if known[0] != row.team_id:
+                raise ValueError(f"{label} must be in the same team")
+            return task_id
+
+        parent_task_id = None
+        if row.parent_client_id:
+            parent_task_id = same_team_task(self._resolve(row.parent_client_id, pending), "Parent task")
+        elif row.parent_task_id:
+            parent_task_id = same_team_task(row.parent_task_id, "Parent task")
+
+        blocker_ids = list(dict.fromkeys(
+            same_team_task(self._resolve(reference, pending), f"Dependency {reference!r}")
+            for reference in row.depends_on or ()
+        ))
+
+        open_blockers = sum(
+            1 for blocker_id in blocker_ids
+            if self._task_info(blocker_id, pending_tasks)[1] != TaskStatus.DONE
+        )
+        task_status = row.status
+        if open_blockers and task_status not in (TaskStatus.BLOCKED, TaskStatus.DONE):
+            task_status = TaskStatus.BLOCKED
+
+        values = {
+            "id": uuid.uuid4(),
+            "title": row.title,
+            "description": row.description,
+            "status": task_status,
+            "priority": row.priority,
+            "due_date": row.due_date,
+            "parent_task_id": parent_task_id,
+            "team_id": row.team_id,
+            "created_by": self.current_user.id,
+            "open_blocking_dependency_count": open_blockers,
+            "dependent_count": 0
+        }
+        return _PlannedTask(row_number, row.client_id, values, tag_ids, blocker_ids)
+
+    def _write(self, planned: List[_PlannedTask]):
+        self.db.execute(insert(Task.__table__), [plan.values for plan in planned])
+
+        links = [{"task_id": plan.values["id"], "tag_id": tag_id} for plan in planned for tag_id in plan.tag_ids]
+        if links:
+            self.db.execute(insert(task_tags), links)
+
+        dependencies = [
+            {
+                "id": uuid.uuid4(),
+                "task_id": plan.values["id"],
+                "depends_on_task_id": blocker_id,
+                "dependency_type": DependencyType.BLOCKING
+            }
+            for plan in planned for blocker_id in plan.blocker_ids
+        ]
+        if dependencies:
+            self.db.execute(insert(TaskDependency.__table__), dependencies)
+
+            increments: Dict[int, List[uuid.UUID]] = {}
+            for blocker_id, count in Counter(dep["depends_on_task_id"] for dep in dependencies).items():
+                increments.setdefault(count, []).append(blocker_id)
+            for count, blocker_ids in increments.items():
+                for chunk in _chunks(blocker_ids):
+                    self.db.execute(
+                        update(Task).where(Task.id.in_(chunk)).values(dependent_count=Task.dependent_count + count),
+                        execution_options={"synchronize_session": False}
+                    )
+
+        record_task_changes([plan.values["id"] for plan in planned], self.db)
+
+    def _process_batch(self, batch: List[Tuple[int, Optional[dict], Optional[str]]], commit: bool = True) -> List[dict]:
+        results: List[dict] = []
+        parsed: List[Tuple[int, Optional[TaskImportRow], dict]] = []
+
+        for row_number, raw, error in batch:
+            client_id = raw.get("client_id") if raw else None
+            result = {"row": row_number, "client_id": client_id, "success": False}
+            results.append(result)
+            if error is not None:
+                result["error"] = error
+                parsed.append((row_number, None, result))
+                continue
+            try:
+                parsed.append((row_number, TaskImportRow(**raw), result))
+            except ValidationError as e:
+                result["error"] = _validation_message(e)
+                parsed.append((row_number, None, result))
+
+        self._load_existing([row for _, row, _ in parsed if row is not None])
+
+        pending: Dict[str, uuid.UUID] = {}
+        pending_tasks: Dict[uuid.UUID, Tuple[uuid.UUID, TaskStatus]] = {}
+        planned: List[Tuple[_PlannedTask, dict]] = []
+        for row_number, row, result in parsed:
+            if row is None:
+                continue
+            try:
+                plan = self._plan_row(row, row_number, pending, pending_tasks)
+            except ValueError as e:
+                result["error"] = str(e)
+                continue
+            task_id = plan.values["id"]
+            if plan.client_id:
+                pending[plan.client_id] = task_id
+            pending_tasks[task_id] = (plan.values["team_id"], plan.values["status"])
+            planned.append((plan, result))
+
+        if planned:
+            try:
+                with self.db.begin_nested():
+                    self._write([plan for plan, _ in planned])
+            except SQLAlchemyError as e:
+                error = str(getattr(e, "orig", None) or e)
+                for _, result in planned:
+                    result["error"] = error
+                planned = []
+
+        for plan, result in planned:
+            result.update(success=True, task_id=str(plan.values["id"]))
+            if plan.blocker_ids:
+                self._dependency_teams.add(plan.values["team_id"])
+        if planned:
+            self._client_ids.update(pending)
+            self._created.update(pending_tasks)
+        self.failed += sum(1 for result in results if not result["success"])
+
+        if commit:
+            self.db.commit()
+            self._after_commit()
+        return results
+
+    def _after_commit(self):
+        for team_id in self._dependency_teams:
+            invalidate_team_dependency_graph(team_id)
+        self._dependency_teams.clear()
+
@@ -1,47 +1,459 @@
-from functools import lru_cache
-from typing import Dict, Any
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, Iterable, List, Optional, Set
+from app.config import settings
+import json
+import logging
+import math
+import pickle
+import sys
+import threading
 import time
+import uuid
+
+try:
+    import redis
+except ImportError:  # optional: only needed for CACHE_BACKEND=redis
+    redis = None
+
+logger = logging.getLogger(__name__)
 
-in_memory_cache: Dict[str, Dict[str, Any]] = {}
 CACHE_TTL = 300  # 5 minutes
 
-@lru_cache(maxsize=100)
-def get_user_permissions(user_id: str, role: str) -> Dict[str, bool]:
-    permissions = {
-        "admin": {
-            "can_create_teams": True,
-            "can_delete_users": True,
-            "can_manage_all_teams": True,
-            "can_view_all_tasks": True
-        },
-        "manager": {
-            "can_create_teams": True,
-            "can_delete_users": False,
-            "can_manage_all_teams": False,
-            "can_view_all_tasks": False
-        },
-        "user": {
-            "can_create_teams": False,
-            "can_delete_users": False,
-            "can_manage_all_teams": False,
-            "can_view_all_tasks": False
-        }
+def approximate_size(value: Any, _depth: int = 0) -> int:
+    size = sys.getsizeof(value)
+    if _depth >= 3:
+        return size
+    if isinstance(value, dict):
+        size += sum(approximate_size(k, _depth + 1) + approximate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, _depth + 1) for item in value)
+    return size
+
+class _Entry:
+    __slots__ = ("value", "expires", "size", "tags")
+
+    def __init__(self, value: Any, expires: float, size: int, tags: frozenset):
+        self.value = value
+        self.expires = expires
+        self.size = size
+        self.tags = tags
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+_MISSING = object()
+
+def _namespace_tag(key: Hashable) -> Optional[str]:
+    if isinstance(key, str) and ":" in key:
+        return "ns:" + key.split(":", 1)[0]
+    return None
+
+class CacheBackend(ABC):
+    """Common interface for cache stores.
+
+    String keys of the form "namespace:rest" are indexed under their namespace so
+    a whole family of keys can be dropped with invalidate_namespace(); arbitrary
+    tags passed to set() can be dropped with invalidate_tag().
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL):
+        self.ttl = ttl
+        self.coalesced = 0
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._flights_lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()):
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: Hashable):
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate_tag(self, tag: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def invalidate_namespace(self, namespace: str) -> int:
+        return self.invalidate_tag("ns:" + namespace)
+
+    def get_or_set(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = ()
+    ) -> Any:
+        """Return the cached value, or compute it once even if many threads miss together.
+
+        The first caller to miss runs the loader; concurrent callers for the same key
+        wait for its result instead of hitting the backing store themselves. A None
+        result is returned but not cached.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            if flight.value is not None:
+                self.set(key, flight.value, ttl, tags)
+            return flight.value
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+class MemoryBackend(CacheBackend):
+    """Thread-safe in-process LRU with per-entry TTL, bounded by entry count and approximate bytes."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = CACHE_TTL, max_bytes: Optional[int] = None):
+        super().__init__(ttl)
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._bytes = 0
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def _remove(self, key: Hashable) -> Optional[_Entry]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            for tag in entry.tags:
+                keys = self._tags.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tags[tag]
+        return entry
+
+    def _evict_overflow(self):
+        while self._entries and (
+            len(self._entries) > self.maxsize
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() >= entry.expires:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        size = approximate_size(value)
+        entry_tags = set(tags)
+        namespace = _namespace_tag(key)
+        if namespace:
+            entry_tags.add(namespace)
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = _Entry(value, expires, size, frozenset(entry_tags))
+            self._bytes += size
+            for tag in entry_tags:
+                self._tags.setdefault(tag, set()).add(key)
+            self._evict_overflow()
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_tag(self, tag: str) -> int:
+        with self._lock:
+            keys = list(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "coalesced": self.coalesced
+            }
+
+class RedisBackend(CacheBackend):
+    """Cache shared by every worker through Redis (or anything speaking its protocol).
+
+    Values are pickled, entry expiry is delegated to Redis and size bounds to its
+    maxmemory policy. A Redis outage degrades to cache misses rather than errors.
+    """
+
+    def __init__(self, client, ttl: float = CACHE_TTL, prefix: str = "taskmanager:"):
+        super().__init__(ttl)
+        self.client = client
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._counter_lock = threading.Lock()
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.prefix}{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _count(self, counter: str):
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            raw = self.client.get(self._key(key))
+        except redis.RedisError:
+            logger.warning("cache get failed for %s", key, exc_info=True)
+            self._count("errors")
+            raw = None
+
+        if raw is None:
+            self._count("misses")
+            return default
+        self._count("hits")
+        return pickle.loads(raw)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()):
+        ttl_ms = max(1, math.ceil((self.ttl if ttl is None else ttl) * 1000))
+        entry_tags = set(tags)
+        namespace = _namespace_tag(key)
+        if namespace:
+            entry_tags.add(namespace)
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(self._key(key), pickle.dumps(value), px=ttl_ms)
+            for tag in entry_tags:
+                pipe.sadd(self._tag_key(tag), self._key(key))
+                # Tag sets only need to outlive the entries they point at.
+                pipe.pexpire(self._tag_key(tag), max(ttl_ms, int(self.ttl * 1000)))
+            pipe.execute()
+        except redis.RedisError:
+            logger.warning("cache set failed for %s", key, exc_info=True)
+            self._count("errors")
+
+    def delete(self, key: Hashable):
+        try:
+            self.client.delete(self._key(key))
+        except redis.RedisError:
+            logger.warning("cache delete failed for %s", key, exc_info=True)
+            self._count("errors")
+
+    def invalidate_tag(self, tag: str) -> int:
+        try:
+            keys = list(self.client.smembers(self._tag_key(tag)))
+            self.client.delete(self._tag_key(tag), *keys)
+            return len(keys)
+        except redis.RedisError:
+            logger.warning("cache tag invalidation failed for %s", tag, exc_info=True)
+            self._count("errors")
+            return 0
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(match=f"{self.prefix}*", count=1000))
+            for offset in range(0, len(keys), 1000):
+                self.client.delete(*keys[offset:offset + 1000])
+        except redis.RedisError:
+            logger.warning("cache clear failed", exc_info=True)
+            self._count("errors")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            return {
+                "backend": "redis",
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "coalesced": self.coalesced
+            }
+
+def _redis_client():
+    if redis is None:
+        raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+    if not settings.cache_redis_url:
+        raise RuntimeError("CACHE_BACKEND=redis requires CACHE_REDIS_URL")
+    return redis.Redis.from_url(settings.cache_redis_url)
+
+def create_cache_backend() -> CacheBackend:
+    if settings.cache_backend == "redis":
+        return RedisBackend(_redis_client(), ttl=CACHE_TTL, prefix=settings.cache_key_prefix)
+    if settings.cache_backend != "memory":
+        raise RuntimeError(f"Unknown CACHE_BACKEND {settings.cache_backend!r}")
+    return MemoryBackend(maxsize=settings.cache_max_entries, ttl=CACHE_TTL, max_bytes=settings.cache_max_bytes)
+
+default_cache = create_cache_backend()
+
+# Cross-worker invalidation.
+#
+# Some state has to live in each worker's memory (ORM snapshots, dependency
+# graphs), so a write in one worker must tell the others to drop their copy.
+# Handlers are registered per kind; broadcast_invalidation runs them here and,
+# with the redis backend, publishes the event for every other worker to run.
+
+_invalidation_handlers: Dict[str, List[Callable[[str], None]]] = {}
+_worker_id = uuid.uuid4().hex
+_listener: Optional["InvalidationListener"] = None
+
+def on_invalidation(kind: str, handler: Callable[[str], None]):
+    _invalidation_handlers.setdefault(kind, []).append(handler)
+
+def _dispatch_invalidation(kind: str, key: str):
+    for handler in _invalidation_handlers.get(kind, ()):
+        try:
+            handler(key)
+        except Exception:
+            logger.exception("invalidation handler failed for %s %s", kind, key)
+
+def broadcast_invalidation(kind: str, key: Any, include_local: bool = True):
+    key = str(key)
+    if include_local:
+        _dispatch_invalidation(kind, key)
+
+    if isinstance(default_cache, RedisBackend):
+        message = json.dumps({"origin": _worker_id, "kind": kind, "key": key})
+        try:
+            default_cache.client.publish(settings.cache_invalidation_channel, message)
+        except redis.RedisError:
+            logger.warning("failed to publish invalidation for %s %s", kind, key, exc_info=True)
+
+class InvalidationListener(threading.Thread):
+    def __init__(self, client, channel: str):
+        super().__init__(name="cache-invalidation", daemon=True)
+        self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self.pubsub.subscribe(channel)
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                message = self.pubsub.get_message(timeout=1.0)
+            except redis.RedisError:
+                logger.warning("invalidation listener lost its connection", exc_info=True)
+                self._stopped.wait(1.0)
+                continue
+            if not message:
+                continue
+
+            try:
+                event = json.loads(message["data"])
+            except (TypeError, ValueError):
+                continue
+            if event.get("origin") != _worker_id:
+                _dispatch_invalidation(event["kind"], event["key"])
+
+    def stop(self):
+        self._stopped.set()
+        self.join(timeout=5)
+        self.pubsub.close()
+
+def start_invalidation_listener():
+    global _listener
+    if _listener is None and isinstance(default_cache, RedisBackend):
+        _listener = InvalidationListener(default_cache.client, settings.cache_invalidation_channel)
+        _listener.start()
+
+def stop_invalidation_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+_ROLE_PERMISSIONS = {
+    "admin": {
+        "can_create_teams": True,
+        "can_delete_users": True,
+        "can_manage_all_teams": True,
+        "can_view_all_tasks": True
+    },
+    "manager": {
+        "can_create_teams": True,
+        "can_delete_users": False,
+        "can_manage_all_teams": False,
+        "can_view_all_tasks": False
+    },
+    "user": {
+        "can_create_teams": False,
+        "can_delete_users": False,
+        "can_manage_all_teams": False,
+        "can_view_all_tasks": False
     }
-    return permissions.get(role, permissions["user"])
+}
+
+def get_user_permissions(user_id: str, role: str) -> Dict[str, bool]:
+    return default_cache.get_or_set(
+        f"permissions:{user_id}:{role}",
+        lambda: dict(_ROLE_PERMISSIONS.get(role, _ROLE_PERMISSIONS["user"])),
+        tags=(f"user:{user_id}",)
+    )
 
 def cache_set(key: str, value: Any, ttl: int = CACHE_TTL):
-    in_memory_cache[key] = {
-        "value": value,
-        "expires": time.time() + ttl
-    }
+    default_cache.set(key, value, ttl)
 
 def cache_get(key: str) -> Any:
-    if key in in_memory_cache:
-        if time.time() < in_memory_cache[key]["expires"]:
-            return in_memory_cache[key]["value"]
-        else:
-            del in_memory_cache[key]
-    return None
+    return default_cache.get(key)
 
 def cache_clear():
-    in_memory_cache.clear()
\ No newline at end of file
+    default_cache.clear()
@@ -0,0 +1,166 @@
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event, exc
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+import threading
+import time
+
+_request_pool_wait: ContextVar[Optional[List[float]]] = ContextVar("request_pool_wait", default=None)
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _add_request_wait(self, seconds: float):
+        request_wait = _request_pool_wait.get()
+        if request_wait is not None:
+            request_wait[0] += seconds
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+
+    def record_checkin(self):
+        with self._lock:
+            self.checkins += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+        self._add_request_wait(seconds)
+
+    def record_timeout(self, seconds: float):
+        with self._lock:
+            self.timeouts += 1
+        self._add_request_wait(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "timeouts": self.timeouts,
+                "checkout_wait_avg_ms": round(self.wait_total / self.waits * 1000, 3) if self.waits else 0.0,
+                "checkout_wait_max_ms": round(self.wait_max * 1000, 3)
+            }
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+class InstrumentedPoolMixin:
+    """Times Pool.connect, the public checkout entry point, for the checkout wait.
+
+    The wait covers queueing for a free slot plus, when one is needed, opening
+    the connection and the pre-ping: the time a caller spent before it could
+    run a statement. Counters come from pool events (instrument_pool).
+    """
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout(time.perf_counter() - start)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    metrics = pool_metrics
+
+class InstrumentedAsyncPool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics = async_pool_metrics
+
+def pool_status(engine) -> Dict[str, Any]:
+    """Gauges and checkout metrics for engine's pool (an AsyncEngine's .sync_engine for async)."""
+    pool = engine.pool
+    gauges = {}
+    if isinstance(pool, QueuePool):
+        gauges = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow())
+        }
+    metrics = getattr(pool, "metrics", None)
+    return {**gauges, **(metrics.snapshot() if metrics else {})}
+
+def instrument_pool(engine):
+    """Count engine's connects, checkouts and checkins into its pool class's metrics."""
+    # Listening on the engine, not the pool, keeps the listeners on the pool
+    # that dispose() recreates.
+    metrics = engine.pool.metrics
+
+    @event.listens_for(engine, "connect")
+    def _record_connect(dbapi_connection, connection_record):
+        metrics.record_connect()
+
+    @event.listens_for(engine, "checkout")
+    def _record_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.record_checkout()
+
+    @event.listens_for(engine, "checkin")
+    def _record_checkin(dbapi_connection, connection_record):
+        metrics.record_checkin()
+
+class StatementCacheMetrics:
+    """Counts executions served from the engine's compiled-SQL cache versus freshly compiled."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def record(self, cache_hit):
+        with self._lock:
+            if cache_hit == CACHE_HIT:
+                self.hits += 1
+            elif cache_hit == CACHE_MISS:
+                self.misses += 1
+            else:
+                self.uncached += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "uncached": self.uncached}
+
+statement_cache_metrics = StatementCacheMetrics()
+
+def instrument_statement_cache(engine):
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_cache_hit(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            statement_cache_metrics.record(context.cache_hit)
+
+def statement_cache_status(engine) -> Dict[str, Any]:
+    cache = engine._compiled_cache
+    return {
+        "size": len(cache) if cache is not None else 0,
+        "capacity": cache.capacity if cache is not None else 0,
+        **statement_cache_metrics.snapshot()
+    }
+
+def start_request_pool_timing():
+    return _request_pool_wait.set([0.0])
+
+def finish_request_pool_timing(token) -> float:
+    waited = _request_pool_wait.get()
+    _request_pool_wait.reset(token)
+    return waited[0] if waited else 0.0
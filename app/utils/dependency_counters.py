@@ -0,0 +1,160 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, update
+from typing import Dict, Iterable, List, Optional
+from app.models.task import Task, TaskStatus
+from app.models.task_dependency import TaskDependency, DependencyType
+import argparse
+import uuid
+
+def _blocker_status(blocker_id: uuid.UUID, db: Session) -> Optional[TaskStatus]:
+    # Row lock so a concurrent status change on the blocker serialises with us.
+    return db.query(Task.status).filter(Task.id == blocker_id).with_for_update().scalar()
+
+def _shift(task_ids, column, delta: int, db: Session):
+    db.query(Task).filter(Task.id.in_(task_ids)).update(
+        {column: column + delta}, synchronize_session=False
+    )
+
+def apply_dependency_added(dependency: TaskDependency, db: Session):
+    blocker_status = _blocker_status(dependency.depends_on_task_id, db)
+
+    _shift([dependency.depends_on_task_id], Task.dependent_count, 1, db)
+    if dependency.dependency_type == DependencyType.BLOCKING and blocker_status != TaskStatus.DONE:
+        _shift([dependency.task_id], Task.open_blocking_dependency_count, 1, db)
+
+def apply_dependency_removed(dependency: TaskDependency, db: Session):
+    blocker_status = _blocker_status(dependency.depends_on_task_id, db)
+
+    _shift([dependency.depends_on_task_id], Task.dependent_count, -1, db)
+    if dependency.dependency_type == DependencyType.BLOCKING and blocker_status != TaskStatus.DONE:
+        _shift([dependency.task_id], Task.open_blocking_dependency_count, -1, db)
+
+def apply_task_removed(task: Task, db: Session):
+    _shift(
+        db.query(TaskDependency.depends_on_task_id).filter(TaskDependency.task_id == task.id),
+        Task.dependent_count, -1, db
+    )
+    if task.status != TaskStatus.DONE:
+        _shift(
+            db.query(TaskDependency.task_id).filter(
+                TaskDependency.depends_on_task_id == task.id,
+                TaskDependency.dependency_type == DependencyType.BLOCKING
+            ),
+            Task.open_blocking_dependency_count, -1, db
+        )
+
+def _shift_open_counts(blocker_ids: List[uuid.UUID], direction: int, db: Session):
+    per_task = (
+        db.query(TaskDependency.task_id.label("task_id"), func.count(TaskDependency.id).label("blockers"))
+        .filter(
+            TaskDependency.depends_on_task_id.in_(blocker_ids),
+            TaskDependency.dependency_type == DependencyType.BLOCKING
+        )
+        .group_by(TaskDependency.task_id)
+        .subquery()
+    )
+
+    db.execute(
+        update(Task)
+        .where(Task.id == per_task.c.task_id)
+        .values(open_blocking_dependency_count=Task.open_blocking_dependency_count + direction * per_task.c.blockers),
+        execution_options={"synchronize_session": False}
+    )
+
+def apply_blocker_status_changes(
+    completed_ids: Iterable[uuid.UUID],
+    reopened_ids: Iterable[uuid.UUID],
+    db: Session
+):
+    completed_ids = list(completed_ids)
+    reopened_ids = list(reopened_ids)
+
+    if completed_ids:
+        _shift_open_counts(completed_ids, -1, db)
+    if reopened_ids:
+        _shift_open_counts(reopened_ids, 1, db)
+
+def apply_status_transition(task_id: uuid.UUID, old_status, new_status, db: Session):
+    was_done = old_status == TaskStatus.DONE
+    is_done = new_status == TaskStatus.DONE
+
+    if not was_done and is_done:
+        apply_blocker_status_changes([task_id], [], db)
+    elif was_done and not is_done:
+        apply_blocker_status_changes([], [task_id], db)
+
+def _actual_counts(db: Session, team_id: Optional[uuid.UUID] = None):
+    blocker = Task.__table__.alias("blocker")
+
+    open_counts = (
+        db.query(TaskDependency.task_id.label("task_id"), func.count(TaskDependency.id).label("n"))
+        .join(blocker, TaskDependency.depends_on_task_id == blocker.c.id)
+        .filter(
+            TaskDependency.dependency_type == DependencyType.BLOCKING,
+            blocker.c.status != TaskStatus.DONE
+        )
+        .group_by(TaskDependency.task_id)
+        .subquery()
+    )
+    dependent_counts = (
+        db.query(TaskDependency.depends_on_task_id.label("task_id"), func.count(TaskDependency.id).label("n"))
+        .group_by(TaskDependency.depends_on_task_id)
+        .subquery()
+    )
+
+    query = (
+        db.query(
+            Task.id,
+            Task.open_blocking_dependency_count,
+            func.coalesce(open_counts.c.n, 0),
+            Task.dependent_count,
+            func.coalesce(dependent_counts.c.n, 0)
+        )
+        .outerjoin(open_counts, open_counts.c.task_id == Task.id)
+        .outerjoin(dependent_counts, dependent_counts.c.task_id == Task.id)
+    )
+    if team_id:
+        query = query.filter(Task.team_id == team_id)
+
+    return query
+
+def find_counter_drift(db: Session, team_id: Optional[uuid.UUID] = None) -> List[Dict]:
+    drift = []
+    for task_id, stored_open, actual_open, stored_dependents, actual_dependents in _actual_counts(db, team_id).yield_per(1000):
+        if stored_open != actual_open or stored_dependents != actual_dependents:
+            drift.append({
+                "task_id": task_id,
+                "open_blocking_dependency_count": (stored_open, actual_open),
+                "dependent_count": (stored_dependents, actual_dependents)
+            })
+    return drift
+
+def repair_counter_drift(db: Session, team_id: Optional[uuid.UUID] = None) -> List[Dict]:
+    drift = find_counter_drift(db, team_id)
+    for item in drift:
+        db.query(Task).filter(Task.id == item["task_id"]).update({
+            Task.open_blocking_dependency_count: item["open_blocking_dependency_count"][1],
+            Task.dependent_count: item["dependent_count"][1]
+        }, synchronize_session=False)
+    db.commit()
+    return drift
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Check task dependency counters against task_dependencies")
+    parser.add_argument("--team-id", type=uuid.UUID, default=None)
+    parser.add_argument("--repair", action="store_true", help="Rewrite drifted counters")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.repair:
+            drift = repair_counter_drift(db, args.team_id)
+        else:
+            drift = find_counter_drift(db, args.team_id)
+        for item in drift:
+            print(item)
+        print(f"{len(drift)} task(s) with drifted counters{' repaired' if args.repair and drift else ''}")
+    finally:
+        db.close()
@@ -0,0 +1,181 @@
+from sqlalchemy.orm import Session
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.config import settings
+from app.models.task import Task
+from app.models.task_dependency import TaskDependency
+from app.utils.cache import broadcast_invalidation, on_invalidation
+import threading
+import time
+import uuid
+
+MAX_CACHED_TEAM_GRAPHS = 256
+TEAM_GRAPH_MAX_AGE = 300  # reload periodically to pick up changes made by other workers
+
+class TeamDependencyGraph:
+    def __init__(self, team_id: uuid.UUID, edges: Iterable[Tuple[uuid.UUID, uuid.UUID]], version: int = 0):
+        self.team_id = team_id
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self._depends_on: Dict[uuid.UUID, Set[uuid.UUID]] = {}
+        self._dependents: Dict[uuid.UUID, Set[uuid.UUID]] = {}
+        self._lock = threading.Lock()
+
+        for task_id, depends_on_task_id in edges:
+            self._link(task_id, depends_on_task_id)
+
+    def _link(self, task_id: uuid.UUID, depends_on_task_id: uuid.UUID):
+        self._depends_on.setdefault(task_id, set()).add(depends_on_task_id)
+        self._dependents.setdefault(depends_on_task_id, set()).add(task_id)
+
+    def _unlink(self, task_id: uuid.UUID, depends_on_task_id: uuid.UUID):
+        targets = self._depends_on.get(task_id)
+        if targets:
+            targets.discard(depends_on_task_id)
+            if not targets:
+                del self._depends_on[task_id]
+
+        sources = self._dependents.get(depends_on_task_id)
+        if sources:
+            sources.discard(task_id)
+            if not sources:
+                del self._dependents[depends_on_task_id]
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(targets) for targets in self._depends_on.values())
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.loaded_at > TEAM_GRAPH_MAX_AGE
+
+    def add_edge(self, task_id: uuid.UUID, depends_on_task_id: uuid.UUID):
+        with self._lock:
+            self._link(task_id, depends_on_task_id)
+            self.version += 1
+
+    def remove_edge(self, task_id: uuid.UUID, depends_on_task_id: uuid.UUID):
+        with self._lock:
+            self._unlink(task_id, depends_on_task_id)
+            self.version += 1
+
+    def remove_task(self, task_id: uuid.UUID):
+        with self._lock:
+            for depends_on_task_id in list(self._depends_on.get(task_id, ())):
+                self._unlink(task_id, depends_on_task_id)
+            for dependent_id in list(self._dependents.get(task_id, ())):
+                self._unlink(dependent_id, task_id)
+            self.version += 1
+
+    def find_path(self, start_id: uuid.UUID, target_id: uuid.UUID) -> Optional[List[uuid.UUID]]:
+        with self._lock:
+            parents: Dict[uuid.UUID, Optional[uuid.UUID]] = {start_id: None}
+            stack = [start_id]
+
+            while stack:
+                current = stack.pop()
+                if current == target_id:
+                    path = []
+                    while current is not None:
+                        path.append(current)
+                        current = parents[current]
+                    return list(reversed(path))
+
+                for next_id in self._depends_on.get(current, ()):
+                    if next_id not in parents:
+                        parents[next_id] = current
+                        stack.append(next_id)
+
+        return None
+
+    def reaches(self, start_id: uuid.UUID, target_id: uuid.UUID) -> bool:
+        return self.find_path(start_id, target_id) is not None
+
+_team_graphs: "OrderedDict[uuid.UUID, TeamDependencyGraph]" = OrderedDict()
+_team_generations: Dict[uuid.UUID, int] = {}
+_registry_lock = threading.Lock()
+
+def _bump_generation(team_id: uuid.UUID) -> Optional[TeamDependencyGraph]:
+    _team_generations[team_id] = _team_generations.get(team_id, 0) + 1
+    return _team_graphs.get(team_id)
+
+def load_team_dependency_graph(team_id: uuid.UUID, db: Session) -> TeamDependencyGraph:
+    edges = (
+        db.query(TaskDependency.task_id, TaskDependency.depends_on_task_id)
+        .join(Task, TaskDependency.task_id == Task.id)
+        .filter(Task.team_id == team_id)
+        .all()
+    )
+    return TeamDependencyGraph(team_id, edges)
+
+def get_team_dependency_graph(team_id: uuid.UUID, db: Session) -> TeamDependencyGraph:
+    with _registry_lock:
+        graph = _team_graphs.get(team_id)
+        if graph is not None and not graph.is_stale():
+            _team_graphs.move_to_end(team_id)
+            return graph
+        generation = _team_generations.get(team_id, 0)
+
+    graph = load_team_dependency_graph(team_id, db)
+
+    with _registry_lock:
+        # A concurrent write may have landed after our snapshot was read;
+        # use the graph for this check but don't publish it.
+        if _team_generations.get(team_id, 0) == generation:
+            _team_graphs[team_id] = graph
+            _team_graphs.move_to_end(team_id)
+            while len(_team_graphs) > MAX_CACHED_TEAM_GRAPHS:
+                _team_graphs.popitem(last=False)
+
+    return graph
+
+def index_enabled() -> bool:
+    return settings.dependency_cycle_check == "index"
+
+def check_index_configuration():
+    # Graphs are patched in place and other workers only hear about it over
+    # Redis pub/sub; with per-worker caches they would check against stale edges.
+    if index_enabled() and settings.cache_backend != "redis":
+        raise RuntimeError("DEPENDENCY_CYCLE_CHECK=index requires CACHE_BACKEND=redis")
+
+check_index_configuration()
+
+def record_dependency_added(team_id: uuid.UUID, task_id: uuid.UUID, depends_on_task_id: uuid.UUID):
+    if not index_enabled():
+        return
+    with _registry_lock:
+        graph = _bump_generation(team_id)
+    if graph is not None:
+        graph.add_edge(task_id, depends_on_task_id)
+    # This worker's graph is already patched; other workers reload theirs.
+    broadcast_invalidation("team_graph", team_id, include_local=False)
+
+def record_dependency_removed(team_id: uuid.UUID, task_id: uuid.UUID, depends_on_task_id: uuid.UUID):
+    if not index_enabled():
+        return
+    with _registry_lock:
+        graph = _bump_generation(team_id)
+    if graph is not None:
+        graph.remove_edge(task_id, depends_on_task_id)
+    broadcast_invalidation("team_graph", team_id, include_local=False)
+
+def record_task_removed(team_id: uuid.UUID, task_id: uuid.UUID):
+    if not index_enabled():
+        return
+    with _registry_lock:
+        graph = _bump_generation(team_id)
+    if graph is not None:
+        graph.remove_task(task_id)
+    broadcast_invalidation("team_graph", team_id, include_local=False)
+
+def _drop_team_dependency_graph(team_id):
+    team_id = uuid.UUID(str(team_id))
+    with _registry_lock:
+        _bump_generation(team_id)
+        _team_graphs.pop(team_id, None)
+
+on_invalidation("team_graph", _drop_team_dependency_graph)
+
+def invalidate_team_dependency_graph(team_id: uuid.UUID):
+    if not index_enabled():
+        return
+    broadcast_invalidation("team_graph", team_id)
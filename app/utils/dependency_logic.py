@@ -1,32 +1,64 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Set
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, exists, select, literal, cast
+from sqlalchemy.dialects.postgresql import UUID
+from typing import Dict, List, Optional
+from collections import deque
+from app.config import settings
 from app.models.task import Task, TaskStatus
 from app.models.task_dependency import TaskDependency, DependencyType
+from app.utils.dependency_graph import get_team_dependency_graph
+from app.utils.saved_searches import record_task_changes
 import uuid
 
-def has_circular_dependency(task_id: uuid.UUID, depends_on_task_id: uuid.UUID, db: Session) -> bool:
-    visited = set()
-
-    def dfs_check(current_task_id: uuid.UUID) -> bool:
-        if current_task_id == task_id:
-            return True
-        if current_task_id in visited:
-            return False
-
-        visited.add(current_task_id)
-
-        dependencies = db.query(TaskDependency).filter(
-            TaskDependency.task_id == current_task_id
-        ).all()
-
-        for dep in dependencies:
-            if dfs_check(dep.depends_on_task_id):
-                return True
-
-        return False
+def _reachable_from(start_id: uuid.UUID):
+    """Recursive CTE of every task start_id depends on, directly or not.
+
+    UNION (not UNION ALL) drops nodes already visited, so each task is
+    expanded once: the walk is linear in the edges it reaches, however many
+    paths lead through them, and terminates even if a cycle slipped in.
+    """
+    start = cast(literal(start_id, UUID(as_uuid=True)), UUID(as_uuid=True))
+    reachable = select(start.label("node_id")).cte("reachable", recursive=True)
+    return reachable.union(
+        select(TaskDependency.depends_on_task_id)
+        .join(reachable, TaskDependency.task_id == reachable.c.node_id)
+    )
 
-    return dfs_check(depends_on_task_id)
+def find_dependency_path(start_id: uuid.UUID, target_id: uuid.UUID, db: Session) -> Optional[List[uuid.UUID]]:
+    """The dependency chain from start_id to target_id, or None if target_id is not reachable.
+
+    The common case (no path) costs one EXISTS over the reachable set, which
+    Postgres stops evaluating at the first match. Only when a path exists are
+    the edges of the reachable subgraph fetched and the shortest chain rebuilt
+    with a breadth-first search.
+    """
+    reachable = _reachable_from(start_id)
+    if not db.scalar(select(exists().where(reachable.c.node_id == target_id))):
+        return None
+
+    successors: Dict[uuid.UUID, List[uuid.UUID]] = {}
+    for task_id, depends_on_id in db.execute(
+        select(TaskDependency.task_id, TaskDependency.depends_on_task_id)
+        .join(reachable, TaskDependency.task_id == reachable.c.node_id)
+    ):
+        successors.setdefault(task_id, []).append(depends_on_id)
+
+    previous = {start_id: None}
+    queue = deque([start_id])
+    while queue:
+        node_id = queue.popleft()
+        if node_id == target_id:
+            path = []
+            while node_id is not None:
+                path.append(node_id)
+                node_id = previous[node_id]
+            return path[::-1]
+        for next_id in successors.get(node_id, []):
+            if next_id not in previous:
+                previous[next_id] = node_id
+                queue.append(next_id)
+    return None
 
 def get_blocking_dependencies(task_id: uuid.UUID, db: Session) -> List[uuid.UUID]:
     incomplete_deps = (
@@ -44,26 +76,44 @@ def get_blocking_dependencies(task_id: uuid.UUID, db: Session) -> List[uuid.UUID
     return [dep[0] for dep in incomplete_deps]
 
 def is_task_blocked(task_id: uuid.UUID, db: Session) -> bool:
-    blocking_deps = get_blocking_dependencies(task_id, db)
-    return len(blocking_deps) > 0
+    open_count = db.query(Task.open_blocking_dependency_count).filter(Task.id == task_id).scalar()
+    return bool(open_count)
 
 def can_task_start(task_id: uuid.UUID, db: Session) -> bool:
     return not is_task_blocked(task_id, db)
 
+async def get_blocking_dependencies_async(task_id: uuid.UUID, db: AsyncSession) -> List[uuid.UUID]:
+    result = await db.execute(
+        select(TaskDependency.depends_on_task_id)
+        .join(Task, TaskDependency.depends_on_task_id == Task.id)
+        .where(
+            and_(
+                TaskDependency.task_id == task_id,
+                TaskDependency.dependency_type == DependencyType.BLOCKING,
+                Task.status != TaskStatus.DONE
+            )
+        )
+    )
+    return list(result.scalars().all())
+
+async def is_task_blocked_async(task_id: uuid.UUID, db: AsyncSession) -> bool:
+    open_count = await db.scalar(select(Task.open_blocking_dependency_count).where(Task.id == task_id))
+    return bool(open_count)
+
+async def can_task_start_async(task_id: uuid.UUID, db: AsyncSession) -> bool:
+    return not await is_task_blocked_async(task_id, db)
+
 def get_tasks_that_can_be_unblocked(completed_task_id: uuid.UUID, db: Session) -> List[uuid.UUID]:
-    dependent_tasks = (
-        db.query(TaskDependency.task_id)
-        .filter(TaskDependency.depends_on_task_id == completed_task_id)
-        .all()
+    dependent_ids = db.query(TaskDependency.task_id).filter(
+        TaskDependency.depends_on_task_id == completed_task_id
     )
 
-    unblockable_tasks = []
-    for task_tuple in dependent_tasks:
-        task_id = task_tuple[0]
-        if can_task_start(task_id, db):
-            unblockable_tasks.append(task_id)
+    unblockable_tasks = db.query(Task.id).filter(
+        Task.id.in_(dependent_ids),
+        Task.open_blocking_dependency_count == 0
+    ).all()
 
-    return unblockable_tasks
+    return [task_tuple[0] for task_tuple in unblockable_tasks]
 
 def update_task_blocked_status(task_id: uuid.UUID, db: Session):
     task = db.query(Task).filter(Task.id == task_id).first()
@@ -74,20 +124,30 @@ def update_task_blocked_status(task_id: uuid.UUID, db: Session):
 
     if is_blocked and task.status not in [TaskStatus.BLOCKED, TaskStatus.DONE]:
         task.status = TaskStatus.BLOCKED
+        record_task_changes([task_id], db)
         db.commit()
     elif not is_blocked and task.status == TaskStatus.BLOCKED:
         task.status = TaskStatus.TODO
+        record_task_changes([task_id], db)
         db.commit()
 
-def update_dependent_tasks_status(completed_task_id: uuid.UUID, db: Session):
-    unblockable_tasks = get_tasks_that_can_be_unblocked(completed_task_id, db)
+def unblock_dependent_tasks(completed_task_ids: List[uuid.UUID], db: Session) -> int:
+    dependent_ids = db.query(TaskDependency.task_id).filter(
+        TaskDependency.depends_on_task_id.in_(completed_task_ids)
+    )
 
-    for task_id in unblockable_tasks:
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task and task.status == TaskStatus.BLOCKED:
-            task.status = TaskStatus.TODO
+    unblocked = db.query(Task).filter(
+        Task.id.in_(dependent_ids),
+        Task.status == TaskStatus.BLOCKED,
+        Task.open_blocking_dependency_count == 0
+    ).update({Task.status: TaskStatus.TODO}, synchronize_session=False)
+    if unblocked:
+        # Re-evaluating every dependent is harmless and avoids a RETURNING round trip.
+        record_task_changes(dependent_ids.statement, db)
+    return unblocked
 
-    if unblockable_tasks:
+def update_dependent_tasks_status(completed_task_id: uuid.UUID, db: Session):
+    if unblock_dependent_tasks([completed_task_id], db):
         db.commit()
 
 def validate_dependency_creation(task_id: uuid.UUID, depends_on_task_id: uuid.UUID, db: Session) -> dict:
@@ -115,7 +175,14 @@ def validate_dependency_creation(task_id: uuid.UUID, depends_on_task_id: uuid.UU
     if existing_dependency:
         return {"valid": False, "error": "Dependency already exists"}
 
-    if has_circular_dependency(task_id, depends_on_task_id, db):
-        return {"valid": False, "error": "Would create circular dependency"}
+    if settings.dependency_cycle_check == "index":
+        graph = get_team_dependency_graph(task.team_id, db)
+        cycle_path = graph.find_path(depends_on_task_id, task_id)
+    else:
+        cycle_path = find_dependency_path(depends_on_task_id, task_id, db)
+
+    if cycle_path:
+        path = " -> ".join(str(node_id) for node_id in [task_id] + cycle_path)
+        return {"valid": False, "error": f"Would create circular dependency: {path}"}
 
     return {"valid": True}
\ No newline at end of file
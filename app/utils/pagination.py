@@ -1,10 +1,34 @@
-from typing import Generic, TypeVar, List, Dict, Any, Callable, Optional
+from typing import Generic, TypeVar, List, Dict, Any, Callable, Optional, Union
 from sqlalchemy.orm import Query, Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, func, inspect, select, tuple_
+from fastapi import HTTPException, status
 from pydantic import BaseModel
+from datetime import date, datetime
+from enum import Enum
 from math import ceil
+from app.utils.cache import cache_get, cache_set
+import base64
+import hashlib
+import json
 
 T = TypeVar('T')
 
+ESTIMATED_COUNT_TTL = 30
+
+class PaginationMode(str, Enum):
+    PAGE = "page"
+    CURSOR = "cursor"
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+class TotalMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
 class PaginationParams(BaseModel):
     page: int = 1
     size: int = 20
@@ -15,28 +39,198 @@ class PaginationParams(BaseModel):
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: List[T]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    pages: int
+    pages: Optional[int] = None
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, (int, float, str, bool)):
+        return value
+    return str(value)
+
+def _column_value(value: Any, column) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if issubclass(python_type, datetime):
+        return datetime.fromisoformat(value)
+    if issubclass(python_type, date):
+        return date.fromisoformat(value)
+    return python_type(value)
+
+def encode_cursor(item: Any, sort_column, key_column, sort_order: SortOrder, direction: str) -> str:
+    payload = {
+        "s": sort_column.key,
+        "o": sort_order.value,
+        "d": direction,
+        "v": [_cursor_value(getattr(item, sort_column.key)), _cursor_value(getattr(item, key_column.key))]
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_column, key_column, sort_order: SortOrder) -> Dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["s"] != sort_column.key or payload["o"] != sort_order.value:
+            raise ValueError("cursor does not match the requested sort")
+        if payload["d"] not in ("next", "prev"):
+            raise ValueError("unknown cursor direction")
+        sort_value, key_value = payload["v"]
+        return {
+            "direction": payload["d"],
+            "values": (_column_value(sort_value, sort_column), _column_value(key_value, key_column))
+        }
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def _key_column(query):
+    entity = query.column_descriptions[0]["entity"]
+    return getattr(entity, inspect(entity).primary_key[0].key)
+
+def _ordering(sort_column, key_column, ascending: bool) -> list:
+    if ascending:
+        return [sort_column.asc(), key_column.asc()]
+    return [sort_column.desc(), key_column.desc()]
+
+def _count_cache_key(query, dialect) -> str:
+    statement = query.statement if isinstance(query, Query) else query
+    compiled = statement.compile(dialect=dialect)
+    params = sorted((key, repr(value)) for key, value in compiled.params.items())
+    digest = hashlib.sha1(f"{compiled.string}|{params}".encode()).hexdigest()
+    return f"count:{digest}"
+
+def _planner_row_estimate(query: Union[Query, Select], db: Session) -> Optional[int]:
+    dialect = db.bind.dialect
+    if dialect.name != "postgresql":
+        return None
+
+    statement = query.statement if isinstance(query, Query) else query
+    try:
+        sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+        with db.begin_nested():
+            plan = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + sql).scalar()
+        return max(0, int(plan[0]["Plan"]["Plan Rows"]))
+    except Exception:
+        return None
+
+def estimate_query_count(query: Query, db: Session) -> int:
+    key = _count_cache_key(query, db.bind.dialect)
+    total = cache_get(key)
+    if total is None:
+        total = _planner_row_estimate(query, db)
+        if total is None:
+            total = query.count()
+        cache_set(key, total, ESTIMATED_COUNT_TTL)
+    return total
+
+def count_query(query: Query, total_mode: TotalMode, db: Optional[Session]) -> Optional[int]:
+    if total_mode == TotalMode.EXACT:
+        return query.count()
+    if total_mode == TotalMode.ESTIMATE and db is not None:
+        return estimate_query_count(query, db)
+    return None
+
+def paginate_query_by_cursor(
+    query: Query,
+    size: int,
+    cursor: Optional[str],
+    sort_column,
+    sort_order: SortOrder
+) -> Dict[str, Any]:
+    key_column = _key_column(query)
+
+    direction = "next"
+    if cursor:
+        decoded = decode_cursor(cursor, sort_column, key_column, sort_order)
+        direction = decoded["direction"]
+
+    forward = direction == "next"
+    ascending = (sort_order == SortOrder.ASC) == forward
+
+    if cursor:
+        keyset = tuple_(sort_column, key_column)
+        bound = tuple_(*decoded["values"], types=[sort_column.type, key_column.type])
+        query = query.filter(keyset > bound if ascending else keyset < bound)
+
+    rows = query.order_by(*_ordering(sort_column, key_column, ascending)).limit(size + 1).all()
+    has_more = len(rows) > size
+    items = rows[:size]
+
+    if forward:
+        has_next, has_prev = has_more, cursor is not None
+    else:
+        items.reverse()
+        has_next, has_prev = True, has_more
+
+    return {
+        "items": items,
+        "has_next": has_next,
+        "has_prev": has_prev,
+        "next_cursor": encode_cursor(items[-1], sort_column, key_column, sort_order, "next") if has_next and items else None,
+        "prev_cursor": encode_cursor(items[0], sort_column, key_column, sort_order, "prev") if has_prev and items else None
+    }
 
 def paginate_query(
     query: Query,
     page: int = 1,
     size: int = 20,
     enricher: Optional[Callable[[List, Session], List]] = None,
-    db: Optional[Session] = None
+    db: Optional[Session] = None,
+    mode: PaginationMode = PaginationMode.PAGE,
+    cursor: Optional[str] = None,
+    sort_column=None,
+    sort_order: SortOrder = SortOrder.DESC,
+    total_mode: Optional[TotalMode] = None
 ) -> Dict[str, Any]:
-    page = max(1, page)
     size = min(100, max(1, size))
 
-    total = query.count()
-    pages = ceil(total / size) if total > 0 else 1
+    if total_mode is None:
+        total_mode = TotalMode.NONE if mode == PaginationMode.CURSOR else TotalMode.EXACT
+
+    if mode == PaginationMode.CURSOR:
+        if sort_column is None:
+            raise ValueError("Cursor pagination requires a sort column")
+
+        total = count_query(query, total_mode, db)
+        result = paginate_query_by_cursor(query, size, cursor, sort_column, sort_order)
+        if enricher and db:
+            result["items"] = enricher(result["items"], db)
+
+        return {"size": size, "total": total, **result}
+
+    page = max(1, page)
+
+    total = count_query(query, total_mode, db)
+
+    if sort_column is not None:
+        query = query.order_by(*_ordering(sort_column, _key_column(query), sort_order == SortOrder.ASC))
 
     offset = (page - 1) * size
-    items = query.offset(offset).limit(size).all()
+
+    if total_mode == TotalMode.EXACT:
+        items = query.offset(offset).limit(size).all()
+        has_next = page * size < total
+    else:
+        items = query.offset(offset).limit(size + 1).all()
+        has_next = len(items) > size
+        items = items[:size]
+
+    if total is not None:
+        pages = ceil(total / size) if total > 0 else 1
+        if total_mode == TotalMode.ESTIMATE:
+            pages = max(pages, page + 1 if has_next else page)
+    else:
+        pages = None
 
     if enricher and db:
         items = enricher(items, db)
@@ -47,6 +241,111 @@ def paginate_query(
         "page": page,
         "size": size,
         "pages": pages,
-        "has_next": page < pages,
+        "has_next": has_next,
+        "has_prev": page > 1
+    }
+
+
+async def _count_select_async(stmt: Select, total_mode: TotalMode, db: AsyncSession) -> Optional[int]:
+    if total_mode == TotalMode.NONE:
+        return None
+
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    if total_mode == TotalMode.EXACT:
+        return await db.scalar(count_stmt)
+
+    key = _count_cache_key(stmt, db.bind.sync_engine.dialect)
+    total = cache_get(key)
+    if total is None:
+        # Same planner estimate as the sync path, run on the session's sync side.
+        total = await db.run_sync(lambda session: _planner_row_estimate(stmt, session))
+        if total is None:
+            total = await db.scalar(count_stmt)
+        cache_set(key, total, ESTIMATED_COUNT_TTL)
+    return total
+
+async def paginate_select_async(
+    stmt: Select,
+    db: AsyncSession,
+    page: int = 1,
+    size: int = 20,
+    enricher: Optional[Callable[[List, Session], List]] = None,
+    mode: PaginationMode = PaginationMode.PAGE,
+    cursor: Optional[str] = None,
+    sort_column=None,
+    sort_order: SortOrder = SortOrder.DESC,
+    total_mode: Optional[TotalMode] = None
+) -> Dict[str, Any]:
+    size = min(100, max(1, size))
+    key_column = _key_column(stmt)
+
+    if total_mode is None:
+        total_mode = TotalMode.NONE if mode == PaginationMode.CURSOR else TotalMode.EXACT
+
+    total = await _count_select_async(stmt, total_mode, db)
+
+    if mode == PaginationMode.CURSOR:
+        if sort_column is None:
+            raise ValueError("Cursor pagination requires a sort column")
+
+        direction = "next"
+        if cursor:
+            decoded = decode_cursor(cursor, sort_column, key_column, sort_order)
+            direction = decoded["direction"]
+
+        forward = direction == "next"
+        ascending = (sort_order == SortOrder.ASC) == forward
+
+        if cursor:
+            keyset = tuple_(sort_column, key_column)
+            bound = tuple_(*decoded["values"], types=[sort_column.type, key_column.type])
+            stmt = stmt.where(keyset > bound if ascending else keyset < bound)
+
+        stmt = stmt.order_by(*_ordering(sort_column, key_column, ascending)).limit(size + 1)
+        rows = list((await db.execute(stmt)).scalars().all())
+        has_more = len(rows) > size
+        items = rows[:size]
+
+        if forward:
+            has_next, has_prev = has_more, cursor is not None
+        else:
+            items.reverse()
+            has_next, has_prev = True, has_more
+
+        if enricher:
+            items = enricher(items, db)
+
+        return {
+            "items": items,
+            "total": total,
+            "size": size,
+            "has_next": has_next,
+            "has_prev": has_prev,
+            "next_cursor": encode_cursor(items[-1], sort_column, key_column, sort_order, "next") if has_next and items else None,
+            "prev_cursor": encode_cursor(items[0], sort_column, key_column, sort_order, "prev") if has_prev and items else None
+        }
+
+    page = max(1, page)
+    if sort_column is not None:
+        stmt = stmt.order_by(*_ordering(sort_column, key_column, sort_order == SortOrder.ASC))
+
+    rows = list((await db.execute(stmt.offset((page - 1) * size).limit(size + 1))).scalars().all())
+    has_next = len(rows) > size
+    items = rows[:size]
+
+    pages = None
+    if total is not None:
+        pages = max(ceil(total / size) if total > 0 else 1, page + 1 if has_next else page)
+
+    if enricher:
+        items = enricher(items, db)
+
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": pages,
+        "has_next": has_next,
         "has_prev": page > 1
     }
\ No newline at end of file
@@ -1,134 +1,302 @@
-from sqlalchemy.orm import Query
-from sqlalchemy import and_, or_, func, text
-from typing import List, Optional, Union
-from datetime import date
+from sqlalchemy.orm import Query, joinedload, selectinload
+from sqlalchemy import Select, DateTime, and_, or_, func, select, text, true, bindparam
+from typing import Any, Dict, Hashable, List, Optional, Tuple, TypeVar, Union
+from datetime import date, datetime, time, timedelta
+from app.config import settings
 from app.models.task import Task, TaskStatus, TaskPriority
 from app.models.task_assignment import TaskAssignment
 from app.models.task_dependency import TaskDependency, DependencyType
 from app.models.tag import Tag, task_tags
 from app.models.team_member import TeamMember
-from app.schemas.filters import TaskFilters, AdvancedTaskFilters, DateFilter, FilterOperator
+from app.schemas.filters import TaskFilters, AdvancedTaskFilters, DateFilter, FilterOperator, SearchMode, TagMatch
+from app.utils.cache import MemoryBackend
+from app.utils.search import search_condition, search_value
+import math
+import operator
+import threading
 import uuid
+from time import perf_counter
 
-def build_date_filter(column, date_filter: DateFilter):
-    conditions = []
+# Filters apply equally to a sync ORM Query and to a 2.0-style Select used
+# with AsyncSession, since both expose filter(), join() and whereclause.
+TaskQuery = TypeVar("TaskQuery", Query, Select)
+
+# A normalized filter term: a hashable shape that decides the SQL, and the
+# values bound into it.
+FilterTerm = Tuple[Tuple[Hashable, ...], Dict[str, Any]]
+
+_COMPARATORS = {"eq": operator.eq, "lt": operator.lt, "gt": operator.gt, "ge": operator.ge}
+
+def _day_start(value: date) -> datetime:
+    return datetime.combine(value, time.min)
+
+# Half-open ranges on the bare column so the (team_id, <column>) indexes apply;
+# wrapping the column in date() would force a scan. Naive day boundaries are
+# read in the session time zone, matching what date(timestamptz) used to do.
+def date_filter_bounds(column, date_filter: DateFilter) -> List[Tuple[str, Any]]:
+    bounds = []
+    is_timestamp = isinstance(column.type, DateTime)
 
     if date_filter.on:
-        conditions.append(func.date(column) == date_filter.on)
+        if is_timestamp:
+            bounds.append(("ge", _day_start(date_filter.on)))
+            bounds.append(("lt", _day_start(date_filter.on + timedelta(days=1))))
+        else:
+            bounds.append(("eq", date_filter.on))
     if date_filter.before:
-        conditions.append(func.date(column) < date_filter.before)
+        bounds.append(("lt", _day_start(date_filter.before) if is_timestamp else date_filter.before))
     if date_filter.after:
-        conditions.append(func.date(column) > date_filter.after)
+        if is_timestamp:
+            bounds.append(("ge", _day_start(date_filter.after + timedelta(days=1))))
+        else:
+            bounds.append(("gt", date_filter.after))
+
+    today = date.today()
+    relative_ranges = []
+    if date_filter.last_days is not None:
+        relative_ranges.append((today - timedelta(days=date_filter.last_days), today))
+    if date_filter.next_days is not None:
+        relative_ranges.append((today, today + timedelta(days=date_filter.next_days)))
+    for first_day, last_day in relative_ranges:
+        after_last = last_day + timedelta(days=1)
+        bounds.append(("ge", _day_start(first_day) if is_timestamp else first_day))
+        bounds.append(("lt", _day_start(after_last) if is_timestamp else after_last))
 
+    return bounds
+
+def build_date_filter(column, date_filter: DateFilter):
+    conditions = [_COMPARATORS[op](column, value) for op, value in date_filter_bounds(column, date_filter)]
     return and_(*conditions) if conditions else None
 
-def build_task_query_filters(base_query: Query, filters: TaskFilters, current_user_id: uuid.UUID) -> Query:
-    query = base_query
+# Assignment and tag predicates are semi-joins (EXISTS / IN) rather than joins,
+# so a task matching several assignees or tags is still one row: counts, page
+# slots and OR-combined filter groups stay correct without DISTINCT.
+def has_any_assignee(user_ids):
+    return Task.assignments.any(TaskAssignment.user_id.in_(user_ids))
+
+def has_any_tag(tag_ids, tag_names):
+    tag_conditions = []
+    if tag_ids is not None:
+        tag_conditions.append(Tag.id.in_(tag_ids))
+    if tag_names is not None:
+        tag_conditions.append(Tag.name.in_(tag_names))
+    return Task.tags.any(or_(*tag_conditions))
+
+def has_all_tags(tag_ids, tag_id_count, tag_names, tag_name_count):
+    # One grouped IN-subquery per kind instead of an EXISTS per tag. Tag names
+    # are unique within a team and a task only carries its own team's tags.
     conditions = []
+    if tag_ids is not None:
+        conditions.append(Task.id.in_(
+            select(task_tags.c.task_id)
+            .where(task_tags.c.tag_id.in_(tag_ids))
+            .group_by(task_tags.c.task_id)
+            .having(func.count() == tag_id_count)
+        ))
+    if tag_names is not None:
+        conditions.append(Task.id.in_(
+            select(task_tags.c.task_id)
+            .join(Tag, Tag.id == task_tags.c.tag_id)
+            .where(Tag.name.in_(tag_names))
+            .group_by(task_tags.c.task_id)
+            .having(func.count(Tag.name.distinct()) == tag_name_count)
+        ))
+    return and_(*conditions)
+
+def _equality_term(field: str, value) -> FilterTerm:
+    if isinstance(value, list):
+        return ("in", field), {"values": value}
+    return ("eq", field), {"value": value}
+
+def filter_terms(filters: TaskFilters, current_user_id: uuid.UUID) -> List[FilterTerm]:
+    """Normalize one filter group into terms; groups with equal shapes compile to the same SQL."""
+    terms = []
+
     if filters.team_id:
-        conditions.append(Task.team_id == filters.team_id)
+        terms.append(_equality_term("team_id", filters.team_id))
     if filters.status:
-        if isinstance(filters.status, list):
-            conditions.append(Task.status.in_(filters.status))
-        else:
-            conditions.append(Task.status == filters.status)
-
+        terms.append(_equality_term("status", filters.status))
     if filters.priority:
-        if isinstance(filters.priority, list):
-            conditions.append(Task.priority.in_(filters.priority))
-        else:
-            conditions.append(Task.priority == filters.priority)
-
+        terms.append(_equality_term("priority", filters.priority))
     if filters.created_by:
-        conditions.append(Task.created_by == filters.created_by)
-
-    if filters.due_date:
-        date_condition = build_date_filter(Task.due_date, filters.due_date)
-        if date_condition is not None:
-            conditions.append(date_condition)
+        terms.append(_equality_term("created_by", filters.created_by))
 
-    if filters.created_at:
-        date_condition = build_date_filter(Task.created_at, filters.created_at)
-        if date_condition is not None:
-            conditions.append(date_condition)
-
-    if filters.updated_at:
-        date_condition = build_date_filter(Task.updated_at, filters.updated_at)
-        if date_condition is not None:
-            conditions.append(date_condition)
+    for field in ("due_date", "created_at", "updated_at"):
+        date_filter = getattr(filters, field)
+        if date_filter:
+            for op, value in date_filter_bounds(getattr(Task, field), date_filter):
+                terms.append((("date", field, op), {"value": value}))
 
     if filters.search:
-        search_term = f"%{filters.search}%"
-        search_condition = or_(
-            Task.title.ilike(search_term),
-            Task.description.ilike(search_term)
-        )
-        conditions.append(search_condition)
-
-    assignment_conditions = []
+        terms.append((("search", filters.search_mode), {"value": search_value(filters.search, filters.search_mode)}))
 
+    assignee_ids = list(filters.assignee_ids or [])
     if filters.assigned_to_me:
-        assignment_conditions.append(TaskAssignment.user_id == current_user_id)
-
-    if filters.assignee_ids:
-        assignment_conditions.append(TaskAssignment.user_id.in_(filters.assignee_ids))
-
-    if assignment_conditions:
-        query = query.join(TaskAssignment)
-        if len(assignment_conditions) == 1:
-            conditions.append(assignment_conditions[0])
-        else:
-            conditions.append(or_(*assignment_conditions))
-
-    tag_conditions = []
-
-    if filters.tag_ids:
-        query = query.join(task_tags).join(Tag)
-        tag_conditions.append(Tag.id.in_(filters.tag_ids))
-
-    if filters.tag_names:
-        if not any([filters.tag_ids]):
-            query = query.join(task_tags).join(Tag)
-        tag_conditions.append(Tag.name.in_(filters.tag_names))
-
-    if tag_conditions:
-        if len(tag_conditions) == 1:
-            conditions.append(tag_conditions[0])
-        else:
-            conditions.append(or_(*tag_conditions))
-
-    if conditions:
-        if filters.operator == FilterOperator.AND:
-            query = query.filter(and_(*conditions))
-        else:
-            query = query.filter(or_(*conditions))
-
-    return query
+        assignee_ids.append(current_user_id)
+    if assignee_ids:
+        terms.append((("assignees",), {"user_ids": assignee_ids}))
+
+    if filters.tag_ids or filters.tag_names:
+        values = {}
+        if filters.tag_ids:
+            values["ids"] = filters.tag_ids
+        if filters.tag_names:
+            values["names"] = filters.tag_names
+        if filters.tag_match == TagMatch.ALL:
+            values.update({f"{kind}_count": len(set(values[kind])) for kind in list(values)})
+        terms.append((("tags", filters.tag_match, "ids" in values, "names" in values), values))
+
+    return terms
+
+def _term_condition(shape: Tuple[Hashable, ...], param):
+    kind = shape[0]
+    if kind == "eq":
+        return getattr(Task, shape[1]) == param("value")
+    if kind == "in":
+        return getattr(Task, shape[1]).in_(param("values", expanding=True))
+    if kind == "date":
+        return _COMPARATORS[shape[2]](getattr(Task, shape[1]), param("value"))
+    if kind == "search":
+        return search_condition(param("value"), shape[1])
+    if kind == "assignees":
+        return has_any_assignee(param("user_ids", expanding=True))
+
+    _, tag_match, has_ids, has_names = shape
+    tag_ids = param("ids", expanding=True) if has_ids else None
+    tag_names = param("names", expanding=True) if has_names else None
+    if tag_match == TagMatch.ALL:
+        return has_all_tags(
+            tag_ids, param("ids_count") if has_ids else None,
+            tag_names, param("names_count") if has_names else None
+        )
+    return has_any_tag(tag_ids, tag_names)
+
+def _combine(conditions: list, filter_operator: FilterOperator):
+    return and_(*conditions) if filter_operator == FilterOperator.AND else or_(*conditions)
+
+class FilterTemplateMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.build_total = 0.0
+        self.build_max = 0.0
+
+    def record_build(self, seconds: float):
+        with self._lock:
+            self.builds += 1
+            self.build_total += seconds
+            self.build_max = max(self.build_max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "builds": self.builds,
+                "build_avg_ms": round(self.build_total / self.builds * 1000, 3) if self.builds else 0.0,
+                "build_max_ms": round(self.build_max * 1000, 3)
+            }
+
+# Condition templates keyed by filter shape. Shapes never go stale, so entries
+# only leave through LRU eviction; bound values are swapped in per request and
+# the unchanged statement structure then hits SQLAlchemy's compiled cache.
+filter_templates = MemoryBackend(maxsize=settings.filter_template_cache_size, ttl=math.inf)
+filter_template_metrics = FilterTemplateMetrics()
+
+def filter_template_stats() -> Dict[str, Any]:
+    return {**filter_templates.stats(), **filter_template_metrics.snapshot()}
+
+def _param_prefix(group_index: int, term_index: int) -> str:
+    return f"f{group_index}_{term_index}_"
+
+def _template_params(prefix: str):
+    def param(name: str, expanding: bool = False):
+        return bindparam(prefix + name, expanding=expanding)
+    return param
+
+def _build_template(shape):
+    start = perf_counter()
+    global_operator, group_shapes = shape
+    group_conditions = []
+
+    for group_index, (group_operator, term_shapes) in enumerate(group_shapes):
+        if not term_shapes:
+            # An empty group matches every visible task.
+            group_conditions.append(true())
+            continue
+
+        conditions = []
+        for term_index, term_shape in enumerate(term_shapes):
+            conditions.append(_term_condition(term_shape, _template_params(_param_prefix(group_index, term_index))))
+        group_conditions.append(_combine(conditions, group_operator))
+
+    template = _combine(group_conditions, global_operator)
+    filter_template_metrics.record_build(perf_counter() - start)
+    return template
+
+def build_filter_condition(
+    groups: List[TaskFilters],
+    global_operator: FilterOperator,
+    current_user_id: uuid.UUID
+) -> Optional[Tuple[Any, Dict[str, Any]]]:
+    """Return the cached condition template for these filter groups and the values to bind into it."""
+    group_shapes = []
+    values = {}
+
+    for group_index, filters in enumerate(groups):
+        terms = filter_terms(filters, current_user_id)
+        group_shapes.append((filters.operator, tuple(shape for shape, _ in terms)))
+        for term_index, (_, term_values) in enumerate(terms):
+            prefix = _param_prefix(group_index, term_index)
+            values.update({prefix + name: value for name, value in term_values.items()})
+
+    if not any(term_shapes for _, term_shapes in group_shapes):
+        return None
+
+    shape = (global_operator, tuple(group_shapes))
+    return filter_templates.get_or_set(shape, lambda: _build_template(shape)), values
+
+def apply_filter_condition(query: TaskQuery, condition: Optional[Tuple[Any, Dict[str, Any]]]) -> TaskQuery:
+    if condition is None:
+        return query
+    template, values = condition
+    if isinstance(query, Query):
+        # Query carries bound values beside the statement, so the shared
+        # template is used untouched and nothing is rebuilt per request.
+        return query.filter(template).params(values)
+    return query.filter(template.params(values))
+
+def task_list_options() -> tuple:
+    """Loader options for tasks serialized as TaskResponse.
+
+    Tags load in one SELECT ... IN per page rather than lazily per task, so
+    the statement count stays fixed whatever the page size.
+    """
+    return (selectinload(Task.tags),)
+
+def task_detail_options() -> tuple:
+    """Loader options for TaskDetailResponse, two statements in all.
+
+    Tags and assignments are joined onto the task's own row. Subtasks follow
+    in one SELECT with their tags joined in. Joining subtasks into the first
+    statement too would multiply the three collections against each other.
+    """
+    return (
+        joinedload(Task.tags),
+        joinedload(Task.assignments),
+        selectinload(Task.subtasks).joinedload(Task.tags)
+    )
+
+def build_task_query_filters(base_query: TaskQuery, filters: TaskFilters, current_user_id: uuid.UUID) -> TaskQuery:
+    return apply_filter_condition(base_query, build_filter_condition([filters], FilterOperator.AND, current_user_id))
 
 def build_advanced_task_query(
-    base_query: Query,
+    base_query: TaskQuery,
     advanced_filters: AdvancedTaskFilters,
     current_user_id: uuid.UUID
-) -> Query:
-    if not advanced_filters.filters:
-        return base_query
-
-    filter_queries = []
-
-    for filter_group in advanced_filters.filters:
-        subquery = build_task_query_filters(base_query, filter_group, current_user_id)
-        if subquery.whereclause is not None:
-            filter_queries.append(subquery.whereclause)
-
-    if not filter_queries:
-        return base_query
-
-    if advanced_filters.global_operator == FilterOperator.AND:
-        combined_condition = and_(*filter_queries)
-    else:
-        combined_condition = or_(*filter_queries)
-
-    return base_query.filter(combined_condition)
+) -> TaskQuery:
+    return apply_filter_condition(
+        base_query,
+        build_filter_condition(advanced_filters.filters, advanced_filters.global_operator, current_user_id)
+    )
 
 def parse_query_params_to_filters(
     team_id: Optional[str] = None,
@@ -145,8 +313,10 @@ def parse_query_params_to_filters(
     updated_before: Optional[date] = None,
     updated_after: Optional[date] = None,
     search: Optional[str] = None,
+    search_mode: SearchMode = SearchMode.CONTAINS,
     tag_ids: Optional[str] = None,
     tag_names: Optional[str] = None,
+    tag_match: TagMatch = TagMatch.ANY,
     operator: FilterOperator = FilterOperator.AND
 ) -> TaskFilters:
     def parse_list(value: Optional[str], converter=str):
@@ -212,7 +382,9 @@ def parse_query_params_to_filters(
         created_at=created_at_filter,
         updated_at=updated_at_filter,
         search=search,
+        search_mode=search_mode,
         tag_ids=parsed_tag_ids,
         tag_names=parsed_tag_names,
+        tag_match=tag_match,
         operator=operator
     )
\ No newline at end of file
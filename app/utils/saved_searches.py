@@ -0,0 +1,112 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import Select, and_, delete, func, literal, select, update
+from sqlalchemy.dialects.postgresql import UUID, insert
+from typing import Iterable, List, Union
+from datetime import date
+import uuid
+from app.models.saved_search import SavedSearch, saved_search_results, saved_search_pending
+from app.models.task import Task
+from app.models.team_member import TeamMember
+from app.schemas.filters import AdvancedTaskFilters
+from app.utils.query_builder import build_advanced_task_query
+
+# Past this many changed tasks a full re-evaluation is cheaper than the
+# per-task one, and it keeps the expanding IN lists bounded.
+INCREMENTAL_REFRESH_LIMIT = 5000
+
+def is_time_relative(filters: AdvancedTaskFilters) -> bool:
+    return any(
+        date_filter is not None and date_filter.is_relative
+        for group in filters.filters
+        for date_filter in (group.due_date, group.created_at, group.updated_at)
+    )
+
+def record_task_changes(task_ids: Union[Iterable[uuid.UUID], Select], db: Session):
+    """Queue changed tasks for the saved searches of every active member of their team.
+
+    Takes ids or a select of ids and runs in the caller's transaction, so a
+    change is queued exactly when it commits. Deleted tasks need no call: their
+    result and pending rows go with them (ON DELETE CASCADE).
+    """
+    if isinstance(task_ids, (list, tuple, set)) and not task_ids:
+        return
+
+    affected = (
+        select(SavedSearch.id, Task.id)
+        .join(TeamMember, and_(TeamMember.team_id == Task.team_id, TeamMember.is_active == True))
+        .join(SavedSearch, SavedSearch.owner_id == TeamMember.user_id)
+        .where(Task.id.in_(task_ids))
+    )
+    db.execute(
+        insert(saved_search_pending)
+        .from_select(["search_id", "task_id"], affected)
+        .on_conflict_do_nothing()
+    )
+
+def mark_saved_searches_stale(user_ids: List[uuid.UUID], db: Session):
+    """Membership changes alter which tasks a user can see; recompute their searches on next read."""
+    db.execute(
+        update(SavedSearch)
+        .where(SavedSearch.owner_id.in_(user_ids))
+        .values(needs_full_refresh=True)
+    )
+
+def _matching_tasks_select(search: SavedSearch):
+    visible_team_ids = select(TeamMember.team_id).where(
+        TeamMember.user_id == search.owner_id,
+        TeamMember.is_active == True
+    )
+    base = select(literal(search.id, UUID(as_uuid=True)), Task.id).where(Task.team_id.in_(visible_team_ids))
+    return build_advanced_task_query(base, AdvancedTaskFilters.model_validate(search.filters), search.owner_id)
+
+def _store_matches(search: SavedSearch, matches, db: Session):
+    db.execute(insert(saved_search_results).from_select(["search_id", "task_id"], matches))
+
+def _full_refresh(search: SavedSearch, today: date, db: Session):
+    db.execute(delete(saved_search_pending).where(saved_search_pending.c.search_id == search.id))
+    db.execute(delete(saved_search_results).where(saved_search_results.c.search_id == search.id))
+    _store_matches(search, _matching_tasks_select(search), db)
+
+    search.needs_full_refresh = False
+    search.evaluated_on = today
+    search.refreshed_at = func.now()
+
+def _incremental_refresh(search: SavedSearch, today: date, db: Session):
+    changed_ids = db.execute(
+        delete(saved_search_pending)
+        .where(saved_search_pending.c.search_id == search.id)
+        .returning(saved_search_pending.c.task_id)
+    ).scalars().all()
+    if not changed_ids:
+        return
+
+    if len(changed_ids) > INCREMENTAL_REFRESH_LIMIT:
+        _full_refresh(search, today, db)
+        return
+
+    db.execute(delete(saved_search_results).where(
+        saved_search_results.c.search_id == search.id,
+        saved_search_results.c.task_id.in_(changed_ids)
+    ))
+    _store_matches(search, _matching_tasks_select(search).where(Task.id.in_(changed_ids)), db)
+    search.refreshed_at = func.now()
+
+def refresh_saved_search(search_id: uuid.UUID, db: Session) -> SavedSearch:
+    """Bring a search's result set up to date and commit.
+
+    Only tasks changed since the last read are re-evaluated. Relative date
+    bounds are resolved per day, so searches using them are recomputed in full
+    once the day rolls over and maintained incrementally within it.
+    """
+    # Row lock: concurrent pollers of one search refresh it one at a time.
+    search = db.query(SavedSearch).filter(SavedSearch.id == search_id).with_for_update().one()
+    today = date.today()
+
+    if search.needs_full_refresh or (search.is_time_relative and search.evaluated_on != today):
+        _full_refresh(search, today, db)
+    else:
+        _incremental_refresh(search, today, db)
+
+    db.commit()
+    db.refresh(search)
+    return search
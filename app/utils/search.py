@@ -0,0 +1,95 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, literal_column, or_, select
+from fastapi import HTTPException, status
+from typing import List, Optional, Tuple
+from app.models.task import Task, SEARCH_CONFIG
+from app.schemas.filters import TaskFilters, SearchMode, TaskSortField
+from app.utils.pagination import PaginationMode
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+SearchTerm = Tuple[str, SearchMode]
+
+# Inlined rather than bound so statements stay renderable with literal_binds
+# (the planner-estimate count path EXPLAINs the literal SQL).
+_search_config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+def _tsquery(term: str, mode: SearchMode):
+    if mode == SearchMode.FULLTEXT:
+        return func.websearch_to_tsquery(_search_config, term)
+    return func.plainto_tsquery(_search_config, term)
+
+def search_value(term: str, mode: SearchMode) -> str:
+    if mode == SearchMode.CONTAINS:
+        return f"%{term}%"
+    return term
+
+# value is search_value(term, mode), as a literal or a bind parameter.
+def search_condition(value, mode: SearchMode):
+    if mode == SearchMode.FULLTEXT:
+        return Task.__table__.c.search_vector.op("@@")(_tsquery(value, mode))
+    if mode == SearchMode.FUZZY:
+        # column %> term: some word of the column is similar to term (word_similarity).
+        return or_(Task.title.op("%>")(value), Task.description.op("%>")(value))
+
+    return or_(Task.title.ilike(value), Task.description.ilike(value))
+
+def search_rank(term: str, mode: SearchMode):
+    if mode == SearchMode.FULLTEXT:
+        return func.ts_rank_cd(Task.__table__.c.search_vector, _tsquery(term, mode))
+    if mode == SearchMode.FUZZY:
+        return func.greatest(
+            func.word_similarity(term, Task.title),
+            func.coalesce(func.word_similarity(term, Task.description), 0)
+        )
+    return func.similarity(Task.title, term)
+
+def primary_search(filters: List[TaskFilters]) -> Optional[SearchTerm]:
+    for task_filters in filters:
+        if task_filters.search:
+            return task_filters.search, task_filters.search_mode
+    return None
+
+def task_sort_column(sort_by: TaskSortField, mode: PaginationMode, search: Optional[SearchTerm]):
+    if sort_by != TaskSortField.RELEVANCE:
+        return getattr(Task, sort_by.value)
+
+    if search is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Sorting by relevance requires a search term")
+    if mode == PaginationMode.CURSOR:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Sorting by relevance is only available in page mode")
+    return search_rank(*search)
+
+# ts_headline marks matched words, so a contains (substring) search has nothing
+# it could highlight; its pages skip the extra statement.
+def highlights_search(search: Optional[SearchTerm]) -> bool:
+    return search is not None and search[1] in (SearchMode.FULLTEXT, SearchMode.FUZZY)
+
+def _highlights_select(tasks: List[Task], term: str, mode: SearchMode):
+    document = func.concat_ws(" ", Task.title, Task.description)
+    return select(
+        Task.id,
+        search_rank(term, mode),
+        func.ts_headline(_search_config, document, _tsquery(term, mode), HEADLINE_OPTIONS)
+    ).where(Task.id.in_([task.id for task in tasks]))
+
+def _apply_highlights(tasks: List[Task], rows) -> List[Task]:
+    highlights = {task_id: (rank, snippet) for task_id, rank, snippet in rows}
+    for task in tasks:
+        rank, snippet = highlights.get(task.id, (None, None))
+        task.search_rank = float(rank) if rank is not None else None
+        task.search_snippet = snippet
+    return tasks
+
+# Ranks and snippets are computed for the returned page only: ts_headline
+# re-parses the document, which is far too slow to run over every match.
+def attach_search_highlights(tasks: List[Task], db: Session, term: str, mode: SearchMode) -> List[Task]:
+    if not tasks:
+        return tasks
+    return _apply_highlights(tasks, db.execute(_highlights_select(tasks, term, mode)).all())
+
+async def attach_search_highlights_async(tasks: List[Task], db: AsyncSession, term: str, mode: SearchMode) -> List[Task]:
+    if not tasks:
+        return tasks
+    return _apply_highlights(tasks, (await db.execute(_highlights_select(tasks, term, mode))).all())
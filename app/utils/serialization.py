@@ -0,0 +1,74 @@
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+from typing import Any, Callable, Dict, List, Type, Union, get_args, get_origin
+from functools import partial
+import orjson
+
+Mapper = Callable[[Any], Dict[str, Any]]
+
+_mappers: Dict[Type[BaseModel], Mapper] = {}
+
+def _nested_model(annotation) -> tuple:
+    """(model, is_list) for Model, List[Model] and Optional of either, else (None, False)."""
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _nested_model(args[0]) if len(args) == 1 else (None, False)
+    if origin in (list, List):
+        model, _ = _nested_model(get_args(annotation)[0])
+        return model, model is not None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+def model_mapper(schema: Type[BaseModel]) -> Mapper:
+    """Build a function copying schema's fields off an ORM object or dict, without validation.
+
+    Use for responses whose data came from the database and so is already
+    valid: it skips the from_attributes validation pass FastAPI runs on
+    response_model. Values are left as UUIDs, datetimes and enums for
+    orjson, which encodes them natively.
+
+    Mappers are cached per schema. A schema's mapper is registered before its
+    nested fields are resolved, so self-referencing schemas (a tree node's
+    children) reuse it instead of recursing.
+    """
+    if schema in _mappers:
+        return _mappers[schema]
+
+    scalars, nested = [], []
+
+    def to_dict(source: Any) -> Dict[str, Any]:
+        get = source.get if isinstance(source, dict) else partial(getattr, source)
+        data = {name: get(name, default) for name, default in scalars}
+        for name, default, mapper, is_list in nested:
+            value = get(name, default)
+            if value is not None:
+                value = [mapper(item) for item in value] if is_list else mapper(value)
+            data[name] = value
+        return data
+
+    _mappers[schema] = to_dict
+    for name, field in schema.model_fields.items():
+        default = field.default if field.default is not PydanticUndefined else None
+        model, is_list = _nested_model(field.annotation)
+        if model is None:
+            scalars.append((name, default))
+        else:
+            nested.append((name, default, model_mapper(model), is_list))
+
+    return to_dict
+
+class MappedJSONResponse(ORJSONResponse):
+    """ORJSONResponse for content that has not been through pydantic.
+
+    Aware UTC datetimes are written with a Z suffix, as pydantic writes them,
+    so both response paths produce the same JSON.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+def mapped_response(mapper: Mapper, content: Any) -> MappedJSONResponse:
+    return MappedJSONResponse(mapper(content))
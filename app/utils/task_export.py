@@ -0,0 +1,106 @@
+from sqlalchemy.orm import Query, Session
+from sqlalchemy import select
+from typing import Any, Dict, Iterable, Iterator, List
+from datetime import date, datetime
+from enum import Enum
+from itertools import islice
+from app.models.task import Task
+from app.models.tag import Tag, task_tags
+from app.models.task_assignment import TaskAssignment
+import csv
+import io
+import json
+import uuid
+
+EXPORT_BATCH_SIZE = 2000
+
+EXPORT_COLUMNS = (
+    Task.id, Task.title, Task.description, Task.status, Task.priority, Task.due_date,
+    Task.parent_task_id, Task.team_id, Task.created_by, Task.created_at, Task.updated_at,
+    Task.open_blocking_dependency_count, Task.dependent_count
+)
+
+EXPORT_FIELDS = (
+    "id", "title", "description", "status", "priority", "due_date",
+    "parent_task_id", "team_id", "created_by", "created_at", "updated_at",
+    "is_blocked", "blocking_task_count", "tag_ids", "tag_names", "assignee_ids"
+)
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+def _batches(rows: Iterable, size: int) -> Iterator[List]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def _related(task_ids: List[uuid.UUID], db: Session):
+    tags: Dict[uuid.UUID, List] = {}
+    for task_id, tag_id, tag_name in db.execute(
+        select(task_tags.c.task_id, Tag.id, Tag.name)
+        .join(Tag, Tag.id == task_tags.c.tag_id)
+        .where(task_tags.c.task_id.in_(task_ids))
+        .order_by(Tag.name)
+    ):
+        tags.setdefault(task_id, []).append((str(tag_id), tag_name))
+
+    assignees: Dict[uuid.UUID, List[str]] = {}
+    for task_id, user_id in db.execute(
+        select(TaskAssignment.task_id, TaskAssignment.user_id).where(TaskAssignment.task_id.in_(task_ids))
+    ):
+        assignees.setdefault(task_id, []).append(str(user_id))
+
+    return tags, assignees
+
+def iter_export_batches(query: Query, db: Session) -> Iterator[List[Dict[str, Any]]]:
+    """Yield export records in batches, reading the query through a server-side cursor.
+
+    query must select EXPORT_COLUMNS. Tags and assignments are fetched once per
+    batch, so memory stays bounded by EXPORT_BATCH_SIZE however many tasks match.
+    """
+    rows = query.yield_per(EXPORT_BATCH_SIZE)
+    for batch in _batches(rows, EXPORT_BATCH_SIZE):
+        tags, assignees = _related([row.id for row in batch], db)
+        records = []
+        for row in batch:
+            task_tags_ = tags.get(row.id, [])
+            record = {column.key: _export_value(value) for column, value in zip(EXPORT_COLUMNS, row)}
+            record.pop("open_blocking_dependency_count")
+            record.pop("dependent_count")
+            record.update(
+                is_blocked=row.open_blocking_dependency_count > 0,
+                blocking_task_count=row.dependent_count,
+                tag_ids=[tag_id for tag_id, _ in task_tags_],
+                tag_names=[tag_name for _, tag_name in task_tags_],
+                assignee_ids=assignees.get(row.id, [])
+            )
+            records.append(record)
+        yield records
+
+def ndjson_export(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[str]:
+    for records in batches:
+        yield "".join(json.dumps(record) + "\n" for record in records)
+
+def csv_export(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[str]:
+    # List fields are comma-joined, the same encoding the CSV importer reads.
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for records in batches:
+        for record in records:
+            writer.writerow({
+                key: ",".join(value) if isinstance(value, list) else value
+                for key, value in record.items()
+            })
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
@@ -0,0 +1,72 @@
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import literal, select
+from typing import Any, Dict, List, Tuple
+from app.models.task import Task
+from app.schemas.task import TaskResponse
+from app.utils.query_builder import task_list_options
+from app.utils.serialization import model_mapper
+
+task_node_mapper = model_mapper(TaskResponse)
+
+def load_task_subtree(root: Task, db: Session, max_depth: int, max_nodes: int) -> Tuple[List[Tuple[Task, int, bool]], bool]:
+    """Fetch the subtree under root with a recursive CTE on parent_task_id.
+
+    Returns (task, depth, has_children) rows ordered by depth, and whether
+    the limits cut the tree short. Nodes are kept level by level, so every
+    returned node's parent is returned too. max_depth also bounds the
+    recursion, should a parent_task_id cycle ever exist.
+    """
+    tree = (
+        select(Task.id, literal(0).label("depth"))
+        .where(Task.id == root.id)
+        .cte("task_tree", recursive=True)
+    )
+    tree = tree.union_all(
+        select(Task.id, tree.c.depth + 1)
+        .join(tree, Task.parent_task_id == tree.c.id)
+        .where(Task.team_id == root.team_id, tree.c.depth < max_depth)
+    )
+
+    child = aliased(Task)
+    has_children = select(child.id).where(child.parent_task_id == Task.id).exists()
+
+    rows = (
+        db.query(Task, tree.c.depth, has_children)
+        .join(tree, tree.c.id == Task.id)
+        .options(*task_list_options())
+        .order_by(tree.c.depth, Task.created_at, Task.id)
+        .limit(max_nodes + 1)
+        .all()
+    )
+
+    truncated = len(rows) > max_nodes
+    rows = rows[:max_nodes]
+    truncated = truncated or any(depth == max_depth and children for _, depth, children in rows)
+    return rows, truncated
+
+def _node(task: Task, depth: int, has_children: bool) -> Dict[str, Any]:
+    node = task_node_mapper(task)
+    node.update(depth=depth, has_children=has_children, children=[])
+    return node
+
+def nest_task_subtree(rows: List[Tuple[Task, int, bool]]) -> Dict[str, Any]:
+    nodes = {}
+    for task, depth, has_children in rows:
+        node = nodes[task.id] = _node(task, depth, has_children)
+        if depth:
+            nodes[task.parent_task_id]["children"].append(node)
+    return nodes[rows[0][0].id]
+
+def flatten_task_subtree(rows: List[Tuple[Task, int, bool]]) -> List[Dict[str, Any]]:
+    """Depth-first (pre-order) list: each node directly after its parent, ready to render as indented rows."""
+    children: Dict[Any, List] = {}
+    for row in rows[1:]:
+        children.setdefault(row[0].parent_task_id, []).append(row)
+
+    flat = []
+    stack = [rows[0]]
+    while stack:
+        row = stack.pop()
+        flat.append(_node(*row))
+        stack.extend(reversed(children.get(row[0].id, [])))
+    return flat
@@ -0,0 +1,90 @@
+"""Compare GET /tasks/ throughput and latency with DB_MODE=sync and DB_MODE=async.
+
+Runs each mode in its own process, since the mode is fixed when app.database
+is imported. Requests go through httpx's ASGI transport from one event loop,
+so this measures the app and its database stack, not a web server:
+
+    [DATABASE_URL=postgresql://...] python -m benchmarks.bench_async_reads [--tasks 2000] [--concurrency 32] [--requests 20]
+
+With DATABASE_URL set, both modes run against that database (its tables
+are emptied) and the async engine uses asyncpg, as in production. Without
+it they run against a fresh SQLite file, with aiosqlite for the async engine.
+SQLite answers in microseconds and has no network round trip, which is what
+the async stack saves threads on. SQLite numbers therefore bound the overhead
+of the async path rather than predict its gain against Postgres.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run_mode(args):
+    os.environ["DB_MODE"] = args.mode
+    if "DATABASE_URL" not in os.environ:
+        path = os.path.join(tempfile.mkdtemp(prefix="taskmanager-bench-"), "bench.db")
+        os.environ.update(DATABASE_URL=f"sqlite:///{path}", ASYNC_DATABASE_URL=f"sqlite+aiosqlite:///{path}")
+
+    import httpx
+    from tests.support import SessionLocal, app, auth_headers, create_tag, create_task, create_team, create_user, reset_database
+    from app.database import async_engine, engine
+
+    reset_database()
+    db = SessionLocal()
+    owner = create_user(db, "bench")
+    team = create_team(db, owner, [owner])
+    tags = [create_tag(db, team, owner, f"tag {index}") for index in range(5)]
+    for index in range(args.tasks):
+        create_task(db, team, owner, title=f"task {index}").tags = tags[:index % 3]
+    db.commit()
+    headers = auth_headers(owner)
+    db.close()
+
+    async def client_loop(client, latencies):
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            response = await client.get(f"/tasks/?size={args.size}", headers=headers)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client_loop(client, [])  # warm caches and pools
+            latencies = []
+            start = time.perf_counter()
+            await asyncio.gather(*(client_loop(client, latencies) for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - start
+        if async_engine is not None:
+            await async_engine.dispose()  # aiosqlite's connection threads would keep the process alive
+        return elapsed, latencies
+
+    elapsed, latencies = asyncio.run(main())
+    latencies.sort()
+    print(
+        f"{args.mode:>5} on {engine.dialect.name}: {len(latencies) / elapsed:7.1f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:6.1f} ms  "
+        f"p95 {percentile(latencies, 0.95) * 1000:6.1f} ms  "
+        f"p99 {percentile(latencies, 0.99) * 1000:6.1f} ms"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["sync", "async"], help="run one mode in this process")
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=50, help="page size")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20, help="requests per concurrent client")
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args)
+    else:
+        for mode in ("sync", "async"):
+            subprocess.run([sys.executable, "-m", "benchmarks.bench_async_reads", "--mode", mode] + sys.argv[1:], check=True)
@@ -0,0 +1,47 @@
+"""Per-request authentication cost with and without the verified-token and principal caches.
+
+    python -m benchmarks.bench_auth [--rtt-ms 1.0]
+
+"cold" clears both caches before every call, which is what each request
+paid before they existed: a JWT signature check and a users lookup. The
+dependency is timed on its own and inside a whole GET /auth/me request, so
+its share of a cheap request's time can be read off.
+"""
+import argparse
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from benchmarks.support import measure, report, simulated_round_trips
+from tests.support import ApiClient, SessionLocal, create_user, reset_database
+from app.dependencies import get_current_user, principal_cache
+from app.utils.auth import create_access_token, decode_access_token, verified_token_cache
+
+def cold(run):
+    def call():
+        verified_token_cache.clear()
+        principal_cache.clear()
+        return run()
+    return call
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated database round trip per statement")
+    args = parser.parse_args()
+
+    reset_database()
+    db = SessionLocal()
+    user = create_user(db, "bench")
+    db.commit()
+    token = create_access_token({"sub": str(user.id)})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    print(f"round trip {args.rtt_ms} ms per statement")
+    with simulated_round_trips(args.rtt_ms):
+        report("decode_access_token cold", measure(cold(lambda: decode_access_token(token)), repeat=200))
+        report("decode_access_token cached", measure(lambda: decode_access_token(token), repeat=200))
+        report("get_current_user cold", measure(cold(lambda: get_current_user(credentials, db)), repeat=200))
+        report("get_current_user cached", measure(lambda: get_current_user(credentials, db), repeat=200))
+        client, headers = ApiClient(), {"Authorization": f"Bearer {token}"}
+        report("GET /auth/me cold", measure(cold(lambda: client.get("/auth/me", headers=headers)), repeat=100))
+        report("GET /auth/me cached", measure(lambda: client.get("/auth/me", headers=headers), repeat=100))
+    db.close()
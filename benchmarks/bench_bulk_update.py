@@ -0,0 +1,53 @@
+"""POST /tasks/bulk-update engine: the original per-item loop vs the set-based batch.
+
+    python -m benchmarks.bench_bulk_update [--rtt-ms 1.0] [--sizes 1000 10000]
+
+per-item is the original handler body: load, access check, setattr and a
+commit for every item. batch is bulk_operations.bulk_update_tasks in
+best_effort mode.
+"""
+import argparse
+
+from benchmarks.support import measure, report, simulated_round_trips
+from tests.support import SessionLocal, create_task, create_team, create_user, reset_database
+from app.dependencies import check_team_access
+from app.models.task import Task
+from app.schemas.task import BulkMode, TaskUpdate
+from app.utils.bulk_operations import bulk_update_tasks
+
+def per_item(items, user, db):
+    for item in items:
+        task = db.query(Task).filter(Task.id == item["task_id"]).first()
+        check_team_access(task.team_id, user, db)
+        fields = TaskUpdate(**{key: value for key, value in item.items() if key != "task_id"})
+        for field, value in fields.model_dump(exclude_unset=True).items():
+            setattr(task, field, value)
+        db.commit()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated database round trip per statement")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    reset_database()
+    db = SessionLocal()
+    owner = create_user(db, "bench")
+    team = create_team(db, owner, [owner])
+    task_ids = [create_task(db, team, owner, title=f"task {index}").id for index in range(max(args.sizes))]
+    db.commit()
+
+    print(f"round trip {args.rtt_ms} ms per statement")
+    with simulated_round_trips(args.rtt_ms):
+        for size in args.sizes:
+            items = [
+                {"task_id": task_id, "priority": ("low", "high")[index % 2], "status": ("todo", "in_progress")[index % 3 == 0]}
+                for index, task_id in enumerate(task_ids[:size])
+            ]
+            print(f"{size} items")
+            report("per-item (original)", measure(lambda: per_item(items, owner, db), repeat=3))
+            report("batch (current)", measure(
+                lambda: bulk_update_tasks([{**item, "task_id": str(item["task_id"])} for item in items], BulkMode.BEST_EFFORT, owner, db),
+                repeat=3
+            ))
+    db.close()
@@ -0,0 +1,100 @@
+"""Dependency cycle checks: the in-memory team graph (DEPENDENCY_CYCLE_CHECK=index) vs the recursive CTE.
+
+    python -m benchmarks.bench_dependency_graph [--rtt-ms 1.0] [--tasks 5000] [--edges 20000] [--checks 50]
+
+The team's dependencies form a random DAG (every edge points to an older
+task). Each run checks --checks proposed edges the way
+validate_dependency_creation does, by looking for a path back from the
+blocker to the task:
+- acyclic: the edge is allowed; the blocker has a large reachable set that
+  is walked in full
+- cyclic: the edge would close a cycle and the path is rebuilt
+index is TeamDependencyGraph.find_path on the cached graph; cte is
+dependency_logic.find_dependency_path. The index's other costs are listed
+too: the cold load, and patching the graph on a write against reloading it.
+"""
+import argparse
+import random
+import time
+import uuid
+
+from sqlalchemy import insert
+
+from benchmarks.support import measure, report, simulated_round_trips
+from tests.support import SessionLocal, create_team, create_user, engine, reset_database
+from app.models.task import Task
+from app.models.task_dependency import DependencyType, TaskDependency
+from app.utils.dependency_graph import load_team_dependency_graph
+from app.utils.dependency_logic import find_dependency_path
+
+def seed(db, tasks, edges):
+    owner = create_user(db, "bench")
+    team = create_team(db, owner, [owner])
+    team_id, owner_id = team.id, owner.id
+    db.commit()
+
+    task_ids = [uuid.uuid4() for _ in range(tasks)]
+    rng = random.Random(0)
+    pairs = set()
+    while len(pairs) < edges:
+        newer, older = rng.sample(range(tasks), 2)
+        pairs.add((max(newer, older), min(newer, older)))
+
+    with engine.begin() as connection:
+        connection.execute(insert(Task), [
+            {"id": task_id, "title": f"task {index}", "team_id": team_id, "created_by": owner_id}
+            for index, task_id in enumerate(task_ids)
+        ])
+        connection.execute(insert(TaskDependency), [
+            {"id": uuid.uuid4(), "task_id": task_ids[newer], "depends_on_task_id": task_ids[older],
+             "dependency_type": DependencyType.BLOCKING}
+            for newer, older in pairs
+        ])
+    return team_id, task_ids
+
+def proposed_edges(task_ids, count, cyclic, graph):
+    """(task, blocker) pairs whose cycle check finds a path (cyclic) or walks a large graph and finds none."""
+    rng = random.Random(1)
+    top = len(task_ids) // 2
+    edges = []
+    while len(edges) < count:
+        low, high = sorted(rng.sample(range(top, len(task_ids)), 2))
+        task_id, blocker_id = (task_ids[low], task_ids[high]) if cyclic else (task_ids[high], task_ids[low])
+        if graph.reaches(blocker_id, task_id) == cyclic:
+            edges.append((task_id, blocker_id))
+    return edges
+
+def timed(run, repeat=5):
+    run()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    return (time.perf_counter() - start) / repeat * 1000
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated database round trip per statement")
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--edges", type=int, default=20000)
+    parser.add_argument("--checks", type=int, default=50)
+    args = parser.parse_args()
+
+    reset_database()
+    db = SessionLocal()
+    team_id, task_ids = seed(db, args.tasks, args.edges)
+    graph = load_team_dependency_graph(team_id, db)
+
+    print(f"{args.tasks} tasks, {graph.edge_count} edges, {args.checks} checks per run, "
+          f"round trip {args.rtt_ms} ms per statement")
+    with simulated_round_trips(args.rtt_ms):
+        for cyclic in (False, True):
+            edges = proposed_edges(task_ids, args.checks, cyclic, graph)
+            print("cyclic (path found)" if cyclic else "acyclic (no path)")
+            report("index", measure(lambda: [graph.find_path(blocker, task) for task, blocker in edges], repeat=5))
+            report("cte", measure(lambda: [find_dependency_path(blocker, task, db) for task, blocker in edges], repeat=3))
+
+        task_id, blocker_id = task_ids[-1], task_ids[0]
+        print("index upkeep per write")
+        print(f"  {'patch (add + remove edge)':<28} {timed(lambda: (graph.add_edge(task_id, blocker_id), graph.remove_edge(task_id, blocker_id)), 1000):9.3f} ms")
+        print(f"  {'reload the team graph':<28} {timed(lambda: load_team_dependency_graph(team_id, db)):9.3f} ms")
+    db.close()
@@ -0,0 +1,74 @@
+"""Blocked-state enrichment for a page of tasks: per-task queries vs grouped queries vs stored counters.
+
+    python -m benchmarks.bench_enrichment [--rtt-ms 1.0] [--sizes 20 100]
+
+per-task is the original loop (two statements per task). grouped is two
+statements per page over task_dependencies. counters is the current
+enrich_tasks_with_dependency_info, which reads the maintained columns.
+"""
+import argparse
+
+from sqlalchemy import and_, func
+
+from benchmarks.support import measure, report, simulated_round_trips
+from tests.support import SessionLocal, create_task, create_team, create_user, reset_database
+from app.models.task import Task, TaskStatus
+from app.models.task_dependency import DependencyType, TaskDependency
+from app.routers.tasks import enrich_tasks_with_dependency_info
+from app.utils.dependency_counters import repair_counter_drift
+
+def per_task(tasks, db):
+    for task in tasks:
+        task.is_blocked = db.query(TaskDependency.depends_on_task_id).join(
+            Task, TaskDependency.depends_on_task_id == Task.id
+        ).filter(
+            TaskDependency.task_id == task.id,
+            TaskDependency.dependency_type == DependencyType.BLOCKING,
+            Task.status != TaskStatus.DONE
+        ).count() > 0
+        task.blocking_task_count = db.query(TaskDependency).filter(TaskDependency.depends_on_task_id == task.id).count()
+
+def grouped(tasks, db):
+    task_ids = [task.id for task in tasks]
+    blocked = {row[0] for row in db.query(TaskDependency.task_id).join(
+        Task, TaskDependency.depends_on_task_id == Task.id
+    ).filter(and_(
+        TaskDependency.task_id.in_(task_ids),
+        TaskDependency.dependency_type == DependencyType.BLOCKING,
+        Task.status != TaskStatus.DONE
+    )).distinct()}
+    counts = dict(db.query(TaskDependency.depends_on_task_id, func.count(TaskDependency.id)).filter(
+        TaskDependency.depends_on_task_id.in_(task_ids)
+    ).group_by(TaskDependency.depends_on_task_id))
+    for task in tasks:
+        task.is_blocked = task.id in blocked
+        task.blocking_task_count = counts.get(task.id, 0)
+
+def seed(db, count):
+    owner = create_user(db, "bench")
+    team = create_team(db, owner, [owner])
+    tasks = [create_task(db, team, owner, title=f"task {index}") for index in range(count)]
+    for index, task in enumerate(tasks[1:], start=1):
+        db.add(TaskDependency(task_id=task.id, depends_on_task_id=tasks[index // 2].id))
+    db.commit()
+    repair_counter_drift(db)
+    return [task.id for task in tasks]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated database round trip per statement")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100])
+    args = parser.parse_args()
+
+    reset_database()
+    db = SessionLocal()
+    task_ids = seed(db, max(args.sizes) * 2)
+    print(f"round trip {args.rtt_ms} ms per statement")
+    with simulated_round_trips(args.rtt_ms):
+        for size in args.sizes:
+            page = db.query(Task).filter(Task.id.in_(task_ids[:size])).all()
+            print(f"page of {size}")
+            report("per-task (original)", measure(lambda: per_task(page, db)))
+            report("grouped", measure(lambda: grouped(page, db)))
+            report("counters (current)", measure(lambda: enrich_tasks_with_dependency_info(page, db)))
+    db.close()
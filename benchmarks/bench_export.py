@@ -0,0 +1,106 @@
+"""GET /tasks/export: peak memory and time of the streamed export vs one buffered body.
+
+    python -m benchmarks.bench_export [--tasks 200000]
+
+ndjson and csv consume the endpoint's generators (iter_export_batches into
+ndjson_export / csv_export) chunk by chunk, as StreamingResponse does.
+buffered joins the NDJSON chunks into one string first, as a plain response
+body would. Each variant runs in its own process so its peak RSS is its own;
+growth is the peak over the resident size just before the export starts
+(Linux only: the peak is reset and read through /proc/self).
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+import uuid
+
+from sqlalchemy import insert
+
+from tests.support import SessionLocal, create_tag, create_team, create_user, engine, reset_database
+from app.models.tag import task_tags
+from app.models.task import Task
+from app.models.task_assignment import TaskAssignment
+from app.models.team import Team
+from app.utils.task_export import EXPORT_COLUMNS, csv_export, iter_export_batches, ndjson_export
+
+SEED_CHUNK = 50000
+
+def rss_mb(field: str) -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError(f"{field} missing from /proc/self/status")
+
+def reset_peak_rss():
+    # Writing 5 to clear_refs resets VmHWM, the peak, to the current resident size.
+    with open("/proc/self/clear_refs", "w") as clear_refs:
+        clear_refs.write("5")
+
+def seed(db, tasks):
+    owner = create_user(db, "bench")
+    team = create_team(db, owner, [owner])
+    tag_ids = [create_tag(db, team, owner, f"tag {index}").id for index in range(3)]
+    team_id, owner_id = team.id, owner.id
+    db.commit()
+
+    for start in range(0, tasks, SEED_CHUNK):
+        task_ids = [uuid.uuid4() for _ in range(min(SEED_CHUNK, tasks - start))]
+        with engine.begin() as connection:
+            connection.execute(insert(Task), [
+                {"id": task_id, "title": f"task {start + index}", "description": "exported " * 10,
+                 "team_id": team_id, "created_by": owner_id}
+                for index, task_id in enumerate(task_ids)
+            ])
+            connection.execute(insert(task_tags), [
+                {"task_id": task_id, "tag_id": tag_ids[index % len(tag_ids)]} for index, task_id in enumerate(task_ids)
+            ])
+            connection.execute(insert(TaskAssignment), [
+                {"id": uuid.uuid4(), "task_id": task_id, "user_id": owner_id} for task_id in task_ids
+            ])
+
+def export(variant):
+    db = SessionLocal()
+    team_id = db.query(Team.id).scalar()
+    query = db.query(*EXPORT_COLUMNS).filter(Task.team_id == team_id).order_by(Task.created_at, Task.id)
+    reset_peak_rss()
+    baseline = rss_mb("VmRSS")
+    start = time.perf_counter()
+
+    if variant == "buffered":
+        chunks = ["".join(ndjson_export(iter_export_batches(query, db)))]
+    else:
+        chunks = (csv_export if variant == "csv" else ndjson_export)(iter_export_batches(query, db))
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+
+    db.close()
+    return {"seconds": time.perf_counter() - start, "mb": size / 2 ** 20, "rss_growth_mb": rss_mb("VmHWM") - baseline}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200000)
+    parser.add_argument("--variant", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(export(args.variant)))
+        sys.exit()
+
+    reset_database()
+    db = SessionLocal()
+    seed(db, args.tasks)
+    db.close()
+    print(f"{args.tasks} tasks, one tag and one assignee each")
+    for variant in ("ndjson", "csv", "buffered"):
+        # The child inherits DATABASE_URL from tests.support, so it reads the same database.
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_export", "--variant", variant],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output)
+        print(f"  {variant:<10} {result['seconds']:8.2f} s  {result['mb']:8.1f} MB out  "
+              f"peak RSS +{result['rss_growth_mb']:.1f} MB")
@@ -0,0 +1,96 @@
+"""Assignee and tag filters: the original joins vs join + DISTINCT vs the current semi-joins.
+
+    python -m benchmarks.bench_filters [--rtt-ms 1.0] [--tasks 20000] [--tags-per-task 10] [--assignees-per-task 5]
+
+Each variant runs the list endpoint's two statements, a count and the first
+page of 20 ids, filtered on 2 assignees and 3 tags. join is the original
+build_task_query_filters (joins onto task_assignments and task_tags/tags),
+join + distinct is the usual patch for its fan-out, and semi-join is the
+current build_task_query_filters. Counts are printed beside a Python
+ground truth.
+"""
+import argparse
+import random
+import uuid
+
+from sqlalchemy import insert
+
+from benchmarks.support import measure, report, simulated_round_trips
+from tests.support import SessionLocal, create_team, create_user, engine, reset_database
+from app.models.tag import Tag, task_tags
+from app.models.task import Task
+from app.models.task_assignment import TaskAssignment
+from app.schemas.filters import TaskFilters
+from app.utils.query_builder import build_task_query_filters
+
+PAGE_SIZE = 20
+
+def join_filters(query, filters):
+    query = query.join(TaskAssignment).join(task_tags).join(Tag)
+    return query.filter(TaskAssignment.user_id.in_(filters.assignee_ids), Tag.id.in_(filters.tag_ids))
+
+def semi_join_filters(query, filters, user_id):
+    return build_task_query_filters(query, filters, user_id)
+
+def list_page(query):
+    total = query.count()
+    page = [row.id for row in query.with_entities(Task.id).order_by(Task.created_at.desc(), Task.id.desc()).limit(PAGE_SIZE)]
+    return total, page
+
+def seed(db, tasks, tags_per_task, assignees_per_task):
+    owner = create_user(db, "bench")
+    users = [owner] + [create_user(db, f"bench{index}") for index in range(1, max(assignees_per_task, 5))]
+    team = create_team(db, owner, users)
+    tags = [Tag(name=f"tag {index}", team_id=team.id, created_by=owner.id) for index in range(max(tags_per_task, 3) * 2)]
+    db.add_all(tags)
+    db.commit()
+
+    rng = random.Random(0)
+    task_rows, tag_rows, assignment_rows, truth = [], [], [], 0
+    wanted_users = {users[0].id, users[1].id}
+    wanted_tags = {tag.id for tag in tags[:3]}
+    for _ in range(tasks):
+        task_id = uuid.uuid4()
+        task_rows.append({"id": task_id, "title": "task", "team_id": team.id, "created_by": owner.id})
+        task_tag_ids = {tag.id for tag in rng.sample(tags, rng.randint(0, tags_per_task))}
+        task_user_ids = {user.id for user in rng.sample(users, rng.randint(0, assignees_per_task))}
+        tag_rows += [{"task_id": task_id, "tag_id": tag_id} for tag_id in task_tag_ids]
+        assignment_rows += [{"id": uuid.uuid4(), "task_id": task_id, "user_id": user_id} for user_id in task_user_ids]
+        truth += bool(task_tag_ids & wanted_tags) and bool(task_user_ids & wanted_users)
+
+    with engine.begin() as connection:
+        connection.execute(insert(Task), task_rows)
+        connection.execute(insert(task_tags), tag_rows)
+        connection.execute(insert(TaskAssignment), assignment_rows)
+
+    filters = TaskFilters(assignee_ids=sorted(wanted_users), tag_ids=[tag.id for tag in tags[:3]])
+    return team, owner, filters, truth
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="simulated database round trip per statement")
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--tags-per-task", type=int, default=10)
+    parser.add_argument("--assignees-per-task", type=int, default=5)
+    args = parser.parse_args()
+
+    reset_database()
+    db = SessionLocal()
+    team, owner, filters, truth = seed(db, args.tasks, args.tags_per_task, args.assignees_per_task)
+    base_query = db.query(Task).filter(Task.team_id == team.id)
+    variants = [
+        ("join (original)", lambda: list_page(join_filters(base_query, filters))),
+        ("join + distinct", lambda: list_page(join_filters(base_query, filters).distinct())),
+        ("semi-join (current)", lambda: list_page(semi_join_filters(base_query, filters, owner.id))),
+    ]
+
+    print(f"{args.tasks} tasks, up to {args.tags_per_task} tags and {args.assignees_per_task} assignees each, "
+          f"{truth} match 2 assignees and 3 tags")
+    for label, run in variants:
+        total, page = run()
+        print(f"  {label:<28} count {total:>6}, first page {len(page)} rows / {len(set(page))} distinct")
+    print(f"round trip {args.rtt_ms} ms per statement")
+    with simulated_round_trips(args.rtt_ms):
+        for label, run in variants:
+            report(label, measure(run, repeat=5))
+    db.close()
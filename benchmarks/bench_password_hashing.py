@@ -0,0 +1,72 @@
+"""Latency of ordinary requests during a burst of bcrypt logins: threadpool vs process pool.
+
+    python -m benchmarks.bench_password_hashing [--rounds 12] [--logins 32] [--probes 20]
+
+threadpool verifies each password with run_in_threadpool, which is what the
+original sync login handler did. process-pool uses verify_password_async, the
+current path. In both cases a client keeps requesting GET /tasks/?size=10,
+which also needs a threadpool slot, while the logins run.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+def main(args):
+    import httpx
+    from fastapi.concurrency import run_in_threadpool
+    from tests.support import SessionLocal, app, auth_headers, create_task, create_team, create_user, reset_database
+    from app.utils.auth import hash_password, shutdown_hash_executor, verify_password, verify_password_async
+
+    reset_database()
+    db = SessionLocal()
+    owner = create_user(db, "bench")
+    team = create_team(db, owner, [owner])
+    for index in range(50):
+        create_task(db, team, owner, title=f"task {index}")
+    db.commit()
+    headers = auth_headers(owner)
+    db.close()
+    password_hash = hash_password("correct horse battery staple")
+
+    async def burst(verify):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.get("/tasks/?size=10", headers=headers)
+            await verify("correct horse battery staple", password_hash)  # start the pool
+
+            latencies = []
+
+            async def probe():
+                for _ in range(args.probes):
+                    start = time.perf_counter()
+                    await client.get("/tasks/?size=10", headers=headers)
+                    latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            logins = [verify("correct horse battery staple", password_hash) for _ in range(args.logins)]
+            await asyncio.gather(probe(), *logins)
+            return time.perf_counter() - start, latencies
+
+    for label, verify in (
+        ("threadpool", lambda password, hashed: run_in_threadpool(verify_password, password, hashed)),
+        ("process-pool", verify_password_async)
+    ):
+        elapsed, latencies = asyncio.run(burst(verify))
+        print(
+            f"  {label:<13} burst {elapsed * 1000:8.1f} ms   "
+            f"probe p50 {statistics.median(latencies) * 1000:7.1f} ms  max {max(latencies) * 1000:7.1f} ms"
+        )
+    shutdown_hash_executor()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--logins", type=int, default=32, help="concurrent logins (at most PASSWORD_HASH_MAX_PENDING)")
+    parser.add_argument("--probes", type=int, default=20, help="sequential GET /tasks/ requests during the burst")
+    args = parser.parse_args()
+
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    print(f"bcrypt cost {args.rounds}, {args.logins} concurrent logins, {os.cpu_count()} CPU(s)")
+    main(args)
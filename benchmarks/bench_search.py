@@ -0,0 +1,83 @@
+"""GET /tasks/?search=: contains (the original ILIKE) vs fulltext vs fuzzy, on a large team.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_search [--rtt-ms 0] [--tasks 1000000]
+
+Each run is the list endpoint's page-mode work for one search: the count,
+the first page of 20 with its tags, and for fulltext and fuzzy the
+rank/snippet statement. Titles and descriptions are random filler words,
+and the searched word is put in 1% of titles. fulltext and fuzzy
+need the tsvector column and pg_trgm, so point DATABASE_URL at a throwaway
+Postgres database (its tables are emptied); on the default SQLite database
+only contains runs. Seeding 1M tasks takes a few minutes.
+"""
+import argparse
+import random
+import uuid
+
+from sqlalchemy import insert, text
+
+from benchmarks.support import measure, report, simulated_round_trips
+from tests.support import SessionLocal, create_team, create_user, engine, reset_database
+from app.models.task import Task
+from app.routers.tasks import search_enricher
+from app.schemas.filters import SearchMode, TaskFilters
+from app.utils.pagination import paginate_query
+from app.utils.query_builder import build_task_query_filters, task_list_options
+
+SEED_CHUNK = 20000
+# Filler words made of three syllables; the searched word goes into 1% of titles.
+SYLLABLES = ("ka", "lo", "mi", "ne", "ru", "sa", "to", "vi", "de", "po", "gu", "fe")
+VOCABULARY = [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+MATCH_RATE = 0.01
+# (label, term, mode): fuzzy searches the same word misspelled.
+SEARCHES = [
+    ("contains (original)", "invoices", SearchMode.CONTAINS),
+    ("fulltext", "invoices", SearchMode.FULLTEXT),
+    ("fuzzy", "invoyces", SearchMode.FUZZY),
+]
+
+def seed(db, tasks):
+    owner = create_user(db, "bench")
+    team = create_team(db, owner, [owner])
+    team_id, owner_id = team.id, owner.id
+    db.commit()
+
+    rng = random.Random(0)
+    for start in range(0, tasks, SEED_CHUNK):
+        with engine.begin() as connection:
+            connection.execute(insert(Task), [
+                {"id": uuid.uuid4(), "title": " ".join(rng.sample(VOCABULARY, 4) + ["invoices"] * (rng.random() < MATCH_RATE)),
+                 "description": " ".join(rng.choices(VOCABULARY, k=20)), "team_id": team_id, "created_by": owner_id}
+                for _ in range(min(SEED_CHUNK, tasks - start))
+            ])
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("VACUUM ANALYZE tasks"))
+    return owner
+
+def search_page(term, mode, user, db):
+    query = build_task_query_filters(
+        db.query(Task).options(*task_list_options()), TaskFilters(search=term, search_mode=mode), user.id
+    )
+    return paginate_query(query, 1, 20, search_enricher((term, mode)), db)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="simulated database round trip per statement")
+    parser.add_argument("--tasks", type=int, default=1000000)
+    args = parser.parse_args()
+
+    reset_database()
+    db = SessionLocal()
+    owner = seed(db, args.tasks)
+    searches = SEARCHES if engine.dialect.name == "postgresql" else SEARCHES[:1]
+
+    print(f"{args.tasks} tasks on {engine.dialect.name}, round trip {args.rtt_ms} ms per statement")
+    if len(searches) < len(SEARCHES):
+        print("  fulltext and fuzzy skipped: they need Postgres (set DATABASE_URL)")
+    with simulated_round_trips(args.rtt_ms):
+        for label, term, mode in searches:
+            result = search_page(term, mode, owner, db)
+            print(f"  {label} {term!r}: {result['total']} matches")
+            report(label, measure(lambda: search_page(term, mode, owner, db), repeat=5))
+    db.close()
@@ -0,0 +1,110 @@
+"""GET /tasks/{id}: the original separate queries vs the current two-statement load, under concurrency.
+
+    python -m benchmarks.bench_task_detail [--rtt-ms 5.0] [--subtasks 10] [--concurrency 1 8] [--requests 200]
+
+original is the handler body before task_detail_options: the task, its
+assignments and its subtasks (tags selectin-loaded) as separate queries.
+current is routers.tasks.get_task. Each request opens its own session, runs
+the handler and serializes a TaskDetailResponse; the auth context query is
+included in both. Threads stand in for concurrent requests: the simulated
+round trip sleeps outside the GIL, as a real network wait would.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import statistics
+import time
+
+from benchmarks.support import simulated_round_trips
+from tests.support import (
+    SessionLocal, count_statements, create_tag, create_task, create_team, create_user, reset_database
+)
+from app.dependencies import check_team_access
+from app.models.task import Task
+from app.models.task_assignment import TaskAssignment
+from app.models.user import User
+from app.routers.tasks import enrich_tasks_with_dependency_info, get_task
+from app.schemas.task import TaskDetailResponse
+from app.utils.query_builder import task_list_options
+
+def original(task_id, user, db):
+    task = db.query(Task).filter(Task.id == task_id).first()
+    check_team_access(task.team_id, user, db)
+    assignments = db.query(TaskAssignment).filter(TaskAssignment.task_id == task_id).all()
+    subtasks = db.query(Task).filter(Task.parent_task_id == task_id).options(*task_list_options()).all()
+    enrich_tasks_with_dependency_info([task] + subtasks, db)
+    # The original dict listed these fields only, so the task's own tags were left out.
+    return {
+        **{field: getattr(task, field) for field in (
+            "id", "title", "description", "status", "priority", "due_date", "parent_task_id", "team_id",
+            "created_by", "created_at", "updated_at", "is_blocked", "blocking_task_count"
+        )},
+        "assignments": assignments,
+        "subtasks": subtasks
+    }
+
+def current(task_id, user, db):
+    return get_task(task_id, db, user)
+
+def request(handler, task_id, user):
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        TaskDetailResponse.model_validate(handler(task_id, user, db))
+    finally:
+        db.close()
+    return time.perf_counter() - start
+
+def load(handler, task_id, user, concurrency, requests):
+    """p50 and p95 latency in ms and requests per second over requests calls."""
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(lambda _: request(handler, task_id, user), range(concurrency)))
+        start = time.perf_counter()
+        latencies = list(pool.map(lambda _: request(handler, task_id, user), range(requests)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "rps": requests / elapsed
+    }
+
+def seed(db, subtasks):
+    owner = create_user(db, "bench")
+    team = create_team(db, owner, [owner])
+    tags = [create_tag(db, team, owner, f"tag {index}") for index in range(3)]
+    task = create_task(db, team, owner, title="parent", tags=tags)
+    db.add(TaskAssignment(task_id=task.id, user_id=owner.id))
+    for index in range(subtasks):
+        create_task(db, team, owner, title=f"subtask {index}", parent_task_id=task.id, tags=tags[:2])
+    task_id, owner_id = task.id, owner.id
+    db.commit()
+    user = db.get(User, owner_id)
+    db.expunge(user)
+    return task_id, user
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt-ms", type=float, default=5.0, help="simulated database round trip per statement")
+    parser.add_argument("--subtasks", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    reset_database()
+    db = SessionLocal()
+    task_id, user = seed(db, args.subtasks)
+    db.close()
+    handlers = [("original", original), ("current", current)]
+
+    print(f"task with {args.subtasks} tagged subtasks and one assignment, round trip {args.rtt_ms} ms per statement")
+    for label, handler in handlers:
+        request(handler, task_id, user)
+        with count_statements() as statements:
+            request(handler, task_id, user)
+        print(f"  {label:<10} {len(statements)} statements per request")
+    with simulated_round_trips(args.rtt_ms):
+        for concurrency in args.concurrency:
+            print(f"concurrency {concurrency}")
+            for label, handler in handlers:
+                result = load(handler, task_id, user, concurrency, args.requests)
+                print(f"  {label:<10} p50 {result['p50']:7.2f} ms  p95 {result['p95']:7.2f} ms  {result['rps']:7.1f} req/s")
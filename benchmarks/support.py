@@ -0,0 +1,37 @@
+"""Helpers shared by the benchmark scripts. Importing this sets the app up on SQLite (see tests.support)."""
+from contextlib import contextmanager
+from typing import Callable, Dict
+import statistics
+import time
+
+from sqlalchemy import event
+
+from tests.support import count_statements, engine
+
+@contextmanager
+def simulated_round_trips(milliseconds: float, bind=engine):
+    """Sleep before every statement, standing in for the network hop to a real database server."""
+    def sleep(conn, cursor, statement, parameters, context, executemany):
+        time.sleep(milliseconds / 1000)
+
+    if milliseconds:
+        event.listen(bind, "before_cursor_execute", sleep)
+    try:
+        yield
+    finally:
+        if milliseconds:
+            event.remove(bind, "before_cursor_execute", sleep)
+
+def measure(run: Callable[[], object], repeat: int = 20) -> Dict[str, float]:
+    """Median wall time in ms and statements per call, after one warm-up call."""
+    run()
+    timings = []
+    with count_statements() as statements:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    return {"ms": statistics.median(timings) * 1000, "statements": len(statements) / repeat}
+
+def report(label: str, result: Dict[str, float]):
+    print(f"  {label:<28} {result['ms']:9.3f} ms  {result['statements']:7.1f} statements")
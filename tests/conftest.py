@@ -0,0 +1,27 @@
+import pytest
+
+from tests.support import ApiClient, SessionLocal, async_engine, reset_database, run_in_client_loop
+
+@pytest.fixture(scope="session", autouse=True)
+def close_async_engine():
+    yield
+    # aiosqlite's connection threads would keep the process alive.
+    if async_engine is not None:
+        run_in_client_loop(async_engine.dispose())
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    reset_database()
+    yield
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def client():
+    return ApiClient()
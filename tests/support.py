@@ -0,0 +1,151 @@
+"""Run the app against SQLite, for the test suite and the scripts in benchmarks/.
+
+Importing this module points the settings at a throwaway SQLite file (unless
+DATABASE_URL is already set) and teaches SQLite the Postgres-only parts of the
+schema before app.main creates it. Postgres-specific behaviour (full-text
+search, planner choices, ON CONFLICT on real concurrency) is not covered here.
+"""
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="taskmanager-"), "test.db"))
+if os.environ["DATABASE_URL"].startswith("sqlite://"):
+    # DB_MODE=async runs the same file through aiosqlite.
+    os.environ.setdefault("ASYNC_DATABASE_URL", os.environ["DATABASE_URL"].replace("sqlite://", "sqlite+aiosqlite://", 1))
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("JWT_EXPIRE_HOURS", "1")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from contextlib import contextmanager
+from typing import Iterator, List
+import asyncio
+import httpx
+from sqlalchemy import Computed, event
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.ext.compiler import compiles
+
+@compiles(UUID, "sqlite")
+def _uuid_on_sqlite(type_, compiler, **kw):
+    return "CHAR(32)"
+
+@compiles(TSVECTOR, "sqlite")
+def _tsvector_on_sqlite(type_, compiler, **kw):
+    return "TEXT"
+
+@compiles(Computed, "sqlite")
+def _computed_on_sqlite(computed, compiler, **kw):
+    # The generated expression is Postgres SQL; on SQLite the column stays NULL.
+    return ""
+
+from app.database import Base, SessionLocal, async_engine, engine
+
+def _sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+# With DB_MODE=async the API runs on async_engine; setup and assertions stay sync.
+engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+for bound in engines:
+    if bound.dialect.name == "sqlite":
+        event.listen(bound, "connect", _sqlite_foreign_keys)
+
+from app.main import app  # noqa: E402  creates the schema
+from app.dependencies import principal_cache
+from app.models.tag import Tag
+from app.models.task import Task
+from app.models.team import Team
+from app.models.team_member import TeamMember
+from app.models.user import User, UserRole
+from app.utils import dependency_graph
+from app.utils.auth import create_access_token, verified_token_cache
+from app.utils.cache import default_cache
+
+def reset_database():
+    """Empty every table and every in-process cache that could carry state between tests."""
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+    for cache in (default_cache, principal_cache, verified_token_cache):
+        cache.clear()
+    with dependency_graph._registry_lock:
+        dependency_graph._team_graphs.clear()
+        dependency_graph._team_generations.clear()
+
+def create_user(db, username: str, role: UserRole = UserRole.USER) -> User:
+    user = User(email=f"{username}@example.com", username=username, password_hash="unused", role=role)
+    db.add(user)
+    db.flush()
+    return user
+
+def create_team(db, owner: User, members=(), name: str = "team") -> Team:
+    team = Team(name=name, created_by=owner.id)
+    db.add(team)
+    db.flush()
+    for member in members:
+        db.add(TeamMember(team_id=team.id, user_id=member.id, is_active=True))
+    db.flush()
+    return team
+
+def create_tag(db, team: Team, creator: User, name: str) -> Tag:
+    tag = Tag(name=name, team_id=team.id, created_by=creator.id)
+    db.add(tag)
+    db.flush()
+    return tag
+
+def create_task(db, team: Team, creator: User, **fields) -> Task:
+    task = Task(team_id=team.id, created_by=creator.id, **{"title": "task", **fields})
+    db.add(task)
+    db.flush()
+    return task
+
+# One loop for every request: async drivers' pooled connections belong to the
+# loop that opened them (DB_MODE=async).
+_client_loop = asyncio.new_event_loop()
+
+def run_in_client_loop(awaitable):
+    return _client_loop.run_until_complete(awaitable)
+
+class ApiClient:
+    """Synchronous client for the app, sending requests through httpx's ASGI transport."""
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        async def send():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+                return await client.request(method, url, **kwargs)
+        return run_in_client_loop(send())
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("DELETE", url, **kwargs)
+
+def auth_headers(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+@contextmanager
+def count_statements(bind=None) -> Iterator[List[str]]:
+    """Collect the SQL of every statement executed on bind (default: the app's engines) inside the block."""
+    statements: List[str] = []
+    binds = engines if bind is None else [bind]
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for bound in binds:
+        event.listen(bound, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for bound in binds:
+            event.remove(bound, "before_cursor_execute", record)
@@ -0,0 +1,66 @@
+import pytest
+
+from app.dependencies import principal_cache
+from app.models.team_member import TeamMember
+from app.models.user import UserRole
+from tests.support import auth_headers, count_statements, create_task, create_team, create_user
+
+@pytest.fixture
+def teams(db):
+    owner = create_user(db, "alice")
+    member = create_user(db, "bob")
+    first = create_team(db, owner, [member], name="first")
+    second = create_team(db, owner, [member], name="second")
+    tasks = [create_task(db, team, member, title=f"task {index}").id for index in range(5) for team in (first, second)]
+    db.commit()
+    headers = auth_headers(member)
+    return member, headers, tasks
+
+def membership_lookups(statements):
+    # The accessible-teams query; saved-search bookkeeping also joins team_members.
+    return sum("FROM teams LEFT OUTER JOIN team_members" in statement for statement in statements)
+
+def test_dependency_creation_checks_both_tasks_with_one_lookup(client, teams):
+    _, headers, tasks = teams
+
+    with count_statements() as statements:
+        response = client.post(f"/tasks/{tasks[0]}/dependencies", json={"depends_on_task_id": str(tasks[2])}, headers=headers)
+
+    assert response.status_code == 201, response.text
+    assert membership_lookups(statements) == 1
+
+def test_bulk_update_across_teams_uses_one_lookup(client, teams):
+    _, headers, tasks = teams
+
+    with count_statements() as statements:
+        response = client.post("/tasks/bulk-update", json={
+            "task_updates": [{"task_id": str(task_id), "priority": "high"} for task_id in tasks]
+        }, headers=headers)
+
+    assert all(result["success"] for result in response.json()["results"])
+    assert membership_lookups(statements) == 1
+
+def test_each_request_loads_its_own_context(client, db, teams):
+    member, headers, tasks = teams
+
+    with count_statements() as statements:
+        assert client.get(f"/tasks/{tasks[0]}", headers=headers).status_code == 200
+        assert client.get(f"/tasks/{tasks[1]}", headers=headers).status_code == 200
+    assert membership_lookups(statements) == 2
+
+    db.query(TeamMember).filter(TeamMember.user_id == member.id).update({TeamMember.is_active: False})
+    db.commit()
+    assert client.get(f"/tasks/{tasks[0]}", headers=headers).status_code == 403
+
+def test_deleting_a_user_drops_the_cached_principal(client, db):
+    admin = create_user(db, "root", role=UserRole.ADMIN)
+    user = create_user(db, "mallory")
+    db.commit()
+    headers = auth_headers(user)
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    assert principal_cache.get(str(user.id)) is not None
+
+    assert client.delete(f"/users/{user.id}", headers=auth_headers(admin)).status_code == 204
+
+    assert principal_cache.get(str(user.id)) is None
+    assert client.get("/auth/me", headers=headers).status_code == 401
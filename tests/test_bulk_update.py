@@ -0,0 +1,118 @@
+from datetime import date
+
+from app.models.task import Task, TaskPriority, TaskStatus
+from tests.support import auth_headers, create_tag, create_task, create_team, create_user
+
+def bulk_update(client, user, items, mode="best_effort"):
+    response = client.post("/tasks/bulk-update", json={"task_updates": items, "mode": mode}, headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+    return response.json()["results"]
+
+def reload(db, task_id):
+    db.expire_all()
+    return db.get(Task, task_id)
+
+def saved_titles(client, headers, search_id):
+    body = client.get(f"/searches/{search_id}/results", headers=headers).json()
+    return sorted(task["title"] for task in body["items"])
+
+def test_explicit_null_clears_nullable_fields(client, db):
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+    tag = create_tag(db, team, owner, "urgent")
+    task_id = create_task(db, team, owner, description="notes", due_date=date(2024, 3, 1), tags=[tag]).id
+    db.commit()
+
+    results = bulk_update(client, owner, [{"task_id": str(task_id), "description": None, "due_date": None, "tag_ids": None}])
+
+    assert results == [{"task_id": str(task_id), "success": True}]
+    task = reload(db, task_id)
+    assert (task.description, task.due_date, task.tags) == (None, None, [])
+
+def test_omitted_fields_are_left_alone(client, db):
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+    task_id = create_task(db, team, owner, description="notes", due_date=date(2024, 3, 1)).id
+    db.commit()
+
+    bulk_update(client, owner, [{"task_id": str(task_id), "title": "renamed"}])
+
+    task = reload(db, task_id)
+    assert (task.title, task.description, task.due_date) == ("renamed", "notes", date(2024, 3, 1))
+
+def test_best_effort_reports_each_failure_and_applies_the_rest(client, db):
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+    first, second = create_task(db, team, owner).id, create_task(db, team, owner).id
+    db.commit()
+    missing = "00000000-0000-0000-0000-000000000000"
+
+    results = bulk_update(client, owner, [
+        {"task_id": str(first), "priority": "high"},
+        {"task_id": missing, "priority": "high"},
+        {"task_id": str(second), "priority": "urgent"},
+        {"task_id": "not-a-uuid"},
+        {"task_id": str(first), "priority": "low"}
+    ])
+
+    assert [result["success"] for result in results] == [True, False, False, False, False]
+    assert results[1]["error"] == "Task not found"
+    assert results[2]["error"].startswith("priority:")
+    assert results[3]["error"] == "Invalid task_id"
+    assert results[4]["error"] == "Duplicate task_id in request"
+    assert reload(db, first).priority == TaskPriority.HIGH
+    assert reload(db, second).priority == TaskPriority.MEDIUM
+
+def test_all_or_nothing_applies_nothing_when_an_item_fails(client, db):
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+    task_id = create_task(db, team, owner).id
+    db.commit()
+
+    results = bulk_update(client, owner, [
+        {"task_id": str(task_id), "priority": "high"},
+        {"task_id": "00000000-0000-0000-0000-000000000000", "priority": "high"}
+    ], mode="all_or_nothing")
+
+    assert results[0] == {"task_id": str(task_id), "success": False, "error": "Not applied: another item in the batch failed"}
+    assert results[1]["error"] == "Task not found"
+    assert reload(db, task_id).priority == TaskPriority.MEDIUM
+
+def test_tasks_of_other_teams_are_denied(client, db):
+    owner, outsider = create_user(db, "alice"), create_user(db, "mallory")
+    team = create_team(db, owner, [owner])
+    other_team = create_team(db, outsider, [outsider], name="other")
+    tag = create_tag(db, team, owner, "urgent")
+    own_task = create_task(db, other_team, outsider).id
+    foreign_task = create_task(db, team, owner).id
+    db.commit()
+
+    results = bulk_update(client, outsider, [
+        {"task_id": str(foreign_task), "title": "hijacked"},
+        {"task_id": str(own_task), "tag_ids": [str(tag.id)]}
+    ])
+
+    assert results[0] == {"task_id": str(foreign_task), "success": False, "error": "Access denied"}
+    assert results[1]["error"] == "Some tag IDs are invalid or not from the same team"
+    assert reload(db, foreign_task).title == "task"
+
+def test_completing_blockers_updates_counters_dependents_and_saved_searches(client, db):
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+    blocked = create_task(db, team, owner, title="blocked", status=TaskStatus.BLOCKED).id
+    blocker = create_task(db, team, owner, title="blocker").id
+    db.commit()
+    headers = auth_headers(owner)
+    response = client.post(f"/tasks/{blocked}/dependencies", json={"depends_on_task_id": str(blocker)}, headers=headers)
+    assert response.status_code == 201, response.text
+
+    search_id = client.post("/searches/", json={"name": "todo", "filters": {"filters": [{"status": "todo"}]}}, headers=headers).json()["id"]
+    assert saved_titles(client, headers, search_id) == ["blocker"]
+
+    results = bulk_update(client, owner, [{"task_id": str(blocker), "status": "done"}])
+
+    assert results[0]["success"]
+    task = reload(db, blocked)
+    assert (task.status, task.open_blocking_dependency_count) == (TaskStatus.TODO, 0)
+    assert reload(db, blocker).dependent_count == 1
+    assert saved_titles(client, headers, search_id) == ["blocked"]
@@ -0,0 +1,47 @@
+import threading
+
+import pytest
+
+from app.utils.cache import CacheBackend, MemoryBackend
+
+def test_incomplete_backend_fails_at_instantiation():
+    class GetOnly(CacheBackend):
+        def get(self, key, default=None):
+            return default
+
+    with pytest.raises(TypeError, match="abstract"):
+        GetOnly()
+
+def test_memory_backend_tags_and_namespaces():
+    backend = MemoryBackend(maxsize=10)
+    backend.set("perm:alice", 1, tags=["team:1"])
+    backend.set("perm:bob", 2)
+    backend.set("counts:team-1", 3, tags=["team:1"])
+
+    assert backend.invalidate_tag("team:1") == 2
+    assert backend.get("perm:bob") == 2
+    assert backend.invalidate_namespace("perm") == 1
+    assert backend.get("perm:bob") is None
+
+def test_get_or_set_runs_the_loader_once_for_concurrent_misses():
+    backend = MemoryBackend(maxsize=10)
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(2)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(backend.get_or_set("key", loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while backend.coalesced < 7 and any(thread.is_alive() for thread in threads):
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["value"] * 8
@@ -0,0 +1,77 @@
+from app.models.task import Task
+from app.utils.dependency_counters import find_counter_drift
+from tests.support import auth_headers, create_task, create_team, create_user
+
+def counters(db, task_id):
+    db.expire_all()
+    task = db.get(Task, task_id)
+    return task.open_blocking_dependency_count, task.dependent_count
+
+def setup_chain(db):
+    """a depends on b and c; b depends on c."""
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+    tasks = {name: create_task(db, team, owner, title=name).id for name in "abc"}
+    db.commit()
+    return auth_headers(owner), tasks
+
+def depend(client, headers, task_id, depends_on_id):
+    response = client.post(f"/tasks/{task_id}/dependencies", json={"depends_on_task_id": str(depends_on_id)}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+def test_counters_follow_dependency_changes(client, db):
+    headers, ids = setup_chain(db)
+    depend(client, headers, ids["a"], ids["b"])
+    a_on_c = depend(client, headers, ids["a"], ids["c"])
+    depend(client, headers, ids["b"], ids["c"])
+
+    assert counters(db, ids["a"]) == (2, 0)
+    assert counters(db, ids["c"]) == (0, 2)
+
+    response = client.delete(f"/tasks/{ids['a']}/dependencies/{a_on_c}", headers=headers)
+    assert response.status_code == 204, response.text
+    assert counters(db, ids["a"]) == (1, 0)
+    assert counters(db, ids["c"]) == (0, 1)
+    assert find_counter_drift(db) == []
+
+def test_counters_follow_status_changes(client, db):
+    headers, ids = setup_chain(db)
+    depend(client, headers, ids["a"], ids["b"])
+    depend(client, headers, ids["a"], ids["c"])
+
+    client.put(f"/tasks/{ids['c']}", json={"status": "done"}, headers=headers)
+    assert counters(db, ids["a"]) == (1, 0)
+
+    response = client.post("/tasks/bulk-update", json={"task_updates": [
+        {"task_id": str(ids["b"]), "status": "done"},
+        {"task_id": str(ids["c"]), "status": "todo"}
+    ]}, headers=headers)
+    assert all(result["success"] for result in response.json()["results"])
+    assert counters(db, ids["a"]) == (1, 0)
+
+    client.put(f"/tasks/{ids['c']}", json={"status": "done"}, headers=headers)
+    assert counters(db, ids["a"]) == (0, 0)
+    assert find_counter_drift(db) == []
+
+def test_counters_follow_task_deletion(client, db):
+    headers, ids = setup_chain(db)
+    depend(client, headers, ids["a"], ids["b"])
+    depend(client, headers, ids["b"], ids["c"])
+
+    assert client.delete(f"/tasks/{ids['b']}", headers=headers).status_code == 204
+
+    assert counters(db, ids["a"]) == (0, 0)
+    assert counters(db, ids["c"]) == (0, 0)
+    assert find_counter_drift(db) == []
+
+def test_deleting_a_done_blocker_leaves_open_counts_alone(client, db):
+    headers, ids = setup_chain(db)
+    depend(client, headers, ids["a"], ids["b"])
+    depend(client, headers, ids["a"], ids["c"])
+    client.put(f"/tasks/{ids['b']}", json={"status": "done"}, headers=headers)
+
+    assert client.delete(f"/tasks/{ids['b']}", headers=headers).status_code == 204
+
+    assert counters(db, ids["a"]) == (1, 0)
+    assert find_counter_drift(db) == []
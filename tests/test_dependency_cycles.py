@@ -0,0 +1,51 @@
+from app.models.task_dependency import TaskDependency
+from app.utils.dependency_logic import find_dependency_path
+from tests.support import auth_headers, count_statements, create_task, create_team, create_user
+
+def make_graph(db, edges, names):
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+    tasks = {name: create_task(db, team, owner, title=name) for name in names}
+    for task, depends_on in edges:
+        db.add(TaskDependency(task_id=tasks[task].id, depends_on_task_id=tasks[depends_on].id))
+    db.commit()
+    return owner, {name: task.id for name, task in tasks.items()}
+
+def test_diamond_path(db):
+    _, ids = make_graph(db, [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")], "abcd")
+
+    path = find_dependency_path(ids["a"], ids["d"], db)
+
+    assert path[0] == ids["a"] and path[-1] == ids["d"] and len(path) == 3
+    assert path[1] in (ids["b"], ids["c"])
+    assert find_dependency_path(ids["d"], ids["a"], db) is None
+
+def test_layered_dag_is_walked_once_per_node(db):
+    # 20 fully connected layers of 3: 3**19 distinct paths from top to bottom.
+    layers = [[f"{layer}-{column}" for column in range(3)] for layer in range(20)]
+    edges = [(upper, lower) for above, below in zip(layers, layers[1:]) for upper in above for lower in below]
+    _, ids = make_graph(db, edges, [name for layer in layers for name in layer])
+
+    with count_statements() as statements:
+        assert find_dependency_path(ids["19-0"], ids["0-0"], db) is None
+    assert len(statements) == 1
+
+    names = {node_id: name for name, node_id in ids.items()}
+    path = [names[node_id] for node_id in find_dependency_path(ids["0-0"], ids["19-2"], db)]
+    assert path[0] == "0-0" and path[-1] == "19-2"
+    assert [name.split("-")[0] for name in path] == [str(layer) for layer in range(20)]
+
+def test_cycle_is_rejected_with_its_path(client, db):
+    owner, ids = make_graph(db, [("a", "b"), ("b", "c")], "abc")
+
+    response = client.post(f"/tasks/{ids['c']}/dependencies", json={"depends_on_task_id": str(ids["a"])}, headers=auth_headers(owner))
+
+    assert response.status_code == 400
+    expected = " -> ".join(str(ids[name]) for name in "cabc")
+    assert response.json()["detail"] == f"Would create circular dependency: {expected}"
+
+def test_dependency_across_a_diamond_is_allowed(client, db):
+    owner, ids = make_graph(db, [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")], "abcd")
+
+    response = client.post(f"/tasks/{ids['b']}/dependencies", json={"depends_on_task_id": str(ids["c"])}, headers=auth_headers(owner))
+    assert response.status_code == 201
@@ -0,0 +1,53 @@
+import pytest
+
+from app.config import settings
+from app.utils import dependency_graph
+from tests.support import auth_headers, create_task, create_team, create_user
+
+@pytest.fixture
+def tasks(db):
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+    ids = {name: create_task(db, team, owner, title=name).id for name in "abc"}
+    db.commit()
+    return auth_headers(owner), team.id, ids
+
+@pytest.fixture
+def index_mode(monkeypatch):
+    monkeypatch.setattr(settings, "dependency_cycle_check", "index")
+
+def depend(client, headers, task_id, depends_on_id):
+    return client.post(f"/tasks/{task_id}/dependencies", json={"depends_on_task_id": str(depends_on_id)}, headers=headers)
+
+def test_index_mode_requires_redis(monkeypatch, index_mode):
+    monkeypatch.setattr(settings, "cache_backend", "memory")
+    with pytest.raises(RuntimeError, match="CACHE_BACKEND=redis"):
+        dependency_graph.check_index_configuration()
+
+    monkeypatch.setattr(settings, "cache_backend", "redis")
+    dependency_graph.check_index_configuration()
+
+def test_database_mode_leaves_graphs_alone(client, db, tasks):
+    headers, team_id, ids = tasks
+    graph = dependency_graph.get_team_dependency_graph(team_id, db)
+
+    assert depend(client, headers, ids["a"], ids["b"]).status_code == 201
+    assert client.delete(f"/tasks/{ids['c']}", headers=headers).status_code == 204
+
+    assert graph.version == 0 and graph.edge_count == 0
+
+def test_index_mode_patches_the_cached_graph(client, db, tasks, index_mode):
+    headers, team_id, ids = tasks
+    graph = dependency_graph.get_team_dependency_graph(team_id, db)
+
+    assert depend(client, headers, ids["a"], ids["b"]).status_code == 201
+    assert depend(client, headers, ids["b"], ids["c"]).status_code == 201
+    assert graph.find_path(ids["a"], ids["c"]) == [ids["a"], ids["b"], ids["c"]]
+
+    response = depend(client, headers, ids["c"], ids["a"])
+    assert response.status_code == 400
+    assert "Would create circular dependency" in response.json()["detail"]
+
+    assert client.delete(f"/tasks/{ids['b']}", headers=headers).status_code == 204
+    assert graph.edge_count == 0
+    assert depend(client, headers, ids["c"], ids["a"]).status_code == 201
@@ -0,0 +1,98 @@
+import pytest
+
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.schemas.filters import FilterOperator, TagMatch, TaskFilters
+from app.utils.query_builder import (
+    apply_filter_condition, build_filter_condition, filter_template_metrics, filter_template_stats, filter_templates
+)
+from tests.support import create_tag, create_task, create_team, create_user
+
+@pytest.fixture(autouse=True)
+def empty_templates():
+    filter_templates.clear()
+    yield
+    filter_templates.clear()
+
+@pytest.fixture
+def seeded(db):
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+    red, blue = create_tag(db, team, owner, "red"), create_tag(db, team, owner, "blue")
+    create_task(db, team, owner, title="todo red", status=TaskStatus.TODO, tags=[red])
+    create_task(db, team, owner, title="review blue", status=TaskStatus.REVIEW, tags=[blue])
+    create_task(db, team, owner, title="done both", status=TaskStatus.DONE, tags=[red, blue])
+    create_task(db, team, owner, title="blocked none", status=TaskStatus.BLOCKED, priority=TaskPriority.HIGH)
+    db.commit()
+    return owner, red.id, blue.id
+
+def condition(owner, **filters):
+    return build_filter_condition([TaskFilters(**filters)], FilterOperator.AND, owner.id)
+
+def titles(db, built):
+    return sorted(task.title for task in apply_filter_condition(db.query(Task), built).all())
+
+def test_same_shape_reuses_the_template_with_new_values(db, seeded):
+    owner = seeded[0]
+    builds = filter_template_metrics.builds
+
+    first = condition(owner, status=[TaskStatus.TODO])
+    second = condition(owner, status=[TaskStatus.REVIEW, TaskStatus.DONE, TaskStatus.BLOCKED])
+
+    assert first[0] is second[0]
+    assert filter_template_metrics.builds == builds + 1
+    assert first[1] == {"f0_0_values": [TaskStatus.TODO]}
+    # The expanding IN list takes any length through the one template.
+    assert titles(db, first) == ["todo red"]
+    assert titles(db, second) == ["blocked none", "done both", "review blue"]
+
+def test_scalar_and_list_values_are_different_shapes(db, seeded):
+    owner = seeded[0]
+
+    scalar = condition(owner, priority=TaskPriority.HIGH)
+    listed = condition(owner, priority=[TaskPriority.HIGH])
+
+    assert scalar[0] is not listed[0]
+    assert titles(db, scalar) == titles(db, listed) == ["blocked none"]
+
+def test_tag_any_and_all_bind_their_own_values(db, seeded):
+    owner, red, blue = seeded
+
+    any_red = condition(owner, tag_ids=[red])
+    any_both = condition(owner, tag_ids=[red, blue])
+    all_both = condition(owner, tag_ids=[red, blue], tag_match=TagMatch.ALL)
+    all_red = condition(owner, tag_ids=[red, red], tag_match=TagMatch.ALL)
+
+    assert any_red[0] is any_both[0]
+    assert all_both[0] is all_red[0] and all_both[0] is not any_both[0]
+    assert all_both[1]["f0_0_ids_count"] == 2 and all_red[1]["f0_0_ids_count"] == 1
+    assert titles(db, any_red) == ["done both", "todo red"]
+    assert titles(db, any_both) == ["done both", "review blue", "todo red"]
+    assert titles(db, all_both) == ["done both"]
+    assert titles(db, all_red) == ["done both", "todo red"]
+
+def test_groups_number_their_parameters_apart(db, seeded):
+    owner = seeded[0]
+
+    built = build_filter_condition(
+        [TaskFilters(status=TaskStatus.TODO), TaskFilters(status=TaskStatus.DONE)], FilterOperator.OR, owner.id
+    )
+
+    assert built[1] == {"f0_0_value": TaskStatus.TODO, "f1_0_value": TaskStatus.DONE}
+    assert titles(db, built) == ["done both", "todo red"]
+
+def test_templates_are_evicted_at_the_cap(db, seeded, monkeypatch):
+    owner = seeded[0]
+    monkeypatch.setattr(filter_templates, "maxsize", 2)
+    before = filter_template_stats()
+
+    by_status = condition(owner, status=TaskStatus.TODO)
+    condition(owner, priority=TaskPriority.HIGH)
+    condition(owner, created_by=owner.id)
+    rebuilt = condition(owner, status=TaskStatus.DONE)
+
+    after = filter_template_stats()
+    assert after["entries"] == 2
+    assert after["evictions"] - before["evictions"] == 2
+    assert after["builds"] - before["builds"] == 4
+    assert rebuilt[0] is not by_status[0]
+    assert titles(db, rebuilt) == ["done both"]
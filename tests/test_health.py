@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.main
+from app.config import settings
+from app.database import engine, engine_options
+from app.utils.db_metrics import async_pool_metrics, instrument_pool, pool_metrics
+from tests.support import run_in_client_loop
+
+@pytest.fixture
+def async_engine(monkeypatch):
+    async_engine = create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"), **engine_options(async_driver=True))
+    instrument_pool(async_engine.sync_engine)
+    monkeypatch.setattr(app.main, "async_engine", async_engine)
+    yield async_engine
+    run_in_client_loop(async_engine.dispose())
+
+def test_db_health_reports_the_sync_pool(client):
+    body = client.get("/health/db").json()
+
+    assert body["status"] == "healthy"
+    assert body["pool"]["size"] == engine.pool.size()
+    assert "checkouts" in body["pool"] and "statement_cache" in body
+    assert ("async" in body) == (settings.db_mode == "async")
+
+def test_db_health_probes_the_async_engine_with_its_own_metrics(client, async_engine):
+    sync_checkouts = pool_metrics.checkouts
+    async_checkouts = async_pool_metrics.checkouts
+
+    body = client.get("/health/db").json()
+
+    assert body["status"] == "healthy" and body["async"]["status"] == "healthy"
+    assert body["async"]["pool"]["checkouts"] == async_checkouts + 1
+    assert body["pool"]["checkouts"] == sync_checkouts + 1
+
+def test_db_health_fails_when_the_async_engine_is_down(client, monkeypatch, async_engine):
+    async def broken():
+        raise ConnectionError("async database unreachable")
+    monkeypatch.setattr(app.main, "_probe_async_engine", broken)
+
+    response = client.get("/health/db")
+
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "unhealthy" and body["pool"]["size"] == engine.pool.size()
+    assert body["async"] == {"status": "unhealthy", "error": "async database unreachable", "pool": body["async"]["pool"]}
+
+def test_pool_events_count_checkouts_checkins_and_connects():
+    before = pool_metrics.snapshot()
+    with engine.connect():
+        assert pool_metrics.checkouts == before["checkouts"] + 1
+    engine.dispose()  # the recreated pool keeps the listeners
+    with engine.connect():
+        pass
+
+    after = pool_metrics.snapshot()
+    assert after["checkouts"] - before["checkouts"] == 2
+    assert after["checkins"] - before["checkins"] == 2
+    assert after["connects"] - before["connects"] == 1
+
+def test_checkout_timeouts_are_counted():
+    small = create_engine(engine.url, **{**engine_options(), "pool_size": 1, "max_overflow": 0, "pool_timeout": 0.05})
+    instrument_pool(small)
+    timeouts = pool_metrics.timeouts
+    try:
+        with small.connect():
+            with pytest.raises(exc.TimeoutError):
+                small.connect()
+    finally:
+        small.dispose()
+
+    assert pool_metrics.timeouts == timeouts + 1
@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models.task import Task
+from app.utils import pagination
+from app.utils.pagination import TotalMode
+from tests.support import auth_headers, count_statements, create_task, create_team, create_user
+
+@pytest.fixture
+def seeded(db):
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+    start = datetime(2024, 1, 1)
+    # Groups of three share a timestamp, so pages must break ties on id.
+    for index in range(25):
+        create_task(db, team, owner, title=f"task {index:02d}", created_at=start + timedelta(minutes=index // 3))
+    db.commit()
+    return auth_headers(owner)
+
+def walk(client, headers, url, direction="next_cursor"):
+    pages, cursor = [], None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""), headers=headers)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages.append(body)
+        cursor = body[direction]
+        if cursor is None:
+            return pages
+
+def test_cursor_pages_cover_every_task_once_in_order(client, seeded):
+    pages = walk(client, seeded, "/tasks/?mode=cursor&size=4&sort_by=created_at&sort_order=asc")
+
+    items = [item for page in pages for item in page["items"]]
+    keys = [(item["created_at"], item["id"]) for item in items]
+    assert keys == sorted(keys)
+    assert len({item["id"] for item in items}) == 25
+    assert [len(page["items"]) for page in pages] == [4] * 6 + [1]
+    assert pages[0]["has_prev"] is False and pages[-1]["has_next"] is False
+
+def test_cursor_order_matches_page_mode(client, seeded):
+    cursor_ids = [
+        item["id"]
+        for page in walk(client, seeded, "/tasks/?mode=cursor&size=7&sort_by=created_at&sort_order=desc")
+        for item in page["items"]
+    ]
+    page_ids = [
+        item["id"]
+        for number in range(1, 5)
+        for item in client.get(f"/tasks/?page={number}&size=7&sort_by=created_at&sort_order=desc", headers=seeded).json()["items"]
+    ]
+    assert cursor_ids == page_ids
+
+def test_prev_cursor_returns_the_previous_page(client, seeded):
+    first = client.get("/tasks/?mode=cursor&size=5", headers=seeded).json()
+    second = client.get(f"/tasks/?mode=cursor&size=5&cursor={first['next_cursor']}", headers=seeded).json()
+    back = client.get(f"/tasks/?mode=cursor&size=5&cursor={second['prev_cursor']}", headers=seeded).json()
+
+    assert [item["id"] for item in back["items"]] == [item["id"] for item in first["items"]]
+    assert back["has_next"] is True
+
+def test_cursor_is_rejected_for_a_different_sort(client, seeded):
+    first = client.get("/tasks/?mode=cursor&size=5&sort_by=created_at", headers=seeded).json()
+
+    response = client.get(f"/tasks/?mode=cursor&size=5&sort_by=title&cursor={first['next_cursor']}", headers=seeded)
+    assert response.status_code == 400
+    assert client.get("/tasks/?mode=cursor&cursor=not-a-cursor", headers=seeded).status_code == 400
+
+def test_async_estimate_uses_the_planner_estimate(db, monkeypatch):
+    owner = create_user(db, "alice")
+    create_task(db, create_team(db, owner, [owner]), owner)
+    db.commit()
+    sessions = []
+
+    def planner_estimate(statement, session):
+        sessions.append(session)
+        return 42
+    monkeypatch.setattr(pagination, "_planner_row_estimate", planner_estimate)
+
+    async def estimate():
+        async_engine = create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"))
+        try:
+            async with AsyncSession(async_engine) as session:
+                with count_statements(async_engine.sync_engine) as statements:
+                    total = await pagination._count_select_async(select(Task), TotalMode.ESTIMATE, session)
+                return total, statements
+        finally:
+            await async_engine.dispose()
+
+    total, statements = asyncio.run(estimate())
+
+    assert total == 42 and statements == []
+    assert len(sessions) == 1 and isinstance(sessions[0], Session)
+
+def count_statement_count(statements):
+    return sum("count(" in statement.lower() for statement in statements)
+
+def test_total_mode_none_runs_no_count(client, seeded):
+    client.get("/tasks/?size=1", headers=seeded)  # warm the principal cache
+
+    with count_statements() as statements:
+        pages = [client.get(f"/tasks/?page={page}&size=10&total_mode=none", headers=seeded).json() for page in (1, 2, 3)]
+
+    assert count_statement_count(statements) == 0
+    assert [(body["total"], body["pages"], body["has_next"]) for body in pages] == [
+        (None, None, True), (None, None, True), (None, None, False)
+    ]
+    assert sum(len(body["items"]) for body in pages) == 25
+
+def test_low_estimate_keeps_has_next_and_pages_consistent(client, seeded, monkeypatch):
+    estimates = []
+
+    def planner_estimate(statement, session):
+        estimates.append(statement)
+        return 3
+    monkeypatch.setattr(pagination, "_planner_row_estimate", planner_estimate)
+    client.get("/tasks/?size=1", headers=seeded)
+
+    with count_statements() as statements:
+        pages = [client.get(f"/tasks/?page={page}&size=10&total_mode=estimate", headers=seeded).json() for page in (1, 2, 3)]
+
+    assert count_statement_count(statements) == 0
+    assert len(estimates) == 1  # later pages reuse the cached estimate
+    # The real total is 25: has_next comes from the extra row fetched, and
+    # pages never claims fewer pages than has_next implies.
+    assert [(body["total"], body["pages"], body["has_next"]) for body in pages] == [
+        (3, 2, True), (3, 3, True), (3, 3, False)
+    ]
+    assert [len(body["items"]) for body in pages] == [10, 10, 5]
+
+def test_count_cache_key_depends_on_the_statement_and_its_values(db):
+    def key(query):
+        return pagination._count_cache_key(query, engine.dialect)
+
+    by_title = db.query(Task).filter(Task.title == "a")
+    assert key(by_title) == key(db.query(Task).filter(Task.title == "a"))
+    assert key(by_title) == key(select(Task).where(Task.title == "a"))
+    assert key(by_title) != key(db.query(Task).filter(Task.title == "b"))
+    assert key(by_title) != key(db.query(Task).filter(Task.description == "a"))
+    assert key(by_title).startswith("count:")
@@ -0,0 +1,62 @@
+import pytest
+from passlib.hash import bcrypt
+
+from app.config import settings
+from app.models.user import User
+from app.utils import auth
+from tests.support import create_user
+
+@pytest.fixture(autouse=True)
+def hash_executor():
+    yield
+    auth.shutdown_hash_executor()
+
+def login(client, password="secret123"):
+    return client.post("/auth/login", json={"email": "alice@example.com", "password": password})
+
+def stored_hash(db, user_id):
+    db.expire_all()
+    return db.get(User, user_id).password_hash
+
+def test_login_rehashes_a_password_made_with_other_rounds(client, db):
+    old_hash = bcrypt.using(rounds=settings.bcrypt_rounds + 1).hash("secret123")
+    user = create_user(db, "alice")
+    user.password_hash = old_hash
+    user_id = user.id
+    db.commit()
+
+    assert login(client).status_code == 200
+
+    new_hash = stored_hash(db, user_id)
+    assert new_hash != old_hash and bcrypt.from_string(new_hash).rounds == settings.bcrypt_rounds
+    assert auth.verify_password("secret123", new_hash)
+
+    assert login(client).status_code == 200
+    assert stored_hash(db, user_id) == new_hash
+
+def test_wrong_password_is_not_rehashed(client, db):
+    old_hash = bcrypt.using(rounds=settings.bcrypt_rounds + 1).hash("secret123")
+    user = create_user(db, "alice")
+    user.password_hash = old_hash
+    user_id = user.id
+    db.commit()
+
+    assert login(client, password="wrong").status_code == 401
+    assert stored_hash(db, user_id) == old_hash
+
+def test_hashing_fails_fast_when_the_queue_is_full(client, db, monkeypatch):
+    user = create_user(db, "alice")
+    user.password_hash = auth.hash_password("secret123")
+    db.commit()
+    monkeypatch.setattr(auth, "_hash_pending", settings.password_hash_max_pending)
+
+    response = login(client)
+    register = client.post("/auth/register", json={"email": "bob@example.com", "username": "bob", "password": "secret123"})
+
+    assert response.status_code == 503 and register.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert auth._hash_executor is None  # rejected before reaching the pool
+
+    monkeypatch.setattr(auth, "_hash_pending", settings.password_hash_max_pending - 1)
+    assert login(client).status_code == 200
+    assert auth._hash_pending == settings.password_hash_max_pending - 1
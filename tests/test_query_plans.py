@@ -0,0 +1,109 @@
+"""EXPLAIN checks that the task list predicates are served by the composite indexes.
+
+Needs a throwaway Postgres database: set TEST_POSTGRES_URL to run. The schema
+is dropped and recreated there.
+"""
+from datetime import date
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+from app.database import Base
+from app.models.task import Task
+from app.schemas.filters import DateFilter
+from app.utils.query_builder import build_date_filter
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+TEAMS = 200
+TASKS_PER_TEAM = 500
+
+@pytest.fixture(scope="module")
+def pg():
+    engine = create_engine(POSTGRES_URL)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    status_type = Task.__table__.c.status.type.name
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO users (id, email, username, password_hash) "
+            "VALUES (md5('user')::uuid, 'planner@example.com', 'planner', 'unused')"
+        ))
+        connection.execute(text(
+            "INSERT INTO teams (id, name, created_by) "
+            "SELECT md5('team' || t)::uuid, 'team ' || t, md5('user')::uuid FROM generate_series(1, :teams) t"
+        ), {"teams": TEAMS})
+        connection.execute(text(
+            "INSERT INTO tasks (id, title, status, due_date, team_id, created_by, created_at, updated_at) "
+            "SELECT md5('task' || i)::uuid, 'task ' || i, "
+            f"(CASE WHEN i % 3 = 0 THEN 'DONE' ELSE 'TODO' END)::{status_type}, "
+            "CASE WHEN i % 2 = 0 THEN date '2024-01-01' + i % 365 END, "
+            "md5('team' || (1 + i % :teams))::uuid, md5('user')::uuid, "
+            "timestamptz '2024-01-01' + i * interval '1 minute', timestamptz '2024-01-01' + i * interval '1 minute' "
+            "FROM generate_series(1, :tasks) i"
+        ), {"teams": TEAMS, "tasks": TEAMS * TASKS_PER_TEAM})
+        connection.execute(text("ANALYZE"))
+
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+def plan_nodes(engine, statement):
+    compiled = statement.compile(dialect=engine.dialect)
+    # Bypasses SQLAlchemy's bind processing, so UUIDs go to psycopg2 as text.
+    params = {key: str(value) if isinstance(value, uuid.UUID) else value for key, value in compiled.params.items()}
+    with engine.connect() as connection:
+        plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + compiled.string, params).scalar()
+
+    nodes, stack = [], [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get("Plans", []))
+    return nodes
+
+def uses_index(nodes, index_name):
+    return any(node.get("Index Name") == index_name for node in nodes)
+
+def scans_table(nodes, table):
+    return any(node["Node Type"] == "Seq Scan" and node.get("Relation Name") == table for node in nodes)
+
+def team_id(pg):
+    with pg.connect() as connection:
+        return connection.execute(text("SELECT md5('team1')::uuid")).scalar()
+
+def test_team_list_page_walks_the_created_at_index(pg):
+    nodes = plan_nodes(pg, (
+        select(Task.id)
+        .where(Task.team_id == team_id(pg))
+        .order_by(Task.created_at.desc(), Task.id.desc())
+        .limit(20)
+    ))
+
+    assert uses_index(nodes, "ix_tasks_team_created_at")
+    assert not scans_table(nodes, "tasks")
+
+def test_created_on_filter_is_an_index_range(pg):
+    nodes = plan_nodes(pg, (
+        select(Task.id)
+        .where(Task.team_id == team_id(pg), build_date_filter(Task.created_at, DateFilter(on=date(2024, 2, 1))))
+    ))
+
+    assert uses_index(nodes, "ix_tasks_team_created_at")
+    assert not scans_table(nodes, "tasks")
+
+def test_due_before_filter_uses_the_partial_due_date_index(pg):
+    nodes = plan_nodes(pg, (
+        select(Task.id)
+        .where(Task.team_id == team_id(pg), build_date_filter(Task.due_date, DateFilter(before=date(2024, 1, 10))))
+    ))
+
+    assert uses_index(nodes, "ix_tasks_team_due_date")
+    assert not scans_table(nodes, "tasks")
@@ -0,0 +1,124 @@
+import json
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.config import settings
+from app.utils import cache
+from app.utils.cache import InvalidationListener, RedisBackend
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+@pytest.fixture
+def backend(server):
+    return RedisBackend(fakeredis.FakeStrictRedis(server=server), ttl=60, prefix="test:")
+
+@pytest.fixture
+def handlers(monkeypatch):
+    """Isolated handler registry recording every dispatched (kind, key)."""
+    received = []
+    monkeypatch.setattr(cache, "_invalidation_handlers", {})
+    cache.on_invalidation("thing", lambda key: received.append(("thing", key)))
+    return received
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+def next_message(pubsub, timeout=2.0):
+    # get_message returns None for the (ignored) subscribe confirmation too.
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        message = pubsub.get_message(timeout=0.1)
+        if message:
+            return message
+    raise AssertionError("no message published")
+
+def test_values_round_trip_between_workers(server, backend):
+    other_worker = RedisBackend(fakeredis.FakeStrictRedis(server=server), ttl=60, prefix="test:")
+
+    backend.set("counts:team-1", {"total": 3})
+
+    assert other_worker.get("counts:team-1") == {"total": 3}
+    assert other_worker.get("counts:team-2", "missing") == "missing"
+    assert other_worker.stats()["hits"] == 1 and other_worker.stats()["misses"] == 1
+
+def test_tag_invalidation_drops_only_tagged_entries(backend):
+    backend.set("a", 1, tags=["team:1"])
+    backend.set("b", 2, tags=["team:1", "team:2"])
+    backend.set("c", 3, tags=["team:2"])
+
+    assert backend.invalidate_tag("team:1") == 2
+
+    assert backend.get("a") is None and backend.get("b") is None
+    assert backend.get("c") == 3
+    assert backend.invalidate_tag("team:1") == 0
+
+def test_namespace_invalidation(backend):
+    backend.set("perm:alice", "admin")
+    backend.set("perm:bob", "user")
+    backend.set("counts:team-1", 10)
+
+    assert backend.invalidate_namespace("perm") == 2
+    assert backend.get("perm:alice") is None
+    assert backend.get("counts:team-1") == 10
+
+def test_entries_expire_and_clear_stays_in_prefix(server, backend):
+    neighbour = fakeredis.FakeStrictRedis(server=server)
+    neighbour.set("other-app:key", "kept")
+
+    backend.set("short", 1, ttl=0.05)
+    backend.set("long", 2)
+    time.sleep(0.1)
+    assert backend.get("short") is None
+
+    backend.clear()
+    assert backend.get("long") is None
+    assert neighbour.get("other-app:key") == b"kept"
+
+def test_outage_degrades_to_misses(server, backend):
+    server.connected = False
+
+    backend.set("key", 1)
+    assert backend.get("key", "fallback") == "fallback"
+    assert backend.invalidate_tag("team:1") == 0
+    assert backend.stats()["errors"] == 3
+
+def test_broadcast_publishes_and_runs_local_handlers(monkeypatch, backend, handlers):
+    monkeypatch.setattr(cache, "default_cache", backend)
+    subscriber = backend.client.pubsub(ignore_subscribe_messages=True)
+    subscriber.subscribe(settings.cache_invalidation_channel)
+
+    cache.broadcast_invalidation("thing", 42)
+    cache.broadcast_invalidation("thing", 43, include_local=False)
+
+    assert handlers == [("thing", "42")]
+    events = [json.loads(next_message(subscriber)["data"]) for _ in range(2)]
+    assert [(event["kind"], event["key"], event["origin"]) for event in events] == [
+        ("thing", "42", cache._worker_id), ("thing", "43", cache._worker_id)
+    ]
+    subscriber.close()
+
+def test_listener_applies_other_workers_events_only(server, handlers):
+    channel = settings.cache_invalidation_channel
+    listener = InvalidationListener(fakeredis.FakeStrictRedis(server=server), channel)
+    listener.start()
+    try:
+        publisher = fakeredis.FakeStrictRedis(server=server)
+        publisher.publish(channel, json.dumps({"origin": cache._worker_id, "kind": "thing", "key": "own"}))
+        publisher.publish(channel, "not json")
+        publisher.publish(channel, json.dumps({"origin": "other-worker", "kind": "thing", "key": "theirs"}))
+
+        assert wait_for(lambda: handlers)
+        time.sleep(0.05)
+        assert handlers == [("thing", "theirs")]
+    finally:
+        listener.stop()
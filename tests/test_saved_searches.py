@@ -0,0 +1,118 @@
+from datetime import date, timedelta
+import uuid
+
+import pytest
+
+from app.models.saved_search import SavedSearch, saved_search_pending
+from tests.support import auth_headers, create_tag, create_task, create_team, create_user
+
+def create_search(client, user, **filters):
+    response = client.post(
+        "/searches/", json={"name": "saved", "filters": {"filters": [filters]}}, headers=auth_headers(user)
+    )
+    assert response.status_code == 201, response.text
+    return uuid.UUID(response.json()["id"])
+
+def saved_titles(client, user, search_id):
+    response = client.get(f"/searches/{search_id}/results", headers=auth_headers(user))
+    assert response.status_code == 200, response.text
+    return sorted(task["title"] for task in response.json()["items"])
+
+def pending_count(db):
+    return db.query(saved_search_pending).count()
+
+@pytest.fixture
+def team(db):
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+    db.commit()
+    return owner, team
+
+def test_task_writes_through_the_api_update_the_results(client, db, team):
+    owner, team = team
+    headers = auth_headers(owner)
+    search_id = create_search(client, owner, priority="high")
+    assert saved_titles(client, owner, search_id) == []
+
+    created = client.post("/tasks/", json={"title": "created", "team_id": str(team.id), "priority": "high"}, headers=headers)
+    other = client.post("/tasks/", json={"title": "other", "team_id": str(team.id)}, headers=headers)
+    assert pending_count(db) == 2
+    assert saved_titles(client, owner, search_id) == ["created"]
+    assert pending_count(db) == 0
+
+    client.put(f"/tasks/{other.json()['id']}", json={"priority": "high"}, headers=headers)
+    assert saved_titles(client, owner, search_id) == ["created", "other"]
+
+    client.put(f"/tasks/{created.json()['id']}", json={"priority": "low"}, headers=headers)
+    assert saved_titles(client, owner, search_id) == ["other"]
+
+    assert client.delete(f"/tasks/{other.json()['id']}", headers=headers).status_code == 204
+    assert saved_titles(client, owner, search_id) == []
+
+def test_tag_changes_update_the_results(client, db, team):
+    owner, team = team
+    tag = create_tag(db, team, owner, "urgent")
+    task_id, tag_id = create_task(db, team, owner, title="tagged later").id, tag.id
+    db.commit()
+    search_id = create_search(client, owner, tag_ids=[str(tag_id)])
+    assert saved_titles(client, owner, search_id) == []
+
+    client.put(f"/tasks/{task_id}", json={"tag_ids": [str(tag_id)]}, headers=auth_headers(owner))
+    assert saved_titles(client, owner, search_id) == ["tagged later"]
+
+    client.put(f"/tasks/{task_id}", json={"tag_ids": []}, headers=auth_headers(owner))
+    assert saved_titles(client, owner, search_id) == []
+
+def test_assignment_changes_update_the_results(client, db, team):
+    owner, team = team
+    task_id, owner_id = create_task(db, team, owner, title="mine").id, owner.id
+    db.commit()
+    search_id = create_search(client, owner, assigned_to_me=True)
+    assert saved_titles(client, owner, search_id) == []
+
+    response = client.post(f"/tasks/{task_id}/assignments", json={"user_id": str(owner_id)}, headers=auth_headers(owner))
+    assert response.status_code == 201, response.text
+    assert saved_titles(client, owner, search_id) == ["mine"]
+
+    client.delete(f"/tasks/{task_id}/assignments/{owner_id}", headers=auth_headers(owner))
+    assert saved_titles(client, owner, search_id) == []
+
+def test_membership_changes_mark_the_search_for_a_full_refresh(client, db, team):
+    owner, team = team
+    member = create_user(db, "bob")
+    create_task(db, team, owner, title="team task")
+    team_id, member_id = team.id, member.id
+    db.commit()
+    search_id = create_search(client, member)
+    assert saved_titles(client, member, search_id) == []
+
+    response = client.post(f"/teams/{team_id}/members", json={"email": "bob@example.com"}, headers=auth_headers(owner))
+    assert response.status_code == 201, response.text
+    db.expire_all()
+    assert db.get(SavedSearch, search_id).needs_full_refresh is True
+    assert saved_titles(client, member, search_id) == ["team task"]
+
+    client.delete(f"/teams/{team_id}/members/{member_id}", headers=auth_headers(owner))
+    db.expire_all()
+    assert db.get(SavedSearch, search_id).needs_full_refresh is True
+    assert saved_titles(client, member, search_id) == []
+
+def test_relative_date_searches_are_recomputed_once_the_day_rolls_over(client, db, team):
+    owner, team = team
+    search_id = create_search(client, owner, due_date={"next_days": 7})
+    assert saved_titles(client, owner, search_id) == []
+    db.expire_all()
+    search = db.get(SavedSearch, search_id)
+    assert search.is_time_relative is True and search.evaluated_on == date.today()
+
+    # Written straight to the table, so nothing is queued: only a full
+    # recompute can find it.
+    create_task(db, team, owner, title="due soon", due_date=date.today() + timedelta(days=3))
+    db.commit()
+    assert saved_titles(client, owner, search_id) == []
+
+    search.evaluated_on = date.today() - timedelta(days=1)
+    db.commit()
+    assert saved_titles(client, owner, search_id) == ["due soon"]
+    db.expire_all()
+    assert db.get(SavedSearch, search_id).evaluated_on == date.today()
@@ -0,0 +1,34 @@
+from datetime import datetime
+import uuid
+
+from app.schemas.task import TaskDetailResponse, TaskTreeNode
+from app.utils.serialization import model_mapper
+from tests.support import create_task, create_team, create_user
+
+def tree_node(title, depth, children=()):
+    now = datetime(2024, 1, 1)
+    return TaskTreeNode(
+        id=uuid.uuid4(), title=title, parent_task_id=None, team_id=uuid.uuid4(), created_by=uuid.uuid4(),
+        created_at=now, updated_at=now, depth=depth, has_children=bool(children), children=list(children)
+    )
+
+def test_self_referencing_schema_maps_every_level():
+    node = tree_node("root", 0, [tree_node("child", 1, [tree_node("grandchild", 2)])])
+
+    mapped = model_mapper(TaskTreeNode)(node.model_dump())
+
+    assert mapped == node.model_dump()
+    assert mapped["children"][0]["children"][0]["title"] == "grandchild"
+
+def test_mappers_are_cached_per_schema():
+    assert model_mapper(TaskTreeNode) is model_mapper(TaskTreeNode)
+    assert model_mapper(TaskDetailResponse) is not model_mapper(TaskTreeNode)
+
+def test_orm_object_without_a_nested_attribute_gets_the_default(db):
+    owner = create_user(db, "alice")
+    task = create_task(db, create_team(db, owner), owner, title="leaf")
+
+    mapped = model_mapper(TaskTreeNode)(task)
+
+    assert mapped["title"] == "leaf"
+    assert mapped["children"] == [] and mapped["tags"] == []
@@ -0,0 +1,67 @@
+import pytest
+
+from app.models.task_assignment import TaskAssignment
+from tests.support import auth_headers, count_statements, create_tag, create_task, create_team, create_user
+
+@pytest.fixture
+def team(db):
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+    tags = [create_tag(db, team, owner, name) for name in ("red", "blue")]
+    db.commit()
+    return owner, team, tags
+
+def add_tasks(db, team, owner, tags, count, **fields):
+    tasks = [create_task(db, team, owner, title=f"task {index}", **fields) for index in range(count)]
+    for task in tasks:
+        task.tags = list(tags)
+    db.commit()
+    return tasks
+
+def statements_for(client, url, headers):
+    with count_statements() as statements:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+@pytest.mark.parametrize("mode", ["page", "cursor"])
+def test_task_list_statement_count_does_not_grow_with_page_size(client, db, team, mode):
+    owner, team, tags = team
+    add_tasks(db, team, owner, tags, 60)
+    headers = auth_headers(owner)
+    client.get("/tasks/?size=1", headers=headers)  # warm the principal cache
+
+    small = statements_for(client, f"/tasks/?mode={mode}&size=5", headers)
+    large = statements_for(client, f"/tasks/?mode={mode}&size=60", headers)
+
+    # count (page mode only), the page, and its tags
+    assert small == large == (3 if mode == "page" else 2)
+
+def test_task_detail_statement_count_does_not_grow_with_subtasks(client, db, team):
+    owner, team, tags = team
+    headers = auth_headers(owner)
+    client.get("/tasks/?size=1", headers=headers)  # warm the principal cache
+    counts = []
+    for subtask_count in (1, 20):
+        parent = add_tasks(db, team, owner, tags, 1)[0]
+        add_tasks(db, team, owner, tags, subtask_count, parent_task_id=parent.id)
+        db.add(TaskAssignment(task_id=parent.id, user_id=owner.id))
+        db.commit()
+        counts.append(statements_for(client, f"/tasks/{parent.id}", headers))
+
+    # the task with tags and assignments, its subtasks with tags, and team access
+    assert counts == [3, 3]
+
+def test_contains_search_runs_no_highlight_statement(client, db, team):
+    owner, team, tags = team
+    add_tasks(db, team, owner, tags, 3)
+    headers = auth_headers(owner)
+    client.get("/tasks/?size=1", headers=headers)  # warm the principal cache
+
+    with count_statements() as statements:
+        response = client.get("/tasks/?search=task%201", headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert [task["title"] for task in response.json()["items"]] == ["task 1"]
+    assert response.json()["items"][0]["search_snippet"] is None
+    assert len(statements) == 3 and not any("ts_headline" in statement for statement in statements)
@@ -0,0 +1,45 @@
+import json
+from datetime import date
+
+import pytest
+
+from app.models.task import TaskPriority, TaskStatus
+from tests.support import auth_headers, create_tag, create_task, create_team, create_user
+
+ROUND_TRIP_FIELDS = ("title", "description", "status", "priority", "due_date", "parent_task_id", "team_id", "tag_ids", "tag_names")
+
+@pytest.fixture
+def exported_team(db):
+    owner = create_user(db, "owner")
+    team = create_team(db, owner, [owner])
+    urgent, later = create_tag(db, team, owner, "urgent"), create_tag(db, team, owner, "later")
+    parent = create_task(db, team, owner, title="parent, with a comma", description="line one\nline two", tags=[urgent, later])
+    create_task(
+        db, team, owner, title="child", parent_task_id=parent.id, status=TaskStatus.IN_PROGRESS,
+        priority=TaskPriority.HIGH, due_date=date(2024, 3, 1), tags=[later]
+    )
+    create_task(db, team, owner, title="plain")
+    db.commit()
+    return owner, team
+
+def export_records(client, owner, team):
+    response = client.get(f"/tasks/export?team_id={team.id}", headers=auth_headers(owner))
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def projection(record):
+    return tuple(json.dumps(record[field]) for field in ROUND_TRIP_FIELDS)
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+def test_export_imports_back_unchanged(client, exported_team, export_format):
+    owner, team = exported_team
+    headers = auth_headers(owner)
+    original = export_records(client, owner, team)
+
+    exported = client.get(f"/tasks/export?team_id={team.id}&format={export_format}", headers=headers)
+    results = client.post(f"/tasks/import?format={export_format}", content=exported.content, headers=headers)
+
+    assert [json.loads(line)["success"] for line in results.text.splitlines()] == [True] * len(original)
+    original_ids = {record["id"] for record in original}
+    imported = [record for record in export_records(client, owner, team) if record["id"] not in original_ids]
+    assert sorted(map(projection, imported)) == sorted(map(projection, original))
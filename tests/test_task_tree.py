@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.team_member import TeamMember
+from tests.support import auth_headers, create_task, create_team, create_user
+
+@pytest.fixture
+def tree(db):
+    """root -> (a -> (a1, a2), b -> (b1 -> b1x)), created in that order."""
+    owner = create_user(db, "owner")
+    member = create_user(db, "member")
+    team = create_team(db, owner, [member])
+    start = datetime(2024, 1, 1)
+    tasks = {}
+    for index, (name, parent) in enumerate([
+        ("root", None), ("a", "root"), ("b", "root"), ("a1", "a"), ("a2", "a"), ("b1", "b"), ("b1x", "b1")
+    ]):
+        tasks[name] = create_task(
+            db, team, member, title=name, created_at=start + timedelta(minutes=index),
+            parent_task_id=tasks[parent].id if parent else None
+        )
+    db.commit()
+    return {"owner": owner, "member": member, "team": team, "tasks": tasks}
+
+def shape(node):
+    return (node["title"], node["depth"], [shape(child) for child in node["children"]])
+
+def test_nested_tree(client, tree):
+    body = client.get(f"/tasks/{tree['tasks']['root'].id}/tree", headers=auth_headers(tree["member"])).json()
+
+    assert shape(body["root"]) == ("root", 0, [
+        ("a", 1, [("a1", 2, []), ("a2", 2, [])]),
+        ("b", 1, [("b1", 2, [("b1x", 3, [])])])
+    ])
+    assert body["node_count"] == 7 and body["truncated"] is False and body["nodes"] is None
+
+def test_flat_tree_is_depth_first(client, tree):
+    body = client.get(f"/tasks/{tree['tasks']['root'].id}/tree?flat=true", headers=auth_headers(tree["member"])).json()
+
+    assert [(node["title"], node["depth"]) for node in body["nodes"]] == [
+        ("root", 0), ("a", 1), ("a1", 2), ("a2", 2), ("b", 1), ("b1", 2), ("b1x", 3)
+    ]
+    assert body["root"] is None
+
+def test_limits_truncate_the_tree(client, tree):
+    headers = auth_headers(tree["member"])
+    root_id = tree["tasks"]["root"].id
+
+    body = client.get(f"/tasks/{root_id}/tree?max_depth=1", headers=headers).json()
+    assert shape(body["root"]) == ("root", 0, [("a", 1, []), ("b", 1, [])])
+    assert body["root"]["children"][0]["has_children"] is True
+    assert body["truncated"] is True
+
+    body = client.get(f"/tasks/{root_id}/tree?max_nodes=4&flat=true", headers=headers).json()
+    assert [node["title"] for node in body["nodes"]] == ["root", "a", "a1", "b"]
+    assert body["truncated"] is True
+
+def test_team_owner_who_is_not_a_member_can_read(client, tree):
+    response = client.get(f"/tasks/{tree['tasks']['b'].id}/tree", headers=auth_headers(tree["owner"]))
+
+    assert response.status_code == 200
+    assert response.json()["node_count"] == 3
+
+def test_creator_who_left_the_team_is_refused(client, db, tree):
+    db.query(TeamMember).filter(TeamMember.user_id == tree["member"].id).update({TeamMember.is_active: False})
+    db.commit()
+
+    response = client.get(f"/tasks/{tree['tasks']['root'].id}/tree", headers=auth_headers(tree["member"]))
+    assert response.status_code == 403
+
+def test_outsider_is_refused(client, db, tree):
+    outsider = create_user(db, "outsider")
+    db.commit()
+
+    response = client.get(f"/tasks/{tree['tasks']['root'].id}/tree", headers=auth_headers(outsider))
+    assert response.status_code == 403
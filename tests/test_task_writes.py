@@ -0,0 +1,15 @@
+from tests.support import count_statements, create_task, create_team, create_user
+
+def test_task_writes_do_not_fetch_the_search_vector(db):
+    owner = create_user(db, "alice")
+    team = create_team(db, owner, [owner])
+
+    with count_statements() as statements:
+        task = create_task(db, team, owner, title="draft", description="first version")
+        task.description = "second version"
+        db.flush()
+
+    insert, update = statements
+    assert insert.startswith("INSERT INTO tasks") and "RETURNING created_at, updated_at" in insert
+    assert update.startswith("UPDATE tasks")
+    assert all("search_vector" not in statement for statement in statements)